@@ -1,104 +1,532 @@
-from crewai import Agent, Task, Crew, Process
-from langchain_openai import ChatOpenAI
 import os
-from dotenv import load_dotenv
+import json
+import time
+import hashlib
+import itertools
+import threading
+from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from llm_client import chat_completion
+from llm_pool import default_pool, stream_tokens
+from llm_backends import cache_identity
+from streaming import OutputMonitor
+from llm_scheduler import default_scheduler, estimate_request_tokens
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:  # without python-dotenv, OPENAI_API_KEY must already be in the environment
+    pass
+
+# Pipeline stages in execution order: (stage, agent role, task description, expected output)
+STAGES = [
+    (
+        "researcher",
+        "Research Scientist",
+        "Conduct comprehensive research on: {research_topic}. "
+        "Gather relevant information, identify key concepts, and summarize findings.",
+        "A detailed research summary with key findings and insights"
+    ),
+    (
+        "analyst",
+        "Data Analyst",
+        "Analyze the research findings from the previous task. "
+        "Identify patterns, trends, and draw meaningful conclusions.",
+        "An analytical report with data-driven insights and conclusions"
+    ),
+    (
+        "writer",
+        "Scientific Writer",
+        "Write a comprehensive scientific report based on the research and analysis. "
+        "Include introduction, methodology, findings, and conclusions.",
+        "A well-structured scientific report in professional format"
+    )
+]
+
+# Appended to every task description in brief (low-fidelity) runs
+BRIEF_INSTRUCTION = " Be brief: cover only the most important points in a few short paragraphs."
+
+# Numbers stream files of the runs in this process
+_STREAM_RUNS = itertools.count(1)
+
+# Aspects a topic is split into for fan-out research, one concurrent researcher task each
+RESEARCH_ASPECTS = [
+    "background, definitions and key concepts",
+    "current evidence, quantitative data and state of the art",
+    "methods, approaches and how results are obtained",
+    "applications, case studies and real-world impact",
+    "limitations, risks and ethical considerations",
+    "open questions, debates and future directions"
+]
+
+# Task description for one fan-out researcher
+SUB_QUESTION_DESCRIPTION = (
+    "Conduct focused research on this aspect of {research_topic}: {aspect}. "
+    "Gather relevant information, identify key concepts, and summarize findings."
+)
+
+
+def sub_questions(research_topic, fan_out):
+    """Split a topic into `fan_out` sub-questions, one per research aspect (aspects are merged when fan_out is smaller)"""
+    fan_out = max(1, min(fan_out, len(RESEARCH_ASPECTS)))
+    groups = [RESEARCH_ASPECTS[k::fan_out] for k in range(fan_out)]
+    return [
+        SUB_QUESTION_DESCRIPTION.format(research_topic=research_topic, aspect="; ".join(aspects))
+        for aspects in groups
+    ]
+
+
+class StageTimings:
+    """Thread-safe wall-clock timings of pipeline stages, aggregated per stage
+
+    Fan-out research records each sub-question as "researcher[k]", the merge as "merge" and the
+    whole fan-out stage as "researcher", so the researcher time can be compared with its slowest branch.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, cached=False):
+        with self._lock:
+            self.records.append({"stage": stage, "seconds": seconds, "cached": cached})
+
+    def mark(self):
+        """Index to pass to summary(since=...) to cover only records made after this point"""
+        with self._lock:
+            return len(self.records)
+
+    def summary(self, since=0):
+        """{stage: runs, cache hits, mean and max seconds of the stages that actually ran}"""
+        with self._lock:
+            records = self.records[since:]
+        summary = {}
+        for record in records:
+            stats = summary.setdefault(record["stage"], {"runs": 0, "cached": 0, "seconds": []})
+            stats["runs"] += 1
+            if record["cached"]:
+                stats["cached"] += 1
+            else:
+                stats["seconds"].append(record["seconds"])
+        for stats in summary.values():
+            seconds = stats.pop("seconds")
+            stats["mean_seconds"] = round(sum(seconds) / len(seconds), 3) if seconds else 0.0
+            stats["max_seconds"] = round(max(seconds), 3) if seconds else 0.0
+        return summary
+
+
+class AgentPool:
+    """Idle CrewAI agents kept for reuse, keyed by a hash of their model settings, role and prompt
+
+    Candidates that share a prompt (unchanged roles, re-evaluations, other topics) reuse the same
+    Agent instead of building a new one per stage. An agent is checked out while its crew runs, so
+    concurrent stages never share one; at most `max_idle` idle agents are kept (least recently
+    used are dropped first).
+    """
+
+    def __init__(self, max_idle=64):
+        self.max_idle = max_idle
+        self.hits = 0
+        self.misses = 0
+        self._idle = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model, temperature, max_tokens, role, prompt, streaming=False):
+        payload = json.dumps([model, temperature, max_tokens, role, prompt["goal"], prompt["backstory"], streaming])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def acquire(self, key, build):
+        """Check out an idle agent for `key`, or build a new one with `build()`"""
+        with self._lock:
+            agents = self._idle.get(key)
+            if agents:
+                self.hits += 1
+                agent = agents.pop()
+                if not agents:
+                    del self._idle[key]
+                return agent
+            self.misses += 1
+        return build()
+
+    def release(self, key, agent):
+        """Return a checked-out agent so later stages with the same prompt can reuse it"""
+        with self._lock:
+            self._idle.setdefault(key, []).append(agent)
+            self._idle.move_to_end(key)
+            while sum(len(agents) for agents in self._idle.values()) > self.max_idle:
+                oldest = next(iter(self._idle))
+                self._idle[oldest].pop(0)
+                if not self._idle[oldest]:
+                    del self._idle[oldest]
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "idle": sum(len(agents) for agents in self._idle.values())
+            }
+
+
+# Shared by every AIScientist that is not given its own agent pool
+default_agent_pool = AgentPool()
+
+# Counters of a CrewAI usage summary
+CREW_USAGE_FIELDS = ("prompt_tokens", "completion_tokens", "cached_prompt_tokens", "total_tokens", "successful_requests")
+
+
+def usage_counts(metrics):
+    """{field: count} of a CrewAI usage summary (a UsageMetrics object or a dict; None counts as zero)"""
+    metrics = metrics or {}
+    if isinstance(metrics, dict):
+        return {name: metrics.get(name, 0) or 0 for name in CREW_USAGE_FIELDS}
+    return {name: getattr(metrics, name, 0) or 0 for name in CREW_USAGE_FIELDS}
+
+
+def agent_usage(agent):
+    """Usage an agent has accumulated over its whole life, from the same counters crew.usage_metrics sums"""
+    llm = getattr(agent, "llm", None)
+    if hasattr(llm, "get_token_usage_summary"):
+        return usage_counts(llm.get_token_usage_summary())
+    process = getattr(agent, "_token_process", None)
+    if hasattr(process, "get_summary"):
+        return usage_counts(process.get_summary())
+    return usage_counts(None)
 
-load_dotenv()
 
 class AIScientist:
-    def __init__(self, model_name="gpt-4o-mini"):
-        self.llm = ChatOpenAI(
-            model=model_name,
-            temperature=0.7,
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+    def __init__(self, model_name="gpt-4o-mini", cache=None, max_tokens=None, brief=False, meter=None,
+                 backend=None, scheduler=None, pool=None, agent_pool=None, fan_out=1, timings=None,
+                 stream_dir=None, stream_console=False, abort_hopeless=False):
+        """With a backend (e.g. llm_backends.FakeBackend), stages are sent straight to it as chat
+        requests instead of through CrewAI and ChatOpenAI
 
-    def create_agents(self, researcher_prompt, analyst_prompt, writer_prompt):
-        """Create AI scientist agents with customizable prompts"""
+        CrewAI and langchain_openai are only imported when a crew is first built, so the module
+        (STAGES, DEFAULT_PROMPTS, ...) can be used without them. The ChatOpenAI model comes from
+        `pool` (llm_pool.default_pool if not given) and agents are reused through `agent_pool`
+        (default_agent_pool if not given), so scientists in one process share connections and agents.
 
-        # Research Agent
-        researcher = Agent(
-            role="Research Scientist",
-            goal=researcher_prompt["goal"],
-            backstory=researcher_prompt["backstory"],
-            verbose=True,
-            allow_delegation=False,
-            llm=self.llm
-        )
+        With fan_out > 1 the research stage is split into that many sub-questions (see
+        sub_questions) researched concurrently and merged before the analyst; run(fan_out=...)
+        overrides it per run. Stage wall-clock times are recorded in `timings` (a StageTimings,
+        shared with the caller if given).
 
-        # Data Analyst Agent
-        analyst = Agent(
-            role="Data Analyst",
-            goal=analyst_prompt["goal"],
-            backstory=analyst_prompt["backstory"],
-            verbose=True,
-            allow_delegation=False,
-            llm=self.llm
-        )
+        Stage outputs are streamed as they are generated: into one file per run under
+        `stream_dir`, and the writer's report to the console with stream_console=True. With
+        abort_hopeless=True, a stage whose output is clearly empty or off-topic early on (see
+        streaming.OutputMonitor) stops the run with streaming.StreamAborted.
+        """
+        self.model_name = model_name
+        self.temperature = 0.7
+        self.cache = cache
+        self.meter = meter
+        self.max_tokens = max_tokens
+        self.brief = brief
+        self.backend = backend
+        self.scheduler = scheduler or default_scheduler
+        self.pool = pool or default_pool
+        self.agent_pool = agent_pool or default_agent_pool
+        self.fan_out = fan_out
+        self.timings = timings or StageTimings()
+        self.stream_dir = stream_dir
+        self.stream_console = stream_console
+        self.abort_hopeless = abort_hopeless
 
-        # Scientific Writer Agent
-        writer = Agent(
-            role="Scientific Writer",
-            goal=writer_prompt["goal"],
-            backstory=writer_prompt["backstory"],
+    @property
+    def llm(self):
+        """Pooled ChatOpenAI model for the crew agents, built on first use (None with a backend)"""
+        if self.backend is not None:
+            return None
+        return self.pool.chat_model(self.model_name, self.temperature, self.max_tokens)
+
+    def create_agent(self, role, prompt, streaming=False):
+        """Create a single AI scientist agent with a customizable prompt
+
+        Raises RuntimeError if the installed CrewAI replaces the pooled ChatOpenAI model with its
+        own LLM class, which would silently drop the shared connections and the token streaming.
+        """
+        from crewai import Agent
+
+        if streaming:
+            llm = self.pool.chat_model(self.model_name, self.temperature, self.max_tokens, streaming)
+        else:
+            llm = self.llm
+        agent = Agent(
+            role=role,
+            goal=prompt["goal"],
+            backstory=prompt["backstory"],
             verbose=True,
             allow_delegation=False,
-            llm=self.llm
+            llm=llm
         )
+        if llm is not None and not isinstance(getattr(agent, "llm", None), type(llm)):
+            raise RuntimeError(
+                f"The installed crewai converted the agent's {type(llm).__name__} into "
+                f"{type(getattr(agent, 'llm', None)).__name__}; use a crewai version that keeps a passed "
+                "LangChain chat model (see requirements.txt)"
+            )
+        return agent
 
-        return researcher, analyst, writer
+    def create_agents(self, researcher_prompt, analyst_prompt, writer_prompt):
+        """Create AI scientist agents with customizable prompts"""
+        prompts = [researcher_prompt, analyst_prompt, writer_prompt]
+        return tuple(
+            self.create_agent(role, prompt)
+            for (_, role, _, _), prompt in zip(STAGES, prompts)
+        )
 
     def create_tasks(self, researcher, analyst, writer, research_topic):
         """Create tasks for the agents"""
+        from crewai import Task
 
-        task1 = Task(
-            description=f"Conduct comprehensive research on: {research_topic}. "
-                       f"Gather relevant information, identify key concepts, and summarize findings.",
-            agent=researcher,
-            expected_output="A detailed research summary with key findings and insights"
-        )
+        agents = [researcher, analyst, writer]
+        return [
+            Task(
+                description=description.format(research_topic=research_topic),
+                agent=agent,
+                expected_output=expected_output
+            )
+            for (_, _, description, expected_output), agent in zip(STAGES, agents)
+        ]
+
+    def stage_key(self, stage, prompt, research_topic, upstream, fan_out=1):
+        """Cache key for one stage: its own prompt, the topic, every upstream stage output and the run fidelity"""
+        key = [prompt, research_topic, upstream, self.max_tokens, self.brief]
+        if fan_out > 1:
+            key.append(fan_out)
+        return self.cache.make_key(self.model_name, key, self.temperature, namespace=f"stage:{stage}",
+                                   backend=cache_identity(self.backend))
+
+    def run_stage(self, role, prompt, description, expected_output, upstream, on_delta=None):
+        """Run one pipeline stage as a single-task crew, passing upstream outputs as context
+
+        on_delta(delta, text so far) receives the stage output as it streams in.
+        """
+        if upstream:
+            description += "\n\nContext from previous tasks:\n\n" + "\n\n".join(upstream)
+
+        if self.backend is not None:
+            return self.run_stage_direct(role, prompt, description, expected_output, on_delta)
+
+        from crewai import Task, Crew, Process
 
-        task2 = Task(
-            description=f"Analyze the research findings from the previous task. "
-                       f"Identify patterns, trends, and draw meaningful conclusions.",
-            agent=analyst,
-            expected_output="An analytical report with data-driven insights and conclusions"
+        streaming = on_delta is not None
+        agent_key = self.agent_pool.key(self.model_name, self.temperature, self.max_tokens, role, prompt, streaming)
+        agent = self.agent_pool.acquire(agent_key, lambda: self.create_agent(role, prompt, streaming))
+        try:
+            task = Task(description=description, agent=agent, expected_output=expected_output)
+            crew = Crew(
+                agents=[agent],
+                tasks=[task],
+                process=Process.sequential,
+                verbose=True
+            )
+
+            # The whole stage is scheduled (and retried) as one request, since CrewAI makes its own LLM
+            # calls; once it is done, the buckets are charged for the calls and tokens it really used
+            estimated = estimate_request_tokens(
+                [{"content": f"{prompt['goal']} {prompt['backstory']} {description} {expected_output}"}],
+                self.max_tokens
+            )
+            def kickoff():
+                if on_delta is None:
+                    return crew.kickoff()
+                with stream_tokens(on_delta):
+                    return crew.kickoff()
+
+            # A pooled agent's counters keep growing across crews, so only this kickoff's share is recorded
+            before = agent_usage(agent)
+            started = time.perf_counter()
+            output = str(self.scheduler.call(self.model_name, estimated, "crew", kickoff))
+            after = usage_counts(getattr(crew, "usage_metrics", None))
+            used = {name: max(0, after[name] - before[name]) for name in CREW_USAGE_FIELDS}
+            self.scheduler.settle(self.model_name, estimated, used["total_tokens"], used["successful_requests"])
+        finally:
+            self.agent_pool.release(agent_key, agent)
+
+        if self.meter is not None:
+            self.record_crew_usage(used, role, time.perf_counter() - started)
+
+        return output
+
+    def run_stage_direct(self, role, prompt, description, expected_output, on_delta=None):
+        """Run one stage as a single chat request to the configured backend, in CrewAI's prompt layout"""
+        messages = [
+            {
+                "role": "system",
+                "content": f"You are {role}. {prompt['backstory']}\nYour personal goal is: {prompt['goal']}"
+            },
+            {
+                "role": "user",
+                "content": f"Current Task: {description}\n\n"
+                           f"This is the expected criteria for your final answer: {expected_output}\n"
+                           f"you MUST return the actual complete content as the final answer, not a summary."
+            }
+        ]
+        return chat_completion(
+            self.model_name,
+            messages,
+            self.temperature,
+            meter=self.meter,
+            phase="crew",
+            role=role,
+            backend=self.backend,
+            max_tokens=self.max_tokens,
+            scheduler=self.scheduler,
+            on_delta=on_delta
         )
 
-        task3 = Task(
-            description=f"Write a comprehensive scientific report based on the research and analysis. "
-                       f"Include introduction, methodology, findings, and conclusions.",
-            agent=writer,
-            expected_output="A well-structured scientific report in professional format"
+    def record_crew_usage(self, used, role, latency):
+        """Record a stage's aggregate token usage ({field: count}, see usage_counts)"""
+        self.meter.record(
+            self.model_name,
+            "crew",
+            latency,
+            prompt_tokens=used["prompt_tokens"],
+            completion_tokens=used["completion_tokens"],
+            cached_tokens=used["cached_prompt_tokens"],
+            role=role
         )
 
-        return [task1, task2, task3]
+    def run_research_fan_out(self, role, prompt, research_topic, expected_output, fan_out):
+        """Research `fan_out` sub-questions of the topic concurrently and merge their findings
 
-    def run(self, researcher_prompt, analyst_prompt, writer_prompt, research_topic):
-        """Execute the AI scientist crew"""
+        The merge is local (findings under one heading per sub-question); the analyst stage
+        does the synthesis, so the research latency is that of the slowest sub-question.
+        """
+        descriptions = sub_questions(research_topic, fan_out)
+        if self.brief:
+            descriptions = [description + BRIEF_INSTRUCTION for description in descriptions]
 
-        # Create agents
-        researcher, analyst, writer = self.create_agents(
-            researcher_prompt,
-            analyst_prompt,
-            writer_prompt
-        )
+        def research(k, description):
+            started = time.perf_counter()
+            monitor = OutputMonitor(research_topic) if self.abort_hopeless else None
+            output = self.run_stage(role, prompt, description, expected_output, [], on_delta=monitor)
+            self.timings.record(f"researcher[{k}]", time.perf_counter() - started)
+            return output
 
-        # Create tasks
-        tasks = self.create_tasks(researcher, analyst, writer, research_topic)
+        with ThreadPoolExecutor(max_workers=len(descriptions)) as executor:
+            futures = [executor.submit(research, k, description) for k, description in enumerate(descriptions, start=1)]
+            findings = [future.result() for future in futures]
 
-        # Create crew
-        crew = Crew(
-            agents=[researcher, analyst, writer],
-            tasks=tasks,
-            process=Process.sequential,
-            verbose=True
+        started = time.perf_counter()
+        merged = "\n\n".join(
+            f"### Sub-question {k}: {description}\n\n{output}"
+            for k, (description, output) in enumerate(zip(descriptions, findings), start=1)
         )
+        self.timings.record("merge", time.perf_counter() - started)
+        return merged
+
+    def open_stream(self, research_topic):
+        """A new stream file for one run under stream_dir, or None when not streaming to disk"""
+        if self.stream_dir is None:
+            return None
+        os.makedirs(self.stream_dir, exist_ok=True)
+        name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_run_{next(_STREAM_RUNS):04d}.md"
+        sink = open(os.path.join(self.stream_dir, name), "w", encoding="utf-8")
+        sink.write(f"# {research_topic}\n\n")
+        return sink
+
+    def stage_stream(self, stage, research_topic, sink=None):
+        """on_delta callback for one stage (file, console and hopeless-output checks), or None if nothing consumes it"""
+        console = self.stream_console and stage == STAGES[-1][0]
+        monitor = OutputMonitor(research_topic) if self.abort_hopeless else None
+        if sink is None and not console and monitor is None:
+            return None
+
+        def on_delta(delta, text):
+            if sink is not None:
+                sink.write(delta)
+                sink.flush()
+            if console:
+                print(delta, end="", flush=True)
+            if monitor is not None:
+                monitor(delta, text)
+            return False
+
+        return on_delta
+
+    def run(self, researcher_prompt, analyst_prompt, writer_prompt, research_topic, fan_out=None):
+        """Execute the AI scientist pipeline stage by stage, reusing cached stage outputs
+
+        fan_out overrides the scientist's research fan-out for this run (1 = a single researcher task).
+        """
+        fan_out = self.fan_out if fan_out is None else fan_out
+        prompts = {
+            "researcher": researcher_prompt,
+            "analyst": analyst_prompt,
+            "writer": writer_prompt
+        }
+
+        outputs = []
+        timings = []
+        sink = self.open_stream(research_topic)
+        try:
+            for stage, role, description, expected_output in STAGES:
+                prompt = prompts[stage]
+                stage_fan_out = fan_out if stage == "researcher" else 1
+                started = time.perf_counter()
+                if sink is not None:
+                    sink.write(f"## {role}\n\n")
+
+                # A stage only re-runs when its prompt, the topic or an upstream output changed
+                key = None
+                if self.cache is not None:
+                    key = self.stage_key(stage, prompt, research_topic, outputs, stage_fan_out)
+                    cached = self.cache.get(key)
+                    if cached is not None:
+                        print(f"♻ Reusing cached {role} output")
+                        if self.meter is not None:
+                            self.meter.record(self.model_name, "crew", 0.0, role=role, cache_hit=True)
+                        self.timings.record(stage, 0.0, cached=True)
+                        timings.append(f"{stage} cached")
+                        if sink is not None:
+                            sink.write(f"{cached}\n\n")
+                        outputs.append(cached)
+                        continue
+
+                if stage_fan_out > 1:
+                    output = self.run_research_fan_out(role, prompt, research_topic, expected_output, stage_fan_out)
+                    if sink is not None:
+                        sink.write(output)
+                else:
+                    description = description.format(research_topic=research_topic)
+                    if self.brief:
+                        description += BRIEF_INSTRUCTION
+
+                    output = self.run_stage(
+                        role,
+                        prompt,
+                        description,
+                        expected_output,
+                        list(outputs),
+                        on_delta=self.stage_stream(stage, research_topic, sink)
+                    )
+                if self.abort_hopeless:
+                    OutputMonitor(research_topic).finish(output)
+                if sink is not None:
+                    sink.write("\n\n")
+                    sink.flush()
+
+                if self.cache is not None:
+                    self.cache.put(key, output, model=self.model_name)
 
-        # Execute
-        result = crew.kickoff()
+                seconds = time.perf_counter() - started
+                self.timings.record(stage, seconds)
+                timings.append(f"{stage} {seconds:.1f}s" + (f" ({stage_fan_out} sub-questions)" if stage_fan_out > 1 else ""))
+                outputs.append(output)
+        finally:
+            if sink is not None:
+                sink.close()
 
-        return result
+        if self.stream_console:
+            print()
+        print(f"⏱ Stage timings: {', '.join(timings)}")
+        return outputs[-1]
 
 
 # Default prompts - intentionally very poor quality to demonstrate optimization
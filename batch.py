@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Run prompt optimization jobs headlessly, several at a time
+
+    python batch.py --topics topics.txt --iterations 5 --jobs 4
+    python batch.py --topic "Ethical implications of CRISPR gene editing" --mode population --generations 3
+    python batch.py --topics topics.txt --suite --budget 20      # one multi-topic job, at most $20
+    python batch.py --topics topics_ko.txt --language ko
+    python batch.py --topic "Quantum error correction" --language en ko   # one job per language
+    python batch.py --topics topics.txt --backend fake           # offline dry run
+    python batch.py --topics topics.txt --mode population --surrogate 3   # pre-screen 3x candidates locally
+    python batch.py --topics topics.txt --dedupe 0.9             # reuse scores of near-duplicate prompt sets
+    python batch.py --report batch_results                       # status of every job under a directory
+
+Each job runs in its own process and writes its console output to <output_dir>/run.log.
+Every scored prompt set is also recorded in <output-root>/results.sqlite (see results_store.py).
+Progress is printed to stdout as one JSON object per line:
+
+    {"event": "job_started", "job": 0, "language": "en", "topic": "...", "output_dir": "...", ...}
+    {"event": "progress", "job": 0, "iteration": 2, "iterations": 5, "score": 84.1, "best_score": 84.1, "cost": 0.21, ...}
+    {"event": "job_finished", "job": 0, "best_score": 86.3, "cost": 0.52, "seconds": 431.2, ...}
+    {"event": "job_failed", "job": 1, "error": "...", ...}
+    {"event": "job_skipped", "job": 2, "reason": "budget", ...}
+    {"event": "batch_finished", "finished": 1, "failed": 1, "skipped": 1, "cost": 0.52, "seconds": 902.4}
+
+Optimizer modules are only imported inside the job processes, so --report and argument
+errors return immediately.
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import redirect_stdout, redirect_stderr
+from datetime import datetime
+from queue import Empty
+
+
+def read_topics(path):
+    """Topics from a JSON list or a text file with one topic per line (blank lines and # comments skipped)"""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            return [str(topic) for topic in json.load(f)]
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def slugify(text, limit=40):
+    return re.sub(r"\W+", "_", text.lower()).strip("_")[:limit].rstrip("_") or "topic"
+
+
+def parse_limits(values, jobs):
+    """--limit MODEL=RPM,TPM values as scheduler limits, split evenly across concurrent jobs"""
+    limits = {}
+    for value in values or []:
+        model, _, rates = value.partition("=")
+        rpm, _, tpm = rates.partition(",")
+        limits[model] = {
+            "rpm": float(rpm) / jobs if rpm else None,
+            "tpm": float(tpm) / jobs if tpm else None
+        }
+    return limits
+
+
+def make_backend(name):
+    if name == "fake":
+        from llm_backends import FakeBackend
+        return FakeBackend()
+    if name == "replay":
+        from llm_backends import ReplayBackend, FakeBackend
+        return ReplayBackend(fallback=FakeBackend())
+    return None
+
+
+def build_jobs(args, topics):
+    """One job per language and topic, or one suite job over all topics per language with --suite"""
+    groups = [topics] if args.suite else [[topic] for topic in topics]
+    jobs = []
+    for language in args.language:
+        for index, group in enumerate(groups):
+            name = f"suite_{len(group)}_topics" if args.suite else f"{index + 1:03d}_{slugify(group[0])}"
+            jobs.append({
+                "job": len(jobs),
+                "language": language,
+                "topic": group if args.suite else group[0],
+                "output_dir": os.path.join(args.output_root, language, name)
+            })
+    return jobs
+
+
+def run_job(job, options, events):
+    """Run one optimization job in a worker process; returns its best score and cost"""
+    from llm_cache import LLMCache
+    from llm_scheduler import RequestScheduler
+    from llm_pool import default_pool
+    from results_store import ResultsStore
+
+    default_pool.configure(**options["pool"])
+    os.makedirs(job["output_dir"], exist_ok=True)
+    with open(os.path.join(job["output_dir"], "run.log"), "a", encoding="utf-8") as log, \
+            redirect_stdout(log), redirect_stderr(log):
+        cache = None if options["no_cache"] else LLMCache(options["cache"], mode=options["cache_mode"])
+        backend = make_backend(options["backend"])
+        scheduler = RequestScheduler(limits=options["limits"])
+        store = None if options["no_results_db"] else ResultsStore(
+            options["results_db"] or os.path.join(options["output_root"], "results.sqlite")
+        )
+
+        try:
+            from prompt_optimizer_simple import SimplePromptOptimizer, MULTI_FIDELITY, save_optimized_prompts
+            from surrogate import SurrogateModel
+            from near_duplicates import NearDuplicateIndex
+
+            optimizer = SimplePromptOptimizer(
+                language=job["language"],
+                model_name=options["model"],
+                cache=cache,
+                backend=backend,
+                scheduler=scheduler,
+                agent_model=options["agent_model"],
+                screen_model=options["screen_model"],
+                max_judge_samples=options["judge_samples"],
+                max_cost=options["job_budget"],
+                research_fan_out=options["fan_out"],
+                stream=options["stream"],
+                abort_hopeless=options["abort_hopeless"],
+                surrogate=SurrogateModel() if options["surrogate"] > 1 else None,
+                surrogate_oversample=options["surrogate"],
+                duplicates=NearDuplicateIndex(
+                    options["dedupe"], path=os.path.join(options["output_root"], "near_duplicates.jsonl")
+                ) if options["dedupe"] else None,
+                results_store=store,
+                progress=lambda event: events.put({
+                    "event": "progress",
+                    "time": datetime.now().isoformat(timespec="seconds"),
+                    "job": job["job"],
+                    **event
+                })
+            )
+            if optimizer.surrogate is not None:
+                # Warm up on every earlier job in this language under the output root
+                language_root = os.path.dirname(job["output_dir"])
+                optimizer.train_surrogate(
+                    os.path.join(language_root, name) for name in sorted(os.listdir(language_root))
+                )
+            if options["mode"] == "population":
+                prompts, best_score = optimizer.optimize_population(
+                    job["topic"],
+                    generations=options["generations"],
+                    population_size=options["population"],
+                    beam_width=options["beam"],
+                    max_workers=options["workers"],
+                    output_dir=job["output_dir"],
+                    fidelities=MULTI_FIDELITY if options["multi_fidelity"] else None,
+                    aggregate=options["aggregate"],
+                    topics_per_generation=options["topics_per_generation"]
+                )
+            else:
+                prompts, best_score = optimizer.optimize(
+                    job["topic"],
+                    iterations=options["iterations"],
+                    output_dir=job["output_dir"],
+                    role_schedule=options["role_schedule"],
+                    resume=options["resume"],
+                    aggregate=options["aggregate"],
+                    max_workers=options["workers"]
+                )
+            if job["language"] == "ko":
+                from prompt_optimizer_korean import save_optimized_prompts_kr
+                save_optimized_prompts_kr(prompts, os.path.join(job["output_dir"], "optimized_prompts_korean.py"))
+            else:
+                save_optimized_prompts(prompts, os.path.join(job["output_dir"], "optimized_prompts.py"))
+            return {"best_score": best_score, "cost": optimizer.meter.summary()["total"]["cost"]}
+        finally:
+            if cache is not None:
+                cache.close()
+            if store is not None:
+                store.close()
+
+
+def report(root):
+    """Print one job_report event per job directory under root, from its summary or checkpoint"""
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories.sort()
+        if "optimization_summary.json" in files:
+            with open(os.path.join(directory, "optimization_summary.json"), "r", encoding="utf-8") as f:
+                summary = json.load(f)
+            emit("job_report", output_dir=directory, status="finished", topic=summary.get("research_topic"),
+                 best_score=summary.get("best_score"),
+                 iterations=summary.get("total_iterations", summary.get("generations")),
+                 cost=summary.get("usage", {}).get("total", {}).get("cost"),
+                 stopped_early=summary.get("stopped_early", False))
+        elif "checkpoint.json" in files:
+            with open(os.path.join(directory, "checkpoint.json"), "r", encoding="utf-8") as f:
+                state = json.load(f)
+            emit("job_report", output_dir=directory, status="in_progress", topic=state.get("research_topic"),
+                 best_score=state.get("best_score"), iterations=len(state.get("all_iterations", [])))
+
+
+def emit(event, **fields):
+    print(json.dumps(dict(event=event, time=datetime.now().isoformat(timespec="seconds"), **fields),
+                     ensure_ascii=False), flush=True)
+
+
+def drain(events, running_cost):
+    """Print queued progress events and track each running job's latest cost"""
+    while True:
+        try:
+            event = events.get_nowait()
+        except Empty:
+            return
+        running_cost[event["job"]] = event.get("cost") or 0.0
+        print(json.dumps(event, ensure_ascii=False), flush=True)
+
+
+def run_batch(jobs, options, max_jobs, budget=None):
+    """Run jobs with at most max_jobs in flight; stop starting new ones once `budget` dollars are spent"""
+    started = time.monotonic()
+    manager = multiprocessing.Manager()
+    events = manager.Queue()
+    pending = deque(jobs)
+    running = {}
+    running_cost = {}
+    spent = 0.0
+    counts = {"finished": 0, "failed": 0, "skipped": 0}
+
+    with ProcessPoolExecutor(max_workers=max_jobs) as executor:
+        while pending or running:
+            over_budget = budget is not None and spent + sum(running_cost.values()) >= budget
+            while pending and len(running) < max_jobs and not over_budget:
+                job = pending.popleft()
+                running[executor.submit(run_job, job, options, events)] = (job, time.monotonic())
+                emit("job_started", job=job["job"], language=job["language"], topic=job["topic"],
+                     output_dir=job["output_dir"])
+
+            if over_budget and pending and not running:
+                for job in pending:
+                    emit("job_skipped", job=job["job"], topic=job["topic"], reason="budget")
+                    counts["skipped"] += 1
+                pending.clear()
+                break
+
+            done, _ = wait(running, timeout=0.5, return_when=FIRST_COMPLETED)
+            drain(events, running_cost)
+            for future in done:
+                job, job_started = running.pop(future)
+                running_cost.pop(job["job"], None)
+                seconds = round(time.monotonic() - job_started, 1)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    emit("job_failed", job=job["job"], topic=job["topic"], error=f"{type(e).__name__}: {e}",
+                         seconds=seconds, output_dir=job["output_dir"])
+                    counts["failed"] += 1
+                    continue
+                spent += result["cost"] or 0.0
+                emit("job_finished", job=job["job"], topic=job["topic"], best_score=result["best_score"],
+                     cost=result["cost"], seconds=seconds, output_dir=job["output_dir"])
+                counts["finished"] += 1
+
+    drain(events, running_cost)
+    emit("batch_finished", cost=round(spent, 6), seconds=round(time.monotonic() - started, 1), **counts)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run prompt optimization jobs headlessly with JSON-lines progress")
+    topics = parser.add_argument_group("topics")
+    topics.add_argument("--topics", help="text file with one topic per line, or a JSON list")
+    topics.add_argument("--topic", action="append", default=[], help="a topic (repeatable)")
+    topics.add_argument("--suite", action="store_true", help="optimize one prompt set across all topics")
+    topics.add_argument("--aggregate", choices=["mean", "min"], default="mean", help="suite score aggregate")
+    topics.add_argument("--topics-per-generation", type=int, help="topics sampled per generation (population mode)")
+
+    run = parser.add_argument_group("optimization")
+    run.add_argument("--language", nargs="+", choices=["en", "ko"], default=["en"],
+                     help="one job per language and topic (e.g. --language en ko)")
+    run.add_argument("--mode", choices=["serial", "population"], default="serial")
+    run.add_argument("--iterations", type=int, default=5)
+    run.add_argument("--role-schedule", choices=["all", "round_robin", "targeted"], default="all")
+    run.add_argument("--generations", type=int, default=5)
+    run.add_argument("--population", type=int, default=4)
+    run.add_argument("--beam", type=int, default=2)
+    run.add_argument("--fan-out", type=int, default=1, help="concurrent research sub-questions per crew run")
+    run.add_argument("--stream", action="store_true", help="stream crew output to <job>/streams and judge scores")
+    run.add_argument("--abort-hopeless", action="store_true", help="stop crew runs with empty or off-topic output early")
+    run.add_argument("--surrogate", type=int, default=0, metavar="N",
+                     help="generate N times the candidates and run only those a local score model ranks highest")
+    run.add_argument("--dedupe", type=float, metavar="SIMILARITY",
+                     help="reuse the score of an evaluated prompt set at least this similar (0-1), across jobs and batches")
+    run.add_argument("--multi-fidelity", action="store_true", help="successive halving with cheap early rungs")
+    run.add_argument("--resume", action="store_true", help="continue jobs from their output directories")
+
+    models = parser.add_argument_group("models")
+    models.add_argument("--model", default="gpt-4o", help="evaluator and prompt improver model")
+    models.add_argument("--agent-model", default="gpt-4o-mini", help="AI Scientist crew model")
+    models.add_argument("--screen-model", help="cheap screening judge, or \"heuristic\"")
+    models.add_argument("--judge-samples", type=int, default=1, help="max judge samples for close candidates")
+    models.add_argument("--backend", choices=["openai", "fake", "replay"], default="openai")
+    models.add_argument("--limit", action="append", metavar="MODEL=RPM,TPM",
+                        help="rate limit for a model, shared by all concurrent jobs (repeatable)")
+
+    resources = parser.add_argument_group("resources")
+    resources.add_argument("--jobs", type=int, default=2, help="optimization jobs run at once")
+    resources.add_argument("--workers", type=int, default=4, help="concurrent crew runs within a job")
+    resources.add_argument("--budget", type=float, help="total dollars; no new jobs start once it is spent")
+    resources.add_argument("--job-budget", type=float, help="dollars after which a single job stops early")
+    resources.add_argument("--max-connections", type=int, default=50, help="HTTP connections per job")
+    resources.add_argument("--keepalive", type=int, default=20, help="idle keep-alive connections per job")
+    resources.add_argument("--timeout", type=float, default=120.0, help="LLM request timeout in seconds")
+    resources.add_argument("--cache", default=".llm_cache/llm_cache.sqlite", help="LLM cache path")
+    resources.add_argument("--cache-mode", choices=["readwrite", "readonly", "replay"], default="readwrite")
+    resources.add_argument("--no-cache", action="store_true")
+    resources.add_argument("--results-db", help="results store path (default: <output-root>/results.sqlite)")
+    resources.add_argument("--no-results-db", action="store_true")
+    resources.add_argument("--output-root", default="batch_results", help="jobs write to <root>/<language>/<job>")
+    parser.add_argument("--report", metavar="DIR", help="report the status of every job under DIR and exit")
+    args = parser.parse_args()
+
+    if args.report:
+        report(args.report)
+        return
+
+    topic_list = list(args.topic)
+    if args.topics:
+        topic_list += read_topics(args.topics)
+    if not topic_list:
+        parser.error("no topics given (use --topics FILE or --topic TEXT)")
+    if args.resume and args.mode == "population":
+        parser.error("--resume is only supported with --mode serial")
+
+    if args.backend == "openai":
+        from dotenv import load_dotenv
+        load_dotenv()
+        if not os.getenv("OPENAI_API_KEY"):
+            parser.error("OPENAI_API_KEY is not set (add it to .env or use --backend fake)")
+
+    jobs = build_jobs(args, topic_list)
+    options = {
+        key: getattr(args, key)
+        for key in ("mode", "iterations", "role_schedule", "generations", "population", "beam",
+                    "multi_fidelity", "resume", "model", "agent_model", "screen_model", "judge_samples",
+                    "backend", "workers", "job_budget", "cache", "cache_mode", "no_cache", "aggregate",
+                    "topics_per_generation", "fan_out", "stream", "abort_hopeless", "surrogate", "dedupe", "output_root",
+                    "results_db", "no_results_db")
+    }
+    options["limits"] = parse_limits(args.limit, min(args.jobs, len(jobs)))
+    options["pool"] = {
+        "max_connections": args.max_connections,
+        "max_keepalive_connections": args.keepalive,
+        "timeout": args.timeout
+    }
+
+    counts = run_batch(jobs, options, args.jobs, args.budget)
+    sys.exit(1 if counts["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Benchmark the optimization loop against a latency-simulating fake model
+
+    python benchmark.py                    # run and compare against benchmarks/baseline.json
+    python benchmark.py --save-baseline    # store this run as the new baseline
+    python benchmark.py --latency 0.5      # simulate a slower model
+"""
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+from contextlib import redirect_stdout
+
+from ai_scientist import AIScientist, DEFAULT_PROMPTS
+from llm_backends import FakeBackend
+from prompt_optimizer_simple import SimplePromptOptimizer
+from usage_meter import UsageMeter
+
+BASELINE_FILE = "benchmarks/baseline.json"
+BENCH_TOPIC = "The impact of artificial intelligence on scientific research productivity"
+
+# Modules that should only be imported once a crew or the OpenAI API is actually used
+HEAVY_MODULES = ("crewai", "langchain_openai", "openai", "tiktoken")
+IMPORT_MODULES = ("ai_scientist", "prompt_optimizer_simple", "prompt_optimizer_korean", "batch")
+
+# Smallest absolute change per unit that can count as a regression; below it is timer noise.
+# Subprocess imports and startup jitter by tens of milliseconds, so those metrics set their own
+NOISE_FLOOR = {"s": 0.02, "ms": 1.0, "MB": 0.1, "1/min": 1.0, "modules": 0.0}
+
+
+def measure(fn):
+    """Run fn with stdout discarded; return (result, wall seconds, peak traced memory in MB)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        result = fn()
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, wall, peak / (1024 * 1024)
+
+
+def metric(name, value, unit, better="lower", floor=None):
+    """One result; `floor` overrides the unit's NOISE_FLOOR for metrics that are noisier than their unit suggests"""
+    result = {"name": name, "value": round(value, 4), "unit": unit, "better": better}
+    if floor is not None:
+        result["floor"] = floor
+    return result
+
+
+def phase_metrics(prefix, meter):
+    """Summed call latency per phase recorded by the meter"""
+    return [
+        metric(f"{prefix}.{phase}_latency", stats["latency"], "s")
+        for phase, stats in sorted(meter.summary()["by_phase"].items())
+    ]
+
+
+def bench_scientist_run(latency, repeats):
+    """AIScientist.run end to end (three stages) without a cache"""
+    meter = UsageMeter()
+    scientist = AIScientist(backend=FakeBackend(latency=latency), meter=meter)
+
+    def run():
+        for _ in range(repeats):
+            scientist.run(
+                DEFAULT_PROMPTS["researcher"],
+                DEFAULT_PROMPTS["analyst"],
+                DEFAULT_PROMPTS["writer"],
+                BENCH_TOPIC
+            )
+
+    _, wall, peak = measure(run)
+    overhead = wall - meter.summary()["total"]["latency"]
+    return [
+        metric("scientist_run.wall_per_run", wall / repeats, "s"),
+        metric("scientist_run.overhead_per_run", overhead / repeats, "s"),
+        metric("scientist_run.peak_memory", peak, "MB")
+    ]
+
+
+def bench_fan_out(latency, repeats, fan_out=4):
+    """AIScientist.run with the research stage fanned out into concurrent sub-questions"""
+    scientist = AIScientist(backend=FakeBackend(latency=latency), fan_out=fan_out)
+
+    def run():
+        for _ in range(repeats):
+            scientist.run(
+                DEFAULT_PROMPTS["researcher"],
+                DEFAULT_PROMPTS["analyst"],
+                DEFAULT_PROMPTS["writer"],
+                BENCH_TOPIC
+            )
+
+    _, wall, peak = measure(run)
+    timings = scientist.timings.summary()
+    return [
+        metric(f"scientist_run.fan_out_{fan_out}.wall_per_run", wall / repeats, "s"),
+        metric(f"scientist_run.fan_out_{fan_out}.researcher", timings["researcher"]["mean_seconds"], "s"),
+        metric(f"scientist_run.fan_out_{fan_out}.peak_memory", peak, "MB")
+    ]
+
+
+def bench_optimize(latency, iterations):
+    """Serial SimplePromptOptimizer.optimize, with per-phase latency and orchestration overhead"""
+    meter = UsageMeter()
+    optimizer = SimplePromptOptimizer(backend=FakeBackend(latency=latency), meter=meter)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        _, wall, peak = measure(lambda: optimizer.optimize(BENCH_TOPIC, iterations=iterations, output_dir=output_dir))
+
+    # Improvement calls overlap, so measure overhead against the critical path
+    # (crew + evaluation in series, improvements as one concurrent stage per iteration)
+    usage = meter.summary()
+    serial = sum(stats["latency"] for phase, stats in usage["by_phase"].items() if phase != "improve")
+    improve = usage["by_phase"].get("improve", {"latency": 0.0, "calls": 0})
+    critical_path = serial + improve["latency"] / 3
+    return [
+        metric("optimize.wall", wall, "s"),
+        metric("optimize.wall_per_iteration", wall / iterations, "s"),
+        metric("optimize.overhead", max(0.0, wall - critical_path), "s", floor=0.1),
+        metric("optimize.peak_memory", peak, "MB")
+    ] + phase_metrics("optimize", meter)
+
+
+def bench_population(latency, workers, generations, population_size):
+    """Candidate throughput of optimize_population at one concurrency level"""
+    optimizer = SimplePromptOptimizer(backend=FakeBackend(latency=latency))
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        _, wall, peak = measure(lambda: optimizer.optimize_population(
+            BENCH_TOPIC,
+            generations=generations,
+            population_size=population_size,
+            beam_width=2,
+            max_workers=workers,
+            output_dir=output_dir
+        ))
+        with open(f"{output_dir}/optimization_summary.json", "r", encoding="utf-8") as f:
+            evaluated = json.load(f)["candidates_evaluated"]
+
+    return [
+        metric(f"population.workers_{workers}.candidates_per_minute", evaluated / wall * 60, "1/min", "higher"),
+        metric(f"population.workers_{workers}.wall", wall, "s"),
+        metric(f"population.workers_{workers}.peak_memory", peak, "MB")
+    ]
+
+
+def fresh_import(module):
+    """Import time of a module in a fresh interpreter, and which heavy modules the import pulled in"""
+    code = (
+        "import sys, time, json\n"
+        "started = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(json.dumps({'seconds': time.perf_counter() - started, "
+        f"'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def bench_imports(repeats):
+    """Cold import time of the entry modules and wall time of a CLI command that needs no optimizer"""
+    metrics = []
+    for module in IMPORT_MODULES:
+        runs = [fresh_import(module) for _ in range(repeats)]
+        metrics.append(metric(f"import.{module}", min(run["seconds"] for run in runs) * 1000, "ms", floor=20.0))
+        metrics.append(metric(f"import.{module}.heavy_modules", len(runs[0]["heavy"]), "modules"))
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        walls = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, "batch.py", "--report", output_dir], capture_output=True, check=True)
+            walls.append(time.perf_counter() - started)
+    metrics.append(metric("startup.batch_report", min(walls), "s", floor=0.05))
+    return metrics
+
+
+def bench_micro(repeats):
+    """Score parsing and result file writes, which run on the optimize loop's critical path"""
+    backend = FakeBackend()
+    optimizer = SimplePromptOptimizer(backend=backend)
+    report = " ".join(["finding"] * 6000)
+
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for _ in range(repeats):
+            optimizer.evaluate_output(report)
+    evaluate = (time.perf_counter() - started) / repeats
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            for i in range(repeats):
+                optimizer.save_iteration_results(i + 1, DEFAULT_PROMPTS, report, 80.0, "Feedback", output_dir)
+        save = (time.perf_counter() - started) / repeats
+
+    return [
+        metric("micro.evaluate_output", evaluate * 1000, "ms"),
+        metric("micro.save_iteration_results", save * 1000, "ms")
+    ]
+
+
+def run_benchmarks(args):
+    metrics = []
+    metrics += bench_scientist_run(args.latency, args.repeats)
+    metrics += bench_fan_out(args.latency, args.repeats)
+    metrics += bench_optimize(args.latency, args.iterations)
+    for workers in args.workers:
+        metrics += bench_population(args.latency, workers, args.generations, args.population)
+    metrics += bench_micro(args.repeats * 10)
+    metrics += bench_imports(args.repeats)
+    return {
+        "config": {
+            "latency": args.latency,
+            "iterations": args.iterations,
+            "repeats": args.repeats,
+            "workers": args.workers,
+            "generations": args.generations,
+            "population": args.population
+        },
+        "metrics": metrics
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print each metric next to its baseline; return the names of metrics that regressed
+
+    A metric regresses when it is worse than the baseline by more than `tolerance` (relative)
+    and by more than its floor (absolute; its unit's NOISE_FLOOR unless the metric sets one),
+    so timer jitter on small values doesn't fail the gate. A metric whose baseline is 0 regresses by the floor alone.
+    """
+    previous = {m["name"]: m for m in baseline["metrics"]}
+    regressions = []
+
+    print(f"{'metric':<52} {'value':>12} {'baseline':>12} {'change':>9}")
+    for m in results["metrics"]:
+        base = previous.get(m["name"])
+        if base is None:
+            print(f"{m['name']:<52} {m['value']:>12.4f} {'-':>12} {'':>9}")
+            continue
+
+        # How much worse than the baseline, in the metric's own unit
+        worsening = m["value"] - base["value"] if m["better"] == "lower" else base["value"] - m["value"]
+        worse = worsening > m.get("floor", NOISE_FLOOR.get(m["unit"], 0.0)) and (
+            not base["value"] or worsening / abs(base["value"]) > tolerance
+        )
+        change = f"{(m['value'] - base['value']) / abs(base['value']):>+8.1%}" if base["value"] else f"{'':>8}"
+        flag = "  ⚠ regression" if worse else ""
+        print(f"{m['name']:<52} {m['value']:>12.4f} {base['value']:>12.4f} {change}{flag}")
+        if worse:
+            regressions.append(m["name"])
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the prompt optimization loop against a fake model")
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated seconds per LLM call")
+    parser.add_argument("--iterations", type=int, default=5, help="iterations for the serial optimize benchmark")
+    parser.add_argument("--repeats", type=int, default=5, help="repeats for AIScientist.run and micro benchmarks")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="concurrency levels")
+    parser.add_argument("--generations", type=int, default=3)
+    parser.add_argument("--population", type=int, default=8)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="store results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative change that counts as a regression")
+    parser.add_argument("--output", help="also write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"✓ Saved baseline to {args.baseline}")
+
+    baseline = {"metrics": []}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != results["config"]:
+            print("⚠ Baseline was recorded with a different configuration; comparison may be misleading")
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n⚠ {len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
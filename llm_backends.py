@@ -0,0 +1,343 @@
+import os
+import re
+import json
+import time
+import random
+import hashlib
+from types import SimpleNamespace
+
+# Separator line written by save_iteration_results between the evaluation and the AI Scientist output
+RESULT_SEPARATOR = "=" * 80
+
+
+def make_response(content, prompt_tokens, completion_tokens, model=None, finish_reason="stop"):
+    """Build an object shaped like an OpenAI chat completion response"""
+    return SimpleNamespace(
+        model=model,
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason=finish_reason)],
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=0)
+        )
+    )
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+# Structured-output schema names (see structured_output) and the request kind they imply
+SCHEMA_KINDS = {"evaluation": "evaluate", "agent_prompt": "improve", "repair": "repair"}
+
+
+def cache_identity(backend):
+    """What a backend contributes to cache keys: None for the live API, so keys of real runs never
+    change, and a label (with the settings that shape its replies) for fake and replay backends,
+    so their responses are never served to real runs or to each other"""
+    if backend is None:
+        return None
+    return getattr(backend, "cache_identity", type(backend).__name__)
+
+
+def request_kind(messages, response_format=None):
+    """Classify a request as "evaluate", "improve", "repair" or "agent" from its response format or messages"""
+    if response_format is not None:
+        name = response_format.get("json_schema", {}).get("name")
+        if name in SCHEMA_KINDS:
+            return SCHEMA_KINDS[name]
+    system = messages[0]["content"] if messages and messages[0]["role"] == "system" else ""
+    user = messages[-1]["content"] if messages else ""
+    if "JSON" in system:
+        return "improve"
+    if "Overall: [score]/100" in user or "전체: [점수]/100" in user:
+        return "evaluate"
+    return "agent"
+
+
+class OpenAIBackend:
+    """Live OpenAI chat completions through a client from a llm_pool.ClientPool
+
+    Every backend on the same pool (llm_pool.default_pool unless one is given) shares its
+    keep-alive HTTP connections, and backends with the same api_key and client settings share
+    one OpenAI client.
+
+    With on_delta, the response is streamed: on_delta(delta, text so far) is called for every
+    chunk, and a truthy return value stops the stream early (finish_reason "aborted").
+    """
+
+    streaming = True
+    cache_identity = None
+
+    def __init__(self, api_key=None, pool=None, **client_kwargs):
+        self.api_key = api_key
+        self.pool = pool
+        self.client_kwargs = client_kwargs
+
+    @property
+    def client(self):
+        # Looked up per request so clients rebuilt by ClientPool.configure are picked up
+        from llm_pool import default_pool
+        return (self.pool or default_pool).openai_client(self.api_key, **self.client_kwargs)
+
+    def complete(self, model, messages, temperature, on_delta=None, **kwargs):
+        if on_delta is None:
+            return self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                **kwargs
+            )
+
+        stream = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True},
+            **kwargs
+        )
+        text, usage, finish_reason = "", None, "stop"
+        try:
+            for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    text += delta
+                    if on_delta(delta, text):
+                        finish_reason = "aborted"
+                        break
+        finally:
+            stream.close()
+
+        # A stream stopped early never receives its usage chunk
+        response = make_response(
+            text,
+            sum(estimate_tokens(m["content"]) for m in messages),
+            estimate_tokens(text),
+            model,
+            finish_reason
+        )
+        if usage is not None:
+            response.usage = usage
+        return response
+
+
+class FakeBackend:
+    """Seeded local stand-in for the chat API with configurable latency and token counts
+
+    Responses are deterministic for a given (seed, model, messages, temperature). Evaluation
+    requests get a well-formed score block, improvement requests get valid prompt JSON, and
+    agent requests get filler text of `completion_tokens` length. Pass `script` (a callable
+    taking (kind, messages) and returning text, or None to fall through) to override replies.
+    With on_delta, replies are streamed in STREAM_CHUNKS chunks spread over the latency, like
+    OpenAIBackend.
+    """
+
+    streaming = True
+    STREAM_CHUNKS = 20
+
+    def __init__(self, latency=0.0, jitter=0.0, completion_tokens=800, seed=0, script=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.completion_tokens = completion_tokens
+        self.seed = seed
+        self.script = script
+        self.calls = 0
+
+    @property
+    def cache_identity(self):
+        script = getattr(self.script, "__qualname__", repr(self.script)) if self.script else None
+        return f"FakeBackend(seed={self.seed}, completion_tokens={self.completion_tokens}, script={script})"
+
+    def _rng(self, model, messages, temperature, seed):
+        payload = json.dumps([self.seed, seed, model, messages, temperature], sort_keys=True, ensure_ascii=False)
+        return random.Random(hashlib.sha256(payload.encode("utf-8")).hexdigest())
+
+    def complete(self, model, messages, temperature, seed=None, response_format=None, on_delta=None, **kwargs):
+        self.calls += 1
+        rng = self._rng(model, messages, temperature, seed)
+        kind = request_kind(messages, response_format)
+        delay = self.latency + rng.uniform(0, self.jitter) if self.latency or self.jitter else 0.0
+
+        if on_delta is None and delay:
+            time.sleep(delay)
+
+        content = self.script(kind, messages) if self.script else None
+        if content is None:
+            if kind == "evaluate":
+                content = self._evaluation(rng, messages[-1]["content"], structured=response_format is not None)
+            elif kind == "repair":
+                content = self._repair(rng, response_format["json_schema"]["schema"])
+            elif kind == "improve":
+                content = self._improvement(rng, messages[-1]["content"])
+            else:
+                content = self._agent_output(rng, messages)
+
+        prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+        completion_tokens = self.completion_tokens if kind == "agent" else estimate_tokens(content)
+        if on_delta is None:
+            return make_response(content, prompt_tokens, completion_tokens, model)
+
+        size = max(1, -(-len(content) // self.STREAM_CHUNKS))
+        text = ""
+        for start in range(0, len(content), size):
+            if delay:
+                time.sleep(delay / self.STREAM_CHUNKS)
+            text += content[start:start + size]
+            if on_delta(content[start:start + size], text):
+                # Only the streamed part is billed
+                completion_tokens = max(1, round(completion_tokens * len(text) / len(content)))
+                return make_response(text, prompt_tokens, completion_tokens, model, "aborted")
+        return make_response(content, prompt_tokens, completion_tokens, model)
+
+    def _evaluation(self, rng, text, structured=False):
+        # Richer outputs score higher, with judge-like noise
+        vocabulary = len(set(text.split()))
+        base = min(92.0, 60.0 + vocabulary / 25.0)
+        dimensions = ["Relevance", "Depth", "Clarity", "Rigor", "Comprehensiveness"]
+        scores = [round(min(100.0, max(0.0, base + rng.gauss(0, 3))), 1) for _ in dimensions]
+        overall = round(sum(scores) / len(scores), 1)
+        if structured:
+            evaluation = {name.lower(): score for name, score in zip(dimensions, scores)}
+            evaluation.update(
+                overall=overall,
+                feedback="Add more specific case studies, quantitative evidence and citations."
+            )
+            return json.dumps(evaluation)
+        lines = [f"{name}: {score}/100" for name, score in zip(dimensions, scores)]
+        lines.append(f"Overall: {overall}/100")
+        lines.append("")
+        lines.append("Feedback:")
+        lines.append("Add more specific case studies, quantitative evidence and citations.")
+        return "\n".join(lines)
+
+    def _improvement(self, rng, text):
+        goal = re.search(r"^(?:Goal|목표): (.*)$", text, re.MULTILINE)
+        backstory = re.search(r"^(?:Backstory|배경): (.*)$", text, re.MULTILINE)
+        extra = rng.choice([
+            "Cite peer-reviewed sources for every claim.",
+            "Include concrete case studies with quantitative results.",
+            "Discuss limitations and ethical considerations explicitly.",
+            "Structure findings with clear headings and summaries."
+        ])
+        return json.dumps({
+            "goal": f"{goal.group(1) if goal else ''} {extra}".strip(),
+            "backstory": f"{backstory.group(1) if backstory else ''} {extra}".strip()
+        }, ensure_ascii=False)
+
+    def _repair(self, rng, schema):
+        # Fill exactly the re-requested fields
+        return json.dumps({
+            field: round(rng.uniform(60, 90), 1) if spec["type"] == "number" else "Repaired field."
+            for field, spec in schema["properties"].items()
+        })
+
+    def _agent_output(self, rng, messages):
+        words = " ".join(m["content"] for m in messages).split()
+        length = max(1, int(self.completion_tokens * 0.75))
+        return " ".join(rng.choice(words) for _ in range(length))
+
+
+class ReplayBackend:
+    """Replays recorded runs from optimization result directories
+
+    - agent requests whose system prompt carries a recorded prompt set's goal get that
+      iteration's AI Scientist output
+    - evaluation requests for a recorded output get its recorded evaluation
+    - improvement requests for a recorded prompt get the next iteration's prompt
+
+    Unknown requests go to `fallback` (e.g. a FakeBackend) or raise LookupError.
+    """
+
+    def __init__(self, result_dirs=("optimization_results", "optimization_results_korean"), fallback=None,
+                 latency=0.0):
+        self.fallback = fallback
+        self.latency = latency
+        self.result_dirs = list(result_dirs)
+        self.iterations = []
+        for result_dir in result_dirs:
+            self.iterations.extend(self.load_dir(result_dir))
+
+    @property
+    def cache_identity(self):
+        return f"ReplayBackend({self.result_dirs}, fallback={cache_identity(self.fallback)})"
+
+    @staticmethod
+    def load_dir(result_dir):
+        """Load (prompts, evaluation, output) for every recorded iteration in a directory"""
+        iterations = []
+        n = 1
+        while os.path.exists(f"{result_dir}/iteration_{n}_prompts.json"):
+            with open(f"{result_dir}/iteration_{n}_prompts.json", "r", encoding="utf-8") as f:
+                prompts = json.load(f)
+            with open(f"{result_dir}/iteration_{n}_result.txt", "r", encoding="utf-8") as f:
+                text = f.read()
+
+            header, _, rest = text.partition(f"\n{RESULT_SEPARATOR}\n")
+            output = rest.partition(f"{RESULT_SEPARATOR}\n\n")[2]
+            evaluation = re.split(r"^(?:Score|점수): [\d.]+/100$", header, maxsplit=1, flags=re.MULTILINE)[-1]
+            iterations.append({
+                "dir": result_dir,
+                "iteration": n,
+                "prompts": prompts,
+                "evaluation": evaluation.strip().strip("`").strip(),
+                "output": output
+            })
+            n += 1
+        return iterations
+
+    def _next(self, record):
+        for candidate in self.iterations:
+            if candidate["dir"] == record["dir"] and candidate["iteration"] == record["iteration"] + 1:
+                return candidate
+        return None
+
+    def _find(self, messages, kind):
+        system = messages[0]["content"] if messages else ""
+        user = messages[-1]["content"] if messages else ""
+
+        if kind == "evaluate":
+            for record in self.iterations:
+                if record["output"] and record["output"][:500] in user:
+                    return record["evaluation"]
+            return None
+
+        # Improvement requests carry the current goal in the user message, agent requests in the system message
+        if kind == "improve":
+            match = re.search(r"^(?:Goal|목표): (.*)$", user, re.MULTILINE)
+        else:
+            match = re.search(r"^Your personal goal is: (.*)$", system, re.MULTILINE)
+        if match is None:
+            return None
+        goal = match.group(1).strip()
+
+        for record in self.iterations:
+            for role, prompt in record["prompts"].items():
+                if prompt["goal"].strip() != goal:
+                    continue
+                if kind == "agent":
+                    return record["output"]
+                nxt = self._next(record)
+                if nxt is not None:
+                    return json.dumps(nxt["prompts"][role], ensure_ascii=False)
+        return None
+
+    def complete(self, model, messages, temperature, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+
+        content = self._find(messages, request_kind(messages, kwargs.get("response_format")))
+        if content is None:
+            if self.fallback is not None:
+                return self.fallback.complete(model, messages, temperature, **kwargs)
+            raise LookupError("No recorded response matches this request")
+
+        prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+        return make_response(content, prompt_tokens, estimate_tokens(content), model)
@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a request has no cached response"""
+
+
+class LLMCache:
+    """Persistent content-addressed cache for LLM responses, backed by SQLite
+
+    Modes:
+    - "readwrite": serve hits, store new responses (default)
+    - "readonly":  serve hits, never store anything
+    - "replay":    serve hits, raise CacheMiss instead of calling the API
+    """
+
+    MODES = ("readwrite", "readonly", "replay")
+
+    def __init__(self, path=".llm_cache/llm_cache.sqlite", max_entries=None, max_size_mb=None,
+                 max_age_days=None, mode="readwrite"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cache mode: {mode} (expected one of {', '.join(self.MODES)})")
+
+        self.path = path
+        self.max_entries = max_entries
+        self.max_size_mb = max_size_mb
+        self.max_age_days = max_age_days
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._puts_since_evict = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " model TEXT,"
+                " value TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+            self._conn.commit()
+
+        if mode == "readwrite":
+            self.evict()
+
+    @staticmethod
+    def make_key(model, messages, temperature, seed=None, namespace="chat", max_tokens=None, response_format=None,
+                 backend=None):
+        """Hash the request parameters into a stable cache key
+
+        `backend` is the llm_backends.cache_identity of a non-live backend, which keeps offline
+        (fake or replay) responses apart from real ones.
+        """
+        params = {
+            "namespace": namespace,
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "seed": seed
+        }
+        if max_tokens is not None:
+            params["max_tokens"] = max_tokens
+        if response_format is not None:
+            params["response_format"] = response_format
+        if backend is not None:
+            params["backend"] = backend
+        payload = json.dumps(params, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached response for key, or None on a miss"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.hits += 1
+                if self.mode == "readwrite":
+                    self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+                    self._conn.commit()
+                return row[0]
+            self.misses += 1
+
+        if self.mode == "replay":
+            raise CacheMiss(f"No cached response for key {key[:12]}... in replay mode")
+        return None
+
+    def put(self, key, value, model=None):
+        """Store a response unless the cache is read-only"""
+        if self.mode != "readwrite":
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, value, len(value.encode("utf-8")), now, now)
+            )
+            self._conn.commit()
+            self._puts_since_evict += 1
+            should_evict = self._puts_since_evict >= 50
+
+        if should_evict:
+            self.evict()
+
+    def evict(self):
+        """Drop entries past the age limit, then least recently used entries past the size limits"""
+        with self._lock:
+            self._puts_since_evict = 0
+
+            if self.max_age_days is not None:
+                cutoff = time.time() - self.max_age_days * 86400
+                self._conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,))
+
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+            if self.max_size_mb is not None:
+                budget = self.max_size_mb * 1024 * 1024
+                total = 0
+                stale = []
+                for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at DESC"):
+                    total += size
+                    if total > budget:
+                        stale.append((key,))
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+            self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters and current cache size"""
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
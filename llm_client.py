@@ -0,0 +1,75 @@
+import time
+from llm_backends import OpenAIBackend, cache_identity
+from llm_scheduler import default_scheduler, estimate_request_tokens
+
+# Used when no backend is passed; the OpenAI client is only created on the first request
+default_backend = OpenAIBackend()
+
+
+def chat_completion(model, messages, temperature, cache=None, seed=None, meter=None, phase=None, role=None,
+                    backend=None, max_tokens=None, scheduler=None, response_format=None, on_delta=None):
+    """Send a chat completion request and return the message content, serving it from cache when possible
+
+    When a UsageMeter is given, the call's tokens, latency and cost are recorded under phase/role.
+    `backend` selects where requests go (OpenAIBackend by default, or a FakeBackend/ReplayBackend).
+    Requests go through `scheduler` (llm_scheduler.default_scheduler if not given) for rate
+    limiting, phase priority and retries. `response_format` is passed through for structured
+    outputs (see structured_output.response_format).
+
+    on_delta(delta, text so far) is called as the response streams in, on backends that stream
+    (otherwise, and on cache hits, once with the whole response). Returning a truthy value stops
+    the stream early; such partial responses are returned but never cached.
+    """
+    started = time.perf_counter()
+
+    key = None
+    if cache is not None:
+        key = cache.make_key(model, messages, temperature, seed, max_tokens=max_tokens,
+                             response_format=response_format, backend=cache_identity(backend))
+        cached = cache.get(key)
+        if cached is not None:
+            if meter is not None:
+                meter.record(model, phase, time.perf_counter() - started, role=role, cache_hit=True)
+            if on_delta is not None:
+                on_delta(cached, cached)
+            return cached
+
+    kwargs = {}
+    if seed is not None:
+        kwargs["seed"] = seed
+    if max_tokens is not None:
+        kwargs["max_tokens"] = max_tokens
+    if response_format is not None:
+        kwargs["response_format"] = response_format
+
+    backend = backend or default_backend
+    if on_delta is not None and getattr(backend, "streaming", False):
+        kwargs["on_delta"] = on_delta
+    scheduler = scheduler or default_scheduler
+    estimated = estimate_request_tokens(messages, max_tokens)
+
+    response = scheduler.call(
+        model,
+        estimated,
+        phase,
+        lambda: backend.complete(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            **kwargs
+        )
+    )
+    content = response.choices[0].message.content
+    aborted = response.choices[0].finish_reason == "aborted"
+    scheduler.settle(model, estimated, getattr(getattr(response, "usage", None), "total_tokens", None))
+
+    if meter is not None:
+        meter.record_response(model, phase, time.perf_counter() - started, response, role=role)
+
+    if on_delta is not None and "on_delta" not in kwargs and content is not None:
+        on_delta(content, content)
+
+    if cache is not None and content is not None and not aborted:
+        cache.put(key, content, model=model)
+
+    return content
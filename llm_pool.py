@@ -0,0 +1,156 @@
+import os
+import json
+import threading
+from contextlib import contextmanager
+from streaming import StreamAborted
+
+# The on_delta callback and text so far of streamed crew LLM calls in each thread (see stream_tokens)
+_stream_target = threading.local()
+
+
+@contextmanager
+def stream_tokens(on_delta):
+    """Send the tokens of streaming chat models called from this thread to on_delta(delta, text so far)
+
+    CrewAI calls the agent's model in the thread that runs crew.kickoff(), so wrapping kickoff
+    streams that stage. A truthy return value from on_delta aborts the call with StreamAborted.
+    """
+    _stream_target.on_delta, _stream_target.text = on_delta, ""
+    try:
+        yield
+    finally:
+        _stream_target.on_delta = None
+
+
+def token_handler():
+    """LangChain callback handler that forwards new tokens to the thread's stream_tokens target"""
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class ThreadTokenHandler(BaseCallbackHandler):
+        raise_error = True
+
+        def on_llm_new_token(self, token, **kwargs):
+            on_delta = getattr(_stream_target, "on_delta", None)
+            if on_delta is None or not token:
+                return
+            _stream_target.text += token
+            if on_delta(token, _stream_target.text):
+                raise StreamAborted("stopped", _stream_target.text)
+
+    return ThreadTokenHandler()
+
+
+class ClientPool:
+    """Process-wide HTTP connection pool shared by every OpenAI client and ChatOpenAI model
+
+    One httpx.Client (keep-alive connections, connection limits, timeouts) backs all clients, so
+    optimizer calls and crew runs reuse warm connections instead of opening their own. OpenAI
+    clients and ChatOpenAI models are built on first use and cached by their settings. Retries of
+    single requests are left to llm_scheduler, so the OpenAI clients' own retries are off unless
+    max_retries is set. A crew stage is one scheduler call around many model calls, so ChatOpenAI
+    models keep crew_max_retries SDK retries and a transient 429 does not re-run the whole stage.
+    """
+
+    def __init__(self, max_connections=50, max_keepalive_connections=20, keepalive_expiry=30.0,
+                 timeout=120.0, connect_timeout=10.0, max_retries=0, crew_max_retries=2):
+        self.settings = {}
+        self._http_client = None
+        self._openai_clients = {}
+        self._chat_models = {}
+        self._lock = threading.Lock()
+        self.configure(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            timeout=timeout,
+            connect_timeout=connect_timeout,
+            max_retries=max_retries,
+            crew_max_retries=crew_max_retries
+        )
+
+    def configure(self, **settings):
+        """Change pool settings, closing current connections; clients are rebuilt with them on next use"""
+        unknown = set(settings) - {"max_connections", "max_keepalive_connections", "keepalive_expiry",
+                                   "timeout", "connect_timeout", "max_retries", "crew_max_retries"}
+        if unknown:
+            raise ValueError(f"Unknown pool setting(s): {', '.join(sorted(unknown))}")
+        self.close()
+        with self._lock:
+            self.settings.update(settings)
+
+    def http_client(self):
+        """The shared httpx.Client, created on first use"""
+        with self._lock:
+            if self._http_client is None:
+                import httpx
+
+                self._http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=self.settings["max_connections"],
+                        max_keepalive_connections=self.settings["max_keepalive_connections"],
+                        keepalive_expiry=self.settings["keepalive_expiry"]
+                    ),
+                    timeout=httpx.Timeout(self.settings["timeout"], connect=self.settings["connect_timeout"])
+                )
+            return self._http_client
+
+    def openai_client(self, api_key=None, **client_kwargs):
+        """An OpenAI client on the shared connection pool, one per distinct api_key and client settings"""
+        key = json.dumps([api_key, client_kwargs], sort_keys=True, default=str)
+        http_client = self.http_client()
+        with self._lock:
+            if key not in self._openai_clients:
+                from openai import OpenAI
+
+                client_kwargs.setdefault("max_retries", self.settings["max_retries"])
+                self._openai_clients[key] = OpenAI(
+                    api_key=api_key or os.getenv("OPENAI_API_KEY"),
+                    http_client=http_client,
+                    **client_kwargs
+                )
+            return self._openai_clients[key]
+
+    def chat_model(self, model, temperature, max_tokens=None, streaming=False):
+        """A ChatOpenAI model for CrewAI agents on the shared connection pool, cached by its settings
+
+        A streaming model sends its tokens to the calling thread's stream_tokens target.
+        """
+        key = (model, temperature, max_tokens, streaming)
+        http_client = self.http_client()
+        with self._lock:
+            if key not in self._chat_models:
+                from langchain_openai import ChatOpenAI
+
+                extra = {"streaming": True, "callbacks": [token_handler()]} if streaming else {}
+                self._chat_models[key] = ChatOpenAI(
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    openai_api_key=os.getenv("OPENAI_API_KEY"),
+                    http_client=http_client,
+                    max_retries=self.settings["crew_max_retries"],
+                    **extra
+                )
+            return self._chat_models[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "http_clients": int(self._http_client is not None),
+                "openai_clients": len(self._openai_clients),
+                "chat_models": len(self._chat_models),
+                **self.settings
+            }
+
+    def close(self):
+        """Close the shared connections and drop cached clients"""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._openai_clients.clear()
+            self._chat_models.clear()
+
+
+# Shared by every OpenAIBackend and AIScientist that is not given its own pool
+default_pool = ClientPool()
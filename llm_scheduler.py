@@ -0,0 +1,183 @@
+import time
+import heapq
+import random
+import itertools
+import threading
+
+# Lower runs first: evaluations (and re-asks that complete them) decide what we keep, crew
+# runs feed them, and prompt improvement and compression are exploratory generation that can wait
+PHASE_PRIORITIES = {
+    "evaluate": 0,
+    "repair": 0,
+    "crew": 1,
+    "improve": 2,
+    "compress": 2
+}
+
+# Completion tokens assumed when a request does not set max_tokens
+DEFAULT_COMPLETION_ESTIMATE = 1000
+
+TRANSIENT_STATUS = (408, 409, 500, 502, 503, 504)
+TRANSIENT_ERRORS = ("APITimeoutError", "APIConnectionError", "InternalServerError", "Timeout", "ConnectionError")
+
+
+def estimate_request_tokens(messages, max_tokens=None):
+    """Rough prompt + completion token estimate (~4 characters per token)"""
+    prompt = sum(len(m["content"] or "") for m in messages) // 4
+    return prompt + (max_tokens or DEFAULT_COMPLETION_ESTIMATE)
+
+
+def retry_after(error):
+    """Seconds the server asked us to wait, from Retry-After / retry-after-ms headers, or None"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms") is not None:
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after") is not None:
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def is_retryable(error):
+    """Rate limits (429) and transient server or connection errors"""
+    status = getattr(error, "status_code", None)
+    name = type(error).__name__
+    return status == 429 or status in TRANSIENT_STATUS or name == "RateLimitError" or name in TRANSIENT_ERRORS
+
+
+class TokenBucket:
+    """Continuously refilling bucket; level may go negative when usage exceeds the estimate"""
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """Seconds until `amount` (clamped to capacity) is available"""
+        self.refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+
+class RequestScheduler:
+    """Shared client-side scheduler for LLM calls
+
+    Per-model request (rpm) and token (tpm) buckets throttle calls before they hit the
+    org's limits, waiting requests are served by phase priority (evaluation first), and
+    rate-limited or transient failures are retried with jittered exponential backoff that
+    honors Retry-After. limits maps model name to {"rpm": ..., "tpm": ...}; models without
+    limits are not throttled but still get priorities and retries.
+    """
+
+    def __init__(self, limits=None, max_retries=6, base_delay=1.0, max_delay=60.0):
+        self.limits = limits or {}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.throttled_seconds = 0.0
+        self._buckets = {}
+        self._queues = {}
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+
+    def _model_buckets(self, model):
+        if model not in self._buckets:
+            limit = self.limits.get(model, {})
+            self._buckets[model] = (
+                TokenBucket(limit["rpm"]) if limit.get("rpm") else None,
+                TokenBucket(limit["tpm"]) if limit.get("tpm") else None
+            )
+        return self._buckets[model]
+
+    def _wait_time(self, model, tokens):
+        requests, token_bucket = self._model_buckets(model)
+        waits = [0.0]
+        if requests is not None:
+            waits.append(requests.wait_time(1))
+        if token_bucket is not None:
+            waits.append(token_bucket.wait_time(tokens))
+        return max(waits)
+
+    def acquire(self, model, tokens, phase=None):
+        """Block until this request is first in its model's priority queue and the buckets allow it"""
+        entry = (PHASE_PRIORITIES.get(phase, 1), next(self._sequence))
+        started = time.monotonic()
+
+        with self._cond:
+            queue = self._queues.setdefault(model, [])
+            heapq.heappush(queue, entry)
+            try:
+                while True:
+                    if queue[0] == entry:
+                        wait = self._wait_time(model, tokens)
+                        if wait <= 0:
+                            break
+                        self._cond.wait(timeout=wait)
+                    else:
+                        self._cond.wait()
+            finally:
+                queue.remove(entry)
+                heapq.heapify(queue)
+
+            requests, token_bucket = self._model_buckets(model)
+            if requests is not None:
+                requests.level -= 1
+            if token_bucket is not None:
+                token_bucket.level -= min(tokens, token_bucket.capacity)
+            self.throttled_seconds += time.monotonic() - started
+            self._cond.notify_all()
+
+    def settle(self, model, estimated, actual, requests=1):
+        """Correct the buckets once the real usage of a request is known
+
+        `requests` is how many API calls it actually made (e.g. a CrewAI kickoff makes several);
+        the ones beyond the first are charged to the request bucket.
+        """
+        with self._cond:
+            request_bucket, token_bucket = self._model_buckets(model)
+            if request_bucket is not None and requests > 1:
+                request_bucket.level -= requests - 1
+            if token_bucket is not None and actual:
+                token_bucket.level -= actual - min(estimated, token_bucket.capacity)
+
+    def call(self, model, tokens, phase, fn):
+        """Run fn() under the model's limits, retrying rate-limited and transient failures"""
+        for attempt in range(self.max_retries + 1):
+            self.acquire(model, tokens, phase)
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+
+                delay = retry_after(e)
+                if delay is None:
+                    delay = min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.5)
+                with self._cond:
+                    self.retries += 1
+                print(f"   ⏳ {type(e).__name__} from {model}; retrying in {delay:.1f}s "
+                      f"(attempt {attempt + 2}/{self.max_retries + 1})")
+                time.sleep(delay)
+
+    def stats(self):
+        return {
+            "retries": self.retries,
+            "throttled_seconds": round(self.throttled_seconds, 3)
+        }
+
+
+# Shared by every call that is not given its own scheduler: no throttling, but priorities and retries
+default_scheduler = RequestScheduler()
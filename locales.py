@@ -0,0 +1,261 @@
+from ai_scientist import DEFAULT_PROMPTS
+
+# Locale packs: everything language-specific about an optimization run. The optimizer engine
+# (prompt_optimizer_simple.SimplePromptOptimizer) fills these templates with str.format:
+# - evaluation_prompt: {result}
+# - improvement_prompt: {role}, {goal}, {backstory}, {feedback}
+# - compression_prompt: {role}, {goal}, {backstory}
+# dimension_labels are the names written into rendered evaluations and must be aliases in
+# scoring.DIMENSIONS so the scores can be parsed back.
+
+ENGLISH = {
+    "name": "English",
+    "output_dir": "optimization_results",
+    "default_prompts": DEFAULT_PROMPTS,
+    "role_names": {
+        "researcher": "Research Scientist",
+        "analyst": "Data Analyst",
+        "writer": "Scientific Writer"
+    },
+    "dimension_labels": {
+        "relevance": "Relevance",
+        "depth": "Depth",
+        "clarity": "Clarity",
+        "rigor": "Rigor",
+        "comprehensiveness": "Comprehensiveness",
+        "overall": "Overall"
+    },
+    "feedback_label": "Feedback",
+    "weakest_label": "Weakest dimensions to fix first",
+    "aborted_feedback": "The AI Scientist run was stopped early because its output was {reason}. "
+                        "The prompts must keep every agent on the research topic and make it produce substantive content.",
+    "abort_reasons": {"empty": "empty or nearly empty", "off_topic": "off-topic"},
+    "reused_result": "(Output not stored: this score was reused from a near-duplicate prompt set evaluated in an earlier run.)",
+    "result_labels": {
+        "iteration": "Iteration",
+        "generation": "Generation",
+        "candidate": "Candidate",
+        "timestamp": "Timestamp",
+        "score": "Score",
+        "output": "AI Scientist Output"
+    },
+    "evaluation_system": "You are a rigorous scientific reviewer who provides precise, fine-grained evaluations. "
+                         "Use decimal precision in your scores.",
+    "evaluation_prompt": """You are an expert scientific reviewer. Evaluate the following AI scientist's output with PRECISE, GRANULAR scoring.
+
+Use a 0-100 scale where:
+- 0-20: Severely deficient, unusable
+- 21-40: Poor quality, major issues
+- 41-60: Mediocre, significant improvements needed
+- 61-75: Acceptable, but clear room for improvement
+- 76-85: Good quality, minor improvements possible
+- 86-95: Excellent, high-quality work
+- 96-100: Outstanding, publication-ready
+
+Evaluate on these dimensions (weight each equally):
+
+1. **Relevance (0-100)**: How directly and comprehensively does it address the topic?
+2. **Depth of Analysis (0-100)**: How thorough, detailed, and insightful is the analysis? Are specific examples, case studies, and quantitative data provided?
+3. **Clarity (0-100)**: How clear, well-structured, and readable is the writing?
+4. **Scientific Rigor (0-100)**: How sound is the methodology? Are claims supported by citations and evidence?
+5. **Comprehensiveness (0-100)**: How complete is the coverage? Are multiple perspectives, ethical considerations, and limitations addressed?
+
+Provide scores for EACH dimension, then calculate the OVERALL score as the average.
+
+**CRITICAL**: Be precise with decimals. Use scores like 67.5, 72.3, 84.8, not just whole numbers.
+**CRITICAL**: Identify specific weaknesses and strengths to justify the score.
+**CRITICAL**: Be discerning - reserve scores above 85 for truly exceptional work.
+
+Respond ONLY with a JSON object with these fields:
+- "relevance", "depth", "clarity", "rigor", "comprehensiveness": the dimension scores (0-100)
+- "overall": the average of the five dimension scores
+- "feedback": detailed feedback with specific examples of strengths and weaknesses for each dimension
+
+Output to evaluate:
+{result}
+""",
+    "improvement_system": "You are an expert in prompt engineering for AI research agents. Output only valid JSON.",
+    "improvement_prompt": """You are an expert prompt engineer specializing in AI agent optimization.
+
+Role: {role}
+Current Prompt:
+Goal: {goal}
+Backstory: {backstory}
+
+Recent Evaluation Feedback:
+{feedback}
+
+Your task: Create SIGNIFICANTLY IMPROVED prompts that address the weaknesses mentioned in the feedback.
+
+Key improvements needed:
+- Add specific examples and case studies
+- Include detailed methodological guidance
+- Emphasize scientific rigor and citation practices
+- Expand depth of analysis expectations
+- Include ethical considerations
+- Make the agent more proactive and comprehensive
+
+Create detailed, professional prompts that will guide this agent to produce higher quality scientific work.
+
+Respond ONLY with valid JSON in this exact format (no markdown, no extra text):
+{{
+  "goal": "detailed, specific goal that includes what to prioritize and how to approach the task",
+  "backstory": "comprehensive backstory that establishes expertise, methods, and high standards for this role"
+}}
+""",
+    "compression_prompt": """You are an expert prompt engineer. Rewrite the following agent prompt to be as concise as possible.
+
+Role: {role}
+Goal: {goal}
+Backstory: {backstory}
+
+Rules:
+- Keep every distinct instruction, requirement and quality standard
+- Merge directives that say the same thing and remove filler, repetition and flourish
+- Do not add new instructions
+
+Respond ONLY with valid JSON in this exact format (no markdown, no extra text):
+{{
+  "goal": "concise goal",
+  "backstory": "concise backstory"
+}}
+"""
+}
+
+KOREAN = {
+    "name": "한국어",
+    "output_dir": "optimization_results_korean",
+    # 한글 기본 프롬프트 (의도적으로 매우 낮은 품질)
+    "default_prompts": {
+        "researcher": {
+            "goal": "연구해",
+            "backstory": "너는 연구하는 사람이야."
+        },
+        "analyst": {
+            "goal": "분석해",
+            "backstory": "너는 분석하는 사람이야."
+        },
+        "writer": {
+            "goal": "글 써",
+            "backstory": "너는 글 쓰는 사람이야."
+        }
+    },
+    "role_names": {
+        "researcher": "연구 과학자",
+        "analyst": "데이터 분석가",
+        "writer": "과학 작가"
+    },
+    "dimension_labels": {
+        "relevance": "관련성",
+        "depth": "깊이",
+        "clarity": "명료성",
+        "rigor": "엄밀성",
+        "comprehensiveness": "포괄성",
+        "overall": "전체"
+    },
+    "feedback_label": "피드백",
+    "weakest_label": "우선 개선할 가장 약한 차원",
+    "aborted_feedback": "AI 과학자 실행이 출력이 {reason} 조기에 중단되었습니다. "
+                        "프롬프트는 모든 에이전트가 연구 주제에 집중하고 실질적인 내용을 생성하도록 해야 합니다.",
+    "abort_reasons": {"empty": "비어 있거나 거의 비어 있어", "off_topic": "주제와 무관하여"},
+    "reused_result": "(출력이 저장되지 않음: 이전 실행에서 평가된 거의 같은 프롬프트 세트의 점수를 재사용했습니다.)",
+    "result_labels": {
+        "iteration": "반복",
+        "generation": "세대",
+        "candidate": "후보",
+        "timestamp": "시간",
+        "score": "점수",
+        "output": "AI 과학자 출력"
+    },
+    "evaluation_system": "당신은 정밀하고 세밀한 평가를 제공하는 엄격한 과학 심사위원입니다. 점수에 소수점을 사용하세요.",
+    "evaluation_prompt": """당신은 전문 과학 논문 심사위원입니다. 다음 AI 과학자의 출력물을 정밀하고 세밀하게 평가하세요.
+
+0-100점 척도를 사용하세요:
+- 0-20: 심각한 결함, 사용 불가
+- 21-40: 낮은 품질, 주요 문제 있음
+- 41-60: 평범함, 상당한 개선 필요
+- 61-75: 수용 가능하나 개선의 여지 많음
+- 76-85: 좋은 품질, 약간의 개선 가능
+- 86-95: 탁월함, 높은 품질
+- 96-100: 뛰어남, 출판 준비 완료
+
+다음 차원으로 평가하세요 (각각 동일한 가중치):
+
+1. **관련성 (0-100)**: 주제를 얼마나 직접적이고 포괄적으로 다루는가?
+2. **분석 깊이 (0-100)**: 얼마나 철저하고 상세하며 통찰력 있는가? 구체적인 사례, 케이스 스터디, 정량적 데이터가 제공되는가?
+3. **명료성 (0-100)**: 얼마나 명확하고 잘 구조화되어 있으며 읽기 쉬운가?
+4. **과학적 엄밀성 (0-100)**: 방법론이 얼마나 타당한가? 주장이 인용과 증거로 뒷받침되는가?
+5. **포괄성 (0-100)**: 다양한 관점, 윤리적 고려사항, 한계점을 다루는가?
+
+각 차원별 점수를 제공한 후, 전체 점수를 평균으로 계산하세요.
+
+**중요**: 소수점을 정확하게 사용하세요. 67.5, 72.3, 84.8과 같은 점수를 사용하고, 정수만 사용하지 마세요.
+**중요**: 점수를 정당화할 구체적인 강점과 약점을 파악하세요.
+**중요**: 신중하게 평가하세요 - 85점 이상은 진정으로 뛰어난 작업에만 부여하세요.
+
+다음 필드를 가진 JSON 객체로만 응답하세요:
+- "relevance", "depth", "clarity", "rigor", "comprehensiveness": 관련성, 깊이, 명료성, 엄밀성, 포괄성 점수 (0-100)
+- "overall": 다섯 차원 점수의 평균
+- "feedback": 각 차원별 강점과 약점에 대한 구체적인 예시를 포함한 상세한 한글 피드백
+
+평가할 출력물:
+{result}
+""",
+    "improvement_system": "당신은 AI 연구 에이전트를 위한 프롬프트 엔지니어링 전문가입니다. 유효한 JSON만 출력하세요.",
+    "improvement_prompt": """당신은 AI 에이전트 최적화 전문 프롬프트 엔지니어입니다.
+
+역할: {role}
+현재 프롬프트:
+목표: {goal}
+배경: {backstory}
+
+최근 평가 피드백:
+{feedback}
+
+당신의 작업: 피드백에서 언급된 약점을 해결하는 대폭 개선된 프롬프트를 생성하세요.
+
+필요한 주요 개선사항:
+- 구체적인 예시와 케이스 스터디 추가
+- 상세한 방법론적 지침 포함
+- 과학적 엄밀성과 인용 관행 강조
+- 분석 깊이 기대치 확대
+- 윤리적 고려사항 포함
+- 에이전트를 더 적극적이고 포괄적으로 만들기
+
+이 에이전트가 더 높은 품질의 과학적 작업을 생성하도록 안내할 상세하고 전문적인 프롬프트를 생성하세요.
+
+다음 형식의 유효한 JSON으로만 응답하세요 (마크다운 없이, 추가 텍스트 없이):
+{{
+  "goal": "우선순위와 접근 방법을 포함한 상세하고 구체적인 목표",
+  "backstory": "전문성, 방법론, 높은 기준을 확립하는 포괄적인 배경"
+}}
+""",
+    "compression_prompt": """당신은 전문 프롬프트 엔지니어입니다. 다음 에이전트 프롬프트를 최대한 간결하게 다시 작성하세요.
+
+역할: {role}
+목표: {goal}
+배경: {backstory}
+
+규칙:
+- 서로 다른 지시, 요구사항, 품질 기준은 모두 유지
+- 같은 내용을 말하는 지시는 합치고 군더더기, 반복, 수식어는 제거
+- 새로운 지시를 추가하지 말 것
+
+다음 형식의 유효한 JSON으로만 응답하세요 (마크다운 없이, 추가 텍스트 없이):
+{{
+  "goal": "간결한 목표",
+  "backstory": "간결한 배경"
+}}
+"""
+}
+
+LOCALES = {"en": ENGLISH, "ko": KOREAN}
+
+
+def get_locale(language):
+    """The locale pack for a language code, or the pack itself if one is passed"""
+    if isinstance(language, dict):
+        return language
+    if language not in LOCALES:
+        raise ValueError(f"Unknown language {language!r}; expected one of {', '.join(LOCALES)}")
+    return LOCALES[language]
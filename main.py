@@ -1,20 +1,32 @@
-from ai_scientist import AIScientist, DEFAULT_PROMPTS
-from prompt_optimizer_simple import SimplePromptOptimizer, save_optimized_prompts
+from ai_scientist import AIScientist
+from locales import LOCALES
+from prompt_optimizer_simple import SimplePromptOptimizer, save_optimized_prompts, optimize_languages
+from prompt_optimizer_korean import KoreanPromptOptimizer, save_optimized_prompts_kr
+from llm_cache import LLMCache
+from results_store import ResultsStore
 import os
+import argparse
 
+# Topic used for each language when --topic is not given
+DEFAULT_TOPICS = {
+    "en": "The impact of artificial intelligence on scientific research productivity",
+    "ko": "인공지능이 과학 연구 생산성에 미치는 영향"
+}
 
-def run_basic_scientist(research_topic):
-    """Run AI scientist with default prompts"""
+
+def run_basic_scientist(research_topic, stream=False, language="en"):
+    """Run AI scientist with the language's default prompts (stream=True prints the report as it is written)"""
     print("\n" + "="*80)
     print("Running AI Scientist with Default Prompts")
     print("="*80 + "\n")
 
-    scientist = AIScientist(model_name="gpt-4o-mini")
+    scientist = AIScientist(model_name="gpt-4o-mini", stream_console=stream)
+    prompts = LOCALES[language]["default_prompts"]
 
     result = scientist.run(
-        DEFAULT_PROMPTS["researcher"],
-        DEFAULT_PROMPTS["analyst"],
-        DEFAULT_PROMPTS["writer"],
+        prompts["researcher"],
+        prompts["analyst"],
+        prompts["writer"],
         research_topic
     )
 
@@ -27,23 +39,36 @@ def run_basic_scientist(research_topic):
     return result
 
 
-def run_optimized_scientist(research_topic, iterations=3):
-    """Run AI scientist with optimized prompts"""
+def run_optimized_scientist(research_topic, iterations=3, stream=False, language="en"):
+    """Run AI scientist with optimized prompts
+
+    Korean runs use KoreanPromptOptimizer and its result paths (optimization_results_korean/,
+    optimized_prompts_korean.py), like main_korean.py.
+    """
     print("\n" + "="*80)
     print("Optimizing AI Scientist Prompts")
     print("="*80 + "\n")
 
-    # Initialize optimizer
-    optimizer = SimplePromptOptimizer(model_name="gpt-4o")
+    # Initialize optimizer (repeated requests are served from the on-disk cache)
+    # Every scored prompt set is also recorded in the results store for comparing runs
+    store = ResultsStore()
+    optimizer_class = KoreanPromptOptimizer if language == "ko" else SimplePromptOptimizer
+    optimizer = optimizer_class(model_name="gpt-4o", cache=LLMCache(), stream=stream, results_store=store)
 
     # Optimize prompts
-    optimized_prompts, score = optimizer.optimize(
-        research_topic=research_topic,
-        iterations=iterations
-    )
+    try:
+        optimized_prompts, score = optimizer.optimize(
+            research_topic=research_topic,
+            iterations=iterations
+        )
+    finally:
+        store.close()
 
     # Save optimized prompts
-    save_optimized_prompts(optimized_prompts)
+    if language == "ko":
+        save_optimized_prompts_kr(optimized_prompts)
+    else:
+        save_optimized_prompts(optimized_prompts)
 
     print("\n" + "="*80)
     print("Optimized Prompts:")
@@ -57,9 +82,43 @@ def run_optimized_scientist(research_topic, iterations=3):
     return optimized_prompts, score
 
 
+def run_language_comparison(topics, iterations=3, output_root="optimization_results_languages"):
+    """Optimize the prompts in several languages at once, sharing the cache, scheduler and connections"""
+    print("\n" + "="*80)
+    print(f"Optimizing AI Scientist Prompts in {len(topics)} languages: {', '.join(topics)}")
+    print("="*80 + "\n")
+
+    store = ResultsStore()
+    try:
+        results = optimize_languages(
+            topics,
+            languages=list(topics),
+            output_root=output_root,
+            optimizer_kwargs={"model_name": "gpt-4o", "cache": LLMCache(), "results_store": store},
+            iterations=iterations
+        )
+    finally:
+        store.close()
+
+    for language, (prompts, _) in results.items():
+        if language == "ko":
+            save_optimized_prompts_kr(prompts, os.path.join(output_root, language, "optimized_prompts_korean.py"))
+        else:
+            save_optimized_prompts(prompts, os.path.join(output_root, language, "optimized_prompts.py"))
+    return results
+
+
 def main():
-    # Set your research topic
-    RESEARCH_TOPIC = "The impact of artificial intelligence on scientific research productivity"
+    parser = argparse.ArgumentParser(description="AI Scientist with prompt optimization (see batch.py for sweeps)")
+    parser.add_argument("--mode", choices=["basic", "optimize", "both"], default="optimize",
+                        help="basic: default prompts only; optimize: prompt optimization; both: basic run, then optimize")
+    parser.add_argument("--topic", help="research topic (default: a topic in each language)")
+    parser.add_argument("--language", nargs="+", choices=["en", "ko"], default=["en"],
+                        help="optimize in these languages; several run concurrently (e.g. --language en ko)")
+    parser.add_argument("--iterations", type=int, default=5, help="number of optimization iterations")
+    parser.add_argument("--stream", action="store_true",
+                        help="print the basic run's report as it is written; stream optimization runs to <results>/streams")
+    args = parser.parse_args()
 
     # Check if OPENAI_API_KEY is set
     if not os.getenv("OPENAI_API_KEY"):
@@ -72,34 +131,21 @@ def main():
     print("AI Scientist with Prompt Optimization")
     print("="*80)
 
-    # Option 1: Run basic AI scientist with default prompts
-    print("\nOption 1: Run with default prompts")
-    print("Option 2: Run with prompt optimization")
-    print("Option 3: Run both")
-
-    choice = input("\nSelect option (1/2/3): ").strip()
-
-    if choice == "1":
-        # Run with default prompts
-        run_basic_scientist(RESEARCH_TOPIC)
+    topics = {language: args.topic or DEFAULT_TOPICS[language] for language in args.language}
 
-    elif choice == "2":
-        # Run with optimization
-        iterations = int(input("Number of optimization iterations (default 5): ").strip() or "5")
-        run_optimized_scientist(RESEARCH_TOPIC, iterations=iterations)
+    if args.mode in ("basic", "both"):
+        # Run with each selected language's default prompts
+        for language, topic in topics.items():
+            run_basic_scientist(topic, stream=args.stream, language=language)
 
-    elif choice == "3":
-        # Run both
-        print("\n--- Running with default prompts first ---")
-        run_basic_scientist(RESEARCH_TOPIC)
-
-        print("\n--- Now optimizing prompts ---")
-        iterations = int(input("Number of optimization iterations (default 5): ").strip() or "5")
-        run_optimized_scientist(RESEARCH_TOPIC, iterations=iterations)
-
-    else:
-        print("Invalid option. Exiting.")
+    if args.mode in ("optimize", "both"):
+        # Run with optimization; only several languages at once go through the comparison
+        if len(topics) == 1:
+            language, topic = next(iter(topics.items()))
+            run_optimized_scientist(topic, iterations=args.iterations, stream=args.stream, language=language)
+        else:
+            run_language_comparison(topics, iterations=args.iterations)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,8 +3,10 @@
 한글 AI 과학자 프롬프트 최적화 메인 스크립트
 """
 import os
+import argparse
 from dotenv import load_dotenv
 from prompt_optimizer_korean import KoreanPromptOptimizer, save_optimized_prompts_kr
+from llm_cache import LLMCache
 
 # .env 파일에서 환경변수 로드
 load_dotenv()
@@ -12,7 +14,8 @@ load_dotenv()
 
 def run_korean_optimization(research_topic, iterations=10):
     """한글로 AI 과학자 최적화 실행"""
-    optimizer = KoreanPromptOptimizer(model_name="gpt-4o")
+    # 동일한 요청은 디스크 캐시에서 재사용
+    optimizer = KoreanPromptOptimizer(model_name="gpt-4o", cache=LLMCache())
 
     print(f"\n{'='*80}")
     print(f"🇰🇷 한글 AI 과학자 프롬프트 최적화")
@@ -45,8 +48,9 @@ def run_korean_optimization(research_topic, iterations=10):
 
 
 if __name__ == "__main__":
-    # 연구 주제 (한글)
-    research_topic = "인공지능이 과학 연구 생산성에 미치는 영향"
+    parser = argparse.ArgumentParser(description="한글 AI 과학자 프롬프트 최적화 (여러 작업은 batch.py --language ko)")
+    parser.add_argument("--topic", default="인공지능이 과학 연구 생산성에 미치는 영향", help="연구 주제 (한글)")
+    parser.add_argument("--iterations", type=int, default=10, help="최적화 반복 횟수")
+    args = parser.parse_args()
 
-    # 10회 반복 최적화 실행
-    run_korean_optimization(research_topic, iterations=10)
+    run_korean_optimization(args.topic, iterations=args.iterations)
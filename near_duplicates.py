@@ -0,0 +1,184 @@
+import os
+import json
+import random
+import re
+import hashlib
+import threading
+import zlib
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows; appends there are only serialized within the process
+    fcntl = None
+
+WORD = re.compile(r"\w+")
+
+# Largest prime below 2^32, the modulus of the MinHash permutations
+PRIME = 4294967291
+
+
+def shingles(prompts, size=3):
+    """Word n-grams of every role's goal and backstory, tagged with the role so roles don't mix"""
+    result = set()
+    for role in sorted(prompts):
+        words = WORD.findall(f"{prompts[role]['goal']} {prompts[role]['backstory']}".lower())
+        if len(words) < size:
+            result.add(f"{role}:{' '.join(words)}")
+        result.update(f"{role}:{' '.join(words[i:i + size])}" for i in range(len(words) - size + 1))
+    return result
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index over evaluated prompt sets, so near-identical candidates reuse known scores
+
+    Prompt sets are compared by the Jaccard similarity of their word 3-gram shingles. MinHash
+    signatures split into `bands` LSH bands find likely neighbours; their exact similarity is
+    then checked against `threshold`. Entries live in a namespace (topic, models, backend
+    and evaluation fidelity), since scores are only comparable within one.
+
+    With `path`, every entry is also appended to a JSONL file and loaded from it on start, so
+    candidates can match prompt sets evaluated in earlier runs. Appends hold an exclusive file
+    lock, so several processes can share one file; lines that don't parse (e.g. cut off when a
+    process was killed mid-write) are skipped and counted. The file stores a hash of each
+    outcome's `result` rather than the report itself, so entries loaded from it have none.
+    """
+
+    def __init__(self, threshold=0.9, num_perm=64, bands=16, path=None, seed=0):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self.permutations = [(rng.randrange(1, PRIME), rng.randrange(PRIME)) for _ in range(num_perm)]
+        self.path = path
+        self.entries = []
+        self.buckets = {}
+        self.lookups = 0
+        self.hits = 0
+        self.interpolated = 0
+        self.skipped_lines = 0
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                        self._insert(record["namespace"], record["prompts"], record["outcome"])
+                    except (ValueError, KeyError, TypeError):
+                        self.skipped_lines += 1
+            if self.skipped_lines:
+                print(f"⚠ Skipped {self.skipped_lines} unreadable line(s) of {path}")
+
+    def signature(self, shingle_set):
+        hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingle_set] or [0]
+        return [min((a * h + b) % PRIME for h in hashes) for a, b in self.permutations]
+
+    def _band_keys(self, namespace, signature):
+        return [
+            (namespace, band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    def _insert(self, namespace, prompts, outcome):
+        shingle_set = shingles(prompts)
+        index = len(self.entries)
+        self.entries.append({"shingles": shingle_set, "prompts": prompts, "outcome": outcome})
+        for key in self._band_keys(namespace, self.signature(shingle_set)):
+            self.buckets.setdefault(key, []).append(index)
+
+    def neighbours(self, namespace, prompts):
+        """[(similarity, entry)] of indexed prompt sets at or above the threshold, most similar first"""
+        shingle_set = shingles(prompts)
+        with self._lock:
+            candidates = set()
+            for key in self._band_keys(namespace, self.signature(shingle_set)):
+                candidates.update(self.buckets.get(key, ()))
+            matches = [(jaccard(shingle_set, self.entries[k]["shingles"]), self.entries[k]) for k in candidates]
+        matches = [(similarity, entry) for similarity, entry in matches if similarity >= self.threshold]
+        return sorted(matches, key=lambda match: match[0], reverse=True)
+
+    def lookup(self, namespace, prompts):
+        """Known outcome for a near-duplicate of `prompts`, or None
+
+        The outcome of the most similar entry is returned; when several entries match, its
+        score is replaced by their similarity-weighted mean and `neighbours` lists them.
+        """
+        namespace = json.dumps(namespace, ensure_ascii=False)
+        matches = self.neighbours(namespace, prompts)
+        with self._lock:
+            self.lookups += 1
+            if not matches:
+                return None
+            self.hits += 1
+            self.interpolated += int(len(matches) > 1)
+
+        similarity, nearest = matches[0]
+        outcome = dict(nearest["outcome"], similarity=round(similarity, 3), neighbours=len(matches))
+        if len(matches) > 1:
+            weight = sum(s for s, _ in matches)
+            outcome["score"] = round(sum(s * entry["outcome"]["score"] for s, entry in matches) / weight, 2)
+            outcome["samples"] = [(entry["outcome"]["score"], entry["outcome"]["feedback"]) for _, entry in matches]
+        return outcome
+
+    def add(self, namespace, prompts, outcome):
+        """Index an evaluated prompt set
+
+        `outcome` is a JSON-serializable dict with at least score and feedback; other fields
+        (e.g. score_stats) are returned as they are by a single-match lookup.
+        """
+        namespace = json.dumps(namespace, ensure_ascii=False)
+        with self._lock:
+            self._insert(namespace, prompts, outcome)
+            if self.path:
+                stored = dict(outcome)
+                if "result" in stored:
+                    result = stored.pop("result")
+                    stored["result_sha256"] = hashlib.sha256(str(result).encode("utf-8")).hexdigest()
+                line = json.dumps({"namespace": namespace, "prompts": prompts, "outcome": stored}, ensure_ascii=False)
+                self._append(line + "\n")
+
+    def _append(self, line):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(line)
+                f.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def mark(self):
+        """Return the current counters, to summarize only what happens after this point"""
+        with self._lock:
+            return {"indexed": len(self.entries), "lookups": self.lookups, "hits": self.hits,
+                    "interpolated": self.interpolated}
+
+    def summary(self, since=None):
+        """Index size, plus lookups and hits since the `since` mark (e.g. one run on a shared index)"""
+        since = since or {"indexed": 0, "lookups": 0, "hits": 0, "interpolated": 0}
+        with self._lock:
+            lookups = self.lookups - since["lookups"]
+            hits = self.hits - since["hits"]
+            return {
+                "threshold": self.threshold,
+                "indexed": len(self.entries),
+                "added": len(self.entries) - since["indexed"],
+                "lookups": lookups,
+                "hits": hits,
+                "interpolated": self.interpolated - since["interpolated"],
+                "skipped_lines": self.skipped_lines,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0
+            }
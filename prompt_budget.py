@@ -0,0 +1,142 @@
+import re
+
+_encoding = None
+_encoding_loaded = False
+
+SENTENCE_END = re.compile(r"(?<=[.!?。])\s+|(?<=다\.)\s*")
+WORD = re.compile(r"\w+")
+
+# Sentences sharing at least this fraction of their words count as the same directive
+DUPLICATE_SIMILARITY = 0.8
+
+
+def _get_encoding():
+    """tiktoken's o200k_base encoding, loaded on first use, or None if tiktoken is unavailable"""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception:  # tiktoken is optional; fall back to ~4 characters per token
+            _encoding = None
+        _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text):
+    """Token count of text (tiktoken when installed, otherwise a character estimate)"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return max(1, len(text) // 4)
+
+
+def prompt_tokens(prompts):
+    """Token counts per role (goal + backstory) and in total for a prompt set"""
+    counts = {
+        role: count_tokens(prompt["goal"]) + count_tokens(prompt["backstory"])
+        for role, prompt in prompts.items()
+    }
+    counts["total"] = sum(counts.values())
+    return counts
+
+
+def split_sentences(text):
+    return [sentence for sentence, _ in split_segments(text)]
+
+
+def split_segments(text):
+    """[(sentence, separator that follows it)], so text can be rebuilt with its newlines and bullets intact"""
+    segments = []
+    position = 0
+    text = (text or "").strip()
+    for match in SENTENCE_END.finditer(text):
+        if match.end() == position:
+            continue
+        sentence = text[position:match.start()].strip()
+        if sentence:
+            segments.append((sentence, match.group() or " "))
+        position = match.end()
+    if text[position:].strip():
+        segments.append((text[position:].strip(), ""))
+    return segments
+
+
+def join_segments(segments):
+    """Inverse of split_segments for a (possibly shortened) list of segments"""
+    if not segments:
+        return ""
+    return "".join(sentence + separator for sentence, separator in segments[:-1]) + segments[-1][0]
+
+
+def truncate_tokens(text, max_tokens):
+    """The longest prefix of text that is at most max_tokens tokens"""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)[:max_tokens]
+        text = encoding.decode(tokens)
+        # A cut through a multi-byte character can decode to more tokens; back off until it fits
+        while text and count_tokens(text) > max_tokens:
+            tokens = tokens[:-1]
+            text = encoding.decode(tokens)
+        return text.rstrip()
+    return text[:max_tokens * 4].rstrip()
+
+
+def _similarity(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def dedupe_directives(text, seen=None):
+    """Drop sentences that repeat (or nearly repeat) an earlier directive
+
+    `seen` carries word sets across fields, so a backstory sentence that restates the goal is
+    dropped too.
+    """
+    return join_segments(_dedupe_segments(text, [] if seen is None else seen))
+
+
+def _dedupe_segments(text, seen):
+    kept = []
+    for sentence, separator in split_segments(text):
+        words = set(WORD.findall(sentence.lower()))
+        if any(_similarity(words, other) >= DUPLICATE_SIMILARITY for other in seen):
+            continue
+        seen.append(words)
+        kept.append((sentence, separator))
+    return kept
+
+
+def fit_budget(prompt, max_tokens):
+    """Deduplicate a role prompt and trim it (backstory first) until it fits max_tokens
+
+    Trailing sentences are dropped first; a single sentence that is still too long is cut by
+    tokens. Newlines and bullets between the kept sentences are preserved.
+    """
+    seen = []
+    goal = _dedupe_segments(prompt["goal"], seen)
+    backstory = _dedupe_segments(prompt["backstory"], seen)
+
+    def size():
+        return count_tokens(join_segments(goal)) + count_tokens(join_segments(backstory))
+
+    if max_tokens is not None:
+        while size() > max_tokens and len(backstory) > 1:
+            backstory.pop()
+        while size() > max_tokens and len(goal) > 1:
+            goal.pop()
+        if size() > max_tokens:
+            room = max(0, max_tokens - count_tokens(join_segments(goal)))
+            backstory = [(truncate_tokens(join_segments(backstory), room), "")] if room else []
+        if size() > max_tokens:
+            goal = [(truncate_tokens(join_segments(goal), max_tokens), "")]
+
+    return {"goal": join_segments(goal), "backstory": join_segments(backstory)}
@@ -1,270 +1,983 @@
 import os
+import re
 import json
+import math
+import random
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from datetime import datetime
-from ai_scientist import AIScientist, DEFAULT_PROMPTS
-from openai import OpenAI
+from ai_scientist import AIScientist, StageTimings, default_agent_pool
+from llm_client import chat_completion
+from llm_backends import cache_identity
+from llm_pool import default_pool
+from usage_meter import UsageMeter
+from scoring import score_statistics, heuristic_score, dimension_scores, weakest_roles, aggregate_scores
+from prompt_budget import fit_budget, prompt_tokens
+from structured_output import (
+    EVALUATION_SCHEMA, PROMPT_SCHEMA, ParseStats, response_format, subschema, extract_json, invalid_fields
+)
+from locales import LOCALES, get_locale
+from streaming import StreamAborted, ScoreWatcher, StreamStats, streamed_scores
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Display names passed to improve_prompt for each agent (English locale)
+ROLE_NAMES = LOCALES["en"]["role_names"]
+
+# "Feedback" headings of every locale, for recovering feedback from plain-text evaluations
+FEEDBACK_LABELS = [f"{locale['feedback_label']}:" for locale in LOCALES.values()]
+
+# "Score: x/100" header of saved iteration results in any locale
+SCORE_HEADER = re.compile(
+    r"^(?:" + "|".join(re.escape(locale["result_labels"]["score"]) for locale in LOCALES.values()) + r"): ([\d.]+)/100$",
+    re.MULTILINE
+)
+
+# Evaluation fidelity used when no multi-fidelity schedule is given: full-length
+# crew run judged by the optimizer's own model
+FULL_FIDELITY = {"max_tokens": None, "brief": False, "judge_model": None}
+
+# Successive-halving rungs, cheapest first. Early rungs cap agent output and use a
+# brief task description with a gpt-4o-mini judge; the last rung is full fidelity.
+MULTI_FIDELITY = [
+    {"max_tokens": 600, "brief": True, "judge_model": "gpt-4o-mini"},
+    {"max_tokens": 1500, "brief": True, "judge_model": "gpt-4o-mini"},
+    FULL_FIDELITY
+]
+
+def topic_list(research_topic):
+    """A single topic or a topic suite as a list of topics"""
+    return [research_topic] if isinstance(research_topic, str) else list(research_topic)
+
+
+def is_screened(score_stats):
+    """Whether score statistics come from the screen judge alone (see evaluate_cascade)"""
+    return bool(score_stats and score_stats.get("overall", {}).get("screened"))
+
+
+# Rubric dimensions in the order they are written into evaluation text
+EVALUATION_DIMENSIONS = ["relevance", "depth", "clarity", "rigor", "comprehensiveness"]
+
+# Round-robin order for one-role-at-a-time improvement: downstream roles first,
+# so cached upstream stage outputs are reused for as many iterations as possible
+ROUND_ROBIN_ROLES = ["writer", "analyst", "researcher"]
 
 
 class SimplePromptOptimizer:
-    def __init__(self, model_name="gpt-4o"):
-        """Initialize Simple Prompt Optimizer without TextGrad"""
+    def __init__(self, model_name="gpt-4o", improve_timeout=180, cache=None, meter=None, backend=None, scheduler=None,
+                 max_judge_samples=1, judge_batch=2, judge_sd=1.5, screen_model=None, screen_threshold=None,
+                 screen_margin=3.0, prompt_token_budget=None, compress=False, compress_tolerance=0.0,
+                 agent_model="gpt-4o-mini", max_cost=None, progress=None, language="en", research_fan_out=1,
+                 stream=False, abort_hopeless=False, surrogate=None, surrogate_oversample=2, duplicates=None,
+                 results_store=None):
+        """Initialize Simple Prompt Optimizer without TextGrad
+
+        `backend` (see llm_backends) replaces the OpenAI API for every call, including the
+        AI Scientist crew, e.g. FakeBackend for offline benchmarking. `scheduler` (see
+        llm_scheduler) rate-limits, prioritizes and retries every call; share one across
+        optimizers that run in the same process.
+
+        With max_judge_samples > 1, a candidate whose score's confidence interval contains the
+        incumbent best is re-judged (judge_batch samples at a time, in parallel) until the
+        interval clears the incumbent or max_judge_samples is reached. judge_sd is the
+        judge's assumed run-to-run standard deviation.
+
+        screen_model ("gpt-4o-mini", any model name, or "heuristic" for the local scorer) puts a
+        cheap judge in front of model_name. Only outputs whose screen score reaches
+        screen_threshold, or comes within screen_margin of the incumbent best, are re-scored by
+        the expensive judge; the rest keep their screen score and feedback, marked as screened
+        (see is_screened), and never become the best prompts or train the surrogate.
+
+        Repeated directives are dropped from every improved role prompt (goal + backstory), and
+        prompt_token_budget caps each at that many tokens. With compress=True, every new best prompt
+        set is also rewritten concisely by model_name and re-evaluated; the compressed set
+        replaces it only if its score is no more than compress_tolerance below.
+
+        agent_model runs the AI Scientist crew. A run stops early once its metered cost reaches
+        max_cost dollars. `progress`, if given, is called with a dict after every iteration or
+        generation (e.g. to report progress from a batch job).
+
+        `language` selects the locale pack (see locales.LOCALES: "en", "ko", or a pack dict)
+        for the judge rubric, improvement template, default prompts and saved result labels.
+
+        research_fan_out > 1 splits every crew run's research stage into that many concurrent
+        sub-questions (see AIScientist). Stage wall-clock times of every crew run are collected
+        in self.stage_timings and reported in the run summary.
+
+        With stream=True, crew stage outputs stream into <output_dir>/streams as they are
+        generated, judge responses are streamed to measure time-to-score, and extra adaptive
+        judge samples stop as soon as their scores have arrived (their feedback is never used).
+        With abort_hopeless=True, a crew run whose output is clearly empty or off-topic is
+        stopped early and scored 0 (see streaming.OutputMonitor).
+
+        `surrogate` (a surrogate.SurrogateModel, shareable across optimizers) learns to predict
+        scores from the prompts alone as evaluations come in. Once it has enough examples,
+        surrogate_oversample times as many improved candidates are generated and only the ones it
+        ranks highest are run and judged. train_surrogate() warms it up from earlier runs.
+
+        `duplicates` (a near_duplicates.NearDuplicateIndex) skips the crew run and judge for a
+        candidate that is nearly identical to a prompt set already evaluated, reusing its score.
+
+        `results_store` (a results_store.ResultsStore) additionally records every scored prompt
+        set and the run summary under a run ID, for querying across runs.
+        """
         self.model_name = model_name
+        self.improve_timeout = improve_timeout
+        self.cache = cache
+        self.meter = meter or UsageMeter()
+        self.backend = backend
+        self.scheduler = scheduler
+        self.max_judge_samples = max_judge_samples
+        self.judge_batch = judge_batch
+        self.judge_sd = judge_sd
+        self.screen_model = screen_model
+        self.screen_threshold = screen_threshold
+        self.screen_margin = screen_margin
+        self.screen_records = []
+        self._screen_lock = threading.Lock()
+        self.prompt_token_budget = prompt_token_budget
+        self.compress = compress
+        self.compress_tolerance = compress_tolerance
+        self.parse_stats = ParseStats()
+        self.agent_model = agent_model
+        self.max_cost = max_cost
+        self.progress = progress
+        self.locale = get_locale(language)
+        self.research_fan_out = research_fan_out
+        self.stage_timings = StageTimings()
+        self.stream = stream
+        self.abort_hopeless = abort_hopeless
+        self.stream_dir = None
+        self.stream_stats = StreamStats()
+        self.surrogate = surrogate
+        self.surrogate_oversample = surrogate_oversample
+        self.duplicates = duplicates
+        self.results_store = results_store
+        self.run_id = None
+        self.run_topic = None
+        self.language = language if isinstance(language, str) else self.locale["name"]
 
-    def evaluate_output(self, result):
-        """Evaluate the quality of AI scientist output with fine-grained 0-100 scoring"""
-        evaluation_prompt = f"""You are an expert scientific reviewer. Evaluate the following AI scientist's output with PRECISE, GRANULAR scoring.
-
-Use a 0-100 scale where:
-- 0-20: Severely deficient, unusable
-- 21-40: Poor quality, major issues
-- 41-60: Mediocre, significant improvements needed
-- 61-75: Acceptable, but clear room for improvement
-- 76-85: Good quality, minor improvements possible
-- 86-95: Excellent, high-quality work
-- 96-100: Outstanding, publication-ready
-
-Evaluate on these dimensions (weight each equally):
-
-1. **Relevance (0-100)**: How directly and comprehensively does it address the topic?
-2. **Depth of Analysis (0-100)**: How thorough, detailed, and insightful is the analysis? Are specific examples, case studies, and quantitative data provided?
-3. **Clarity (0-100)**: How clear, well-structured, and readable is the writing?
-4. **Scientific Rigor (0-100)**: How sound is the methodology? Are claims supported by citations and evidence?
-5. **Comprehensiveness (0-100)**: How complete is the coverage? Are multiple perspectives, ethical considerations, and limitations addressed?
-
-Provide scores for EACH dimension, then calculate the OVERALL score as the average.
-
-**CRITICAL**: Be precise with decimals. Use scores like 67.5, 72.3, 84.8, not just whole numbers.
-**CRITICAL**: Identify specific weaknesses and strengths to justify the score.
-**CRITICAL**: Be discerning - reserve scores above 85 for truly exceptional work.
-
-Format your response EXACTLY as:
-```
-Relevance: [score]/100
-Depth: [score]/100
-Clarity: [score]/100
-Rigor: [score]/100
-Comprehensiveness: [score]/100
-Overall: [score]/100
-
-Feedback:
-[Detailed feedback with specific examples of strengths and weaknesses for each dimension]
-```
-
-Output to evaluate:
-{result}
-"""
-
-        response = client.chat.completions.create(
-            model=self.model_name,
-            messages=[
-                {"role": "system", "content": "You are a rigorous scientific reviewer who provides precise, fine-grained evaluations. Use decimal precision in your scores."},
-                {"role": "user", "content": evaluation_prompt}
+    def role_name(self, role):
+        """Display name of a role in this optimizer's locale"""
+        return self.locale["role_names"].get(role, role)
+
+    def default_prompts(self):
+        """Fresh copies of the locale's default prompts, the starting point of every run"""
+        return {role: prompt.copy() for role, prompt in self.locale["default_prompts"].items()}
+
+    def evaluate_output(self, result, model_name=None, seed=None, scores_only=False):
+        """Evaluate the quality of AI scientist output with fine-grained 0-100 scoring
+
+        With scores_only=True and streaming enabled, the judge response is cut off once the
+        overall score has arrived and the returned evaluation has no feedback.
+        """
+        watcher = ScoreWatcher(stop_at_score=scores_only) if self.stream else None
+        started = time.perf_counter()
+        model_name = model_name or self.model_name
+        messages = [
+            {"role": "system", "content": self.locale["evaluation_system"]},
+            {"role": "user", "content": self.locale["evaluation_prompt"].format(result=result)}
+        ]
+        evaluation = chat_completion(
+            model=model_name,
+            messages=messages,
+            temperature=0.3,  # Lower temperature for more consistent evaluation
+            cache=self.cache,
+            meter=self.meter,
+            phase="evaluate",
+            backend=self.backend,
+            seed=seed,
+            scheduler=self.scheduler,
+            response_format=response_format("evaluation", EVALUATION_SCHEMA),
+            on_delta=watcher
+        )
+
+        labels = self.locale["dimension_labels"]
+        if watcher is not None:
+            scores = streamed_scores(evaluation)
+            stopped = scores_only and "overall" in scores and '"feedback"' not in evaluation
+            self.stream_stats.record_evaluation(watcher, time.perf_counter() - started, stopped)
+            if stopped:
+                names = [name for name in EVALUATION_DIMENSIONS + ["overall"] if name in scores]
+                return scores["overall"], "\n".join(f"{labels[name]}: {scores[name]:.1f}/100" for name in names)
+
+        parsed = self.parse_structured(
+            evaluation, EVALUATION_SCHEMA, "evaluate", self.fill_evaluation, messages=messages, model_name=model_name
+        )
+        if parsed is None:
+            print(f"Warning: Could not parse score")
+            return 50.0, evaluation
+
+        # Render as "Name: score/100" lines, the format score parsing and saved results use
+        lines = [f"{labels[name]}: {float(parsed[name]):.1f}/100" for name in EVALUATION_DIMENSIONS + ["overall"]]
+        lines.append("")
+        lines.append(f"{self.locale['feedback_label']}:")
+        lines.append(parsed["feedback"].strip())
+        return float(parsed["overall"]), "\n".join(lines)
+
+    @staticmethod
+    def fill_evaluation(data, raw):
+        """Fill evaluation fields locally from a plain-text "Name: score/100" response or from the other fields"""
+        scores = dimension_scores(raw, fill_overall=False)
+        for name in EVALUATION_DIMENSIONS + ["overall"]:
+            if name not in data and name in scores:
+                data[name] = scores[name]
+
+        if "overall" not in data and all(isinstance(data.get(name), (int, float)) for name in EVALUATION_DIMENSIONS):
+            data["overall"] = round(sum(data[name] for name in EVALUATION_DIMENSIONS) / len(EVALUATION_DIMENSIONS), 1)
+
+        for label in FEEDBACK_LABELS:
+            if not data.get("feedback") and label in (raw or ""):
+                data["feedback"] = raw.split(label, 1)[1].strip().strip("`").strip()
+        return data
+
+    def reask(self, raw, fields, schema, messages, model_name=None, role=None):
+        """Ask the model that made a request for only the missing or invalid fields of its malformed response
+
+        The original request is replayed with the response appended, so the model sees what it
+        was judging or rewriting rather than just the broken JSON.
+        """
+        content = chat_completion(
+            model=model_name or self.model_name,
+            messages=list(messages) + [
+                {"role": "assistant", "content": raw or ""},
+                {"role": "user", "content": f"""Your response above is missing, or has invalid values for, these fields: {', '.join(fields)}.
+
+Respond ONLY with a JSON object containing exactly those fields, consistent with the request and your response above."""}
             ],
-            temperature=0.3  # Lower temperature for more consistent evaluation
+            temperature=0,
+            cache=self.cache,
+            meter=self.meter,
+            phase="repair",
+            role=role,
+            backend=self.backend,
+            scheduler=self.scheduler,
+            response_format=response_format("repair", subschema(schema, fields))
         )
+        return extract_json(content) or {}
 
-        evaluation = response.choices[0].message.content
+    def parse_structured(self, raw, schema, kind, fill=None, role=None, messages=None, model_name=None):
+        """Parse a structured response, repairing it locally or re-asking for only the malformed fields
 
-        # Extract overall score
+        `messages` and `model_name` are the request that produced `raw`; without them nothing is
+        re-asked, since a model that can't see the original request could only invent values.
+        Returns the parsed dict, or None if it could not be recovered. The outcome is counted in
+        self.parse_stats under `kind`.
+        """
         try:
-            lines = evaluation.split('\n')
-            for line in lines:
-                if line.startswith('Overall:'):
-                    score_text = line.split(':')[1].strip()
-                    # Extract number before /100
-                    score = float(score_text.split('/')[0].strip())
-                    return score, evaluation
+            data = json.loads(raw)
+            clean = isinstance(data, dict)
+        except (TypeError, ValueError):
+            data, clean = None, False
+        if not clean:
+            data = extract_json(raw) or {}
+
+        if fill is not None:
+            data = fill(data, raw)
+
+        invalid = invalid_fields(data, schema)
+        if not invalid:
+            self.parse_stats.record(kind, "parsed" if clean else "repaired")
+            return data
+
+        if messages is None:
+            self.parse_stats.record(kind, "failed")
+            return None
+
+        try:
+            data.update(self.reask(raw, invalid, schema, messages, model_name, role))
         except Exception as e:
-            print(f"Warning: Could not parse score: {e}")
-            pass
+            print(f"   ⚠ Re-asking for {', '.join(invalid)} failed: {e}")
+        if fill is not None:
+            data = fill(data, raw)
 
-        return 50.0, evaluation
+        if invalid_fields(data, schema):
+            self.parse_stats.record(kind, "failed")
+            return None
+        self.parse_stats.record(kind, "reasked")
+        return data
 
-    def improve_prompt(self, current_prompt, feedback, role):
-        """Use GPT-4 to improve prompts based on feedback"""
-        improvement_prompt = f"""You are an expert prompt engineer specializing in AI agent optimization.
+    def evaluate_adaptive(self, result, incumbent=None, model_name=None):
+        """Evaluate an output, drawing extra judge samples only while its score is too close to call against the incumbent
 
-Role: {role}
-Current Prompt:
-Goal: {current_prompt['goal']}
-Backstory: {current_prompt['backstory']}
+        Returns (mean overall score, feedback of the first sample, per-dimension statistics).
+        """
+        score, feedback = self.evaluate_output(result, model_name=model_name)
+        samples = [(score, feedback)]
+        stats = score_statistics(samples, self.judge_sd)
 
-Recent Evaluation Feedback:
-{feedback}
+        while incumbent is not None and len(samples) < self.max_judge_samples:
+            overall = stats["overall"]
+            if not overall["ci_low"] <= incumbent <= overall["ci_high"]:
+                break
 
-Your task: Create SIGNIFICANTLY IMPROVED prompts that address the weaknesses mentioned in the feedback.
+            batch = min(self.judge_batch, self.max_judge_samples - len(samples))
+            print(f"   🎲 Score {overall['mean']:.1f} is within the confidence margin of the best "
+                  f"({incumbent:.1f}); drawing {batch} more judge sample(s)")
 
-Key improvements needed:
-- Add specific examples and case studies
-- Include detailed methodological guidance
-- Emphasize scientific rigor and citation practices
-- Expand depth of analysis expectations
-- Include ethical considerations
-- Make the agent more proactive and comprehensive
+            # Distinct seeds keep the extra samples from being served by the cache; only their
+            # scores are used, so a streamed sample stops once they have arrived
+            with ThreadPoolExecutor(max_workers=batch) as executor:
+                futures = [
+                    executor.submit(self.evaluate_output, result, model_name, len(samples) + k, True)
+                    for k in range(batch)
+                ]
+                samples.extend(future.result() for future in futures)
+            stats = score_statistics(samples, self.judge_sd)
 
-Create detailed, professional prompts that will guide this agent to produce higher quality scientific work.
+        return stats["overall"]["mean"], feedback, stats
 
-Respond ONLY with valid JSON in this exact format (no markdown, no extra text):
-{{
-  "goal": "detailed, specific goal that includes what to prioritize and how to approach the task",
-  "backstory": "comprehensive backstory that establishes expertise, methods, and high standards for this role"
-}}
-"""
+    def evaluate_cascade(self, result, incumbent=None):
+        """Screen an output with the cheap judge and escalate it to the expensive judge only if it could matter
 
-        response = client.chat.completions.create(
+        Returns (score, feedback, per-dimension statistics) like evaluate_adaptive. For a rejected
+        output the score is the screen score, on the screen judge's own scale, and the statistics'
+        "overall" entry is marked screened with the screen model.
+        """
+        if self.screen_model is None:
+            return self.evaluate_adaptive(result, incumbent=incumbent)
+
+        if self.screen_model == "heuristic":
+            screen_score, screen_feedback = heuristic_score(str(result))
+        else:
+            screen_score, screen_feedback = self.evaluate_output(result, model_name=self.screen_model)
+
+        escalate = (
+            incumbent is None
+            or screen_score + self.screen_margin >= incumbent
+            or (self.screen_threshold is not None and screen_score >= self.screen_threshold)
+        )
+
+        record = {"screen_score": screen_score, "incumbent": incumbent, "escalated": escalate, "score": None}
+        if escalate:
+            score, feedback, stats = self.evaluate_adaptive(result, incumbent=incumbent)
+            record["score"] = score
+        else:
+            print(f"   ⏭ Screen score {screen_score:.1f} cannot plausibly beat the best ({incumbent:.1f}); "
+                  f"skipping {self.model_name} evaluation")
+            score, feedback = screen_score, screen_feedback
+            stats = score_statistics([(screen_score, screen_feedback)], self.judge_sd)
+            stats["overall"].update(screened=True, screen_model=self.screen_model)
+
+        with self._screen_lock:
+            self.screen_records.append(record)
+        return score, feedback, stats
+
+    def screen_summary(self, since=0):
+        """Rejection rate of the cheap judge and its agreement with the expensive judge"""
+        with self._screen_lock:
+            records = self.screen_records[since:]
+        escalated = [r for r in records if r["escalated"]]
+        summary = {
+            "screen_model": self.screen_model,
+            "screened": len(records),
+            "escalated": len(escalated),
+            "rejected": len(records) - len(escalated),
+            "rejection_rate": (len(records) - len(escalated)) / len(records) if records else 0.0
+        }
+        if escalated:
+            differences = [r["screen_score"] - r["score"] for r in escalated]
+            summary["mean_bias"] = round(sum(differences) / len(differences), 2)
+            summary["mean_abs_difference"] = round(sum(abs(d) for d in differences) / len(differences), 2)
+
+            # Would the screen alone have reached the same beat-the-best decision?
+            decided = [r for r in escalated if r["incumbent"] is not None]
+            if decided:
+                agree = sum(
+                    1 for r in decided
+                    if (r["screen_score"] > r["incumbent"]) == (r["score"] > r["incumbent"])
+                )
+                summary["decision_agreement"] = agree / len(decided)
+        return summary
+
+    def improve_prompt(self, current_prompt, feedback, role, seed=None):
+        """Use GPT-4 to improve prompts based on feedback"""
+        messages = [
+            {"role": "system", "content": self.locale["improvement_system"]},
+            {"role": "user", "content": self.locale["improvement_prompt"].format(
+                role=role,
+                goal=current_prompt["goal"],
+                backstory=current_prompt["backstory"],
+                feedback=feedback
+            )}
+        ]
+        content = chat_completion(
             model=self.model_name,
-            messages=[
-                {"role": "system", "content": "You are an expert in prompt engineering for AI research agents. Output only valid JSON."},
-                {"role": "user", "content": improvement_prompt}
-            ],
-            temperature=0.8
+            messages=messages,
+            temperature=0.8,
+            cache=self.cache,
+            seed=seed,
+            meter=self.meter,
+            phase="improve",
+            role=role,
+            backend=self.backend,
+            scheduler=self.scheduler,
+            response_format=response_format("agent_prompt", PROMPT_SCHEMA)
         )
 
-        try:
-            content = response.choices[0].message.content.strip()
-            # Remove markdown code blocks if present
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-                content = content.strip()
-
-            improved = json.loads(content)
-            print(f"   ✓ Improved {role} prompts")
-            return improved
-        except Exception as e:
-            print(f"   ⚠ Failed to parse improved prompt for {role}: {e}")
+        improved = self.parse_structured(content, PROMPT_SCHEMA, "improve", role=role, messages=messages)
+        if improved is None:
+            print(f"   ⚠ Failed to parse improved prompt for {role}")
             print(f"   Using current prompt instead")
             return current_prompt
 
-    def save_iteration_results(self, iteration, prompts, result, score, feedback, output_dir="optimization_results"):
-        """Save iteration results to files"""
+        print(f"   ✓ Improved {role} prompts")
+        return {"goal": improved["goal"], "backstory": improved["backstory"]}
+
+    def improve_prompts(self, current_prompts, feedback, timeout=None, roles=None, seed=None):
+        """Improve agent prompts (all roles, or only `roles`) concurrently, keeping the current prompt for any role that fails or times out"""
+        timeout = self.improve_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout if timeout else None
+
+        roles = list(current_prompts) if roles is None else roles
+
+        executor = ThreadPoolExecutor(max_workers=max(1, len(roles)))
+        futures = {
+            role: executor.submit(self.improve_prompt, current_prompts[role], feedback, self.role_name(role), seed)
+            for role in roles
+        }
+
+        improved = dict(current_prompts)
+        for role, future in futures.items():
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                improved[role] = future.result(timeout=remaining)
+            except FutureTimeout:
+                print(f"   ⚠ Timed out improving {self.role_name(role)} prompts after {timeout}s")
+                print(f"   Using current prompt instead")
+                improved[role] = current_prompts[role]
+            except Exception as e:
+                print(f"   ⚠ Failed to improve {self.role_name(role)} prompts: {e}")
+                print(f"   Using current prompt instead")
+                improved[role] = current_prompts[role]
+
+        # Don't block on stragglers that already timed out
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        # Always drop repeated directives; trim to prompt_token_budget only when one is set
+        for role in roles:
+            before = prompt_tokens({role: improved[role]})["total"]
+            improved[role] = fit_budget(improved[role], self.prompt_token_budget)
+            after = prompt_tokens({role: improved[role]})["total"]
+            if after < before:
+                print(f"   ✂ Trimmed {self.role_name(role)} prompts from {before} to {after} tokens")
+        return improved
+
+    def compress_prompt(self, current_prompt, role):
+        """Rewrite a prompt more concisely while keeping every distinct instruction"""
+        messages = [
+            {"role": "system", "content": self.locale["improvement_system"]},
+            {"role": "user", "content": self.locale["compression_prompt"].format(
+                role=role,
+                goal=current_prompt["goal"],
+                backstory=current_prompt["backstory"]
+            )}
+        ]
+        content = chat_completion(
+            model=self.model_name,
+            messages=messages,
+            temperature=0.3,
+            cache=self.cache,
+            meter=self.meter,
+            phase="compress",
+            role=role,
+            backend=self.backend,
+            scheduler=self.scheduler,
+            response_format=response_format("agent_prompt", PROMPT_SCHEMA)
+        )
+
+        compressed = self.parse_structured(content, PROMPT_SCHEMA, "compress", role=role, messages=messages)
+        if compressed is None:
+            raise ValueError("response is not a valid goal/backstory object")
+        return {"goal": compressed["goal"], "backstory": compressed["backstory"]}
+
+    def compress_prompts(self, prompts):
+        """Compress every role's prompt concurrently, keeping the original for any role that fails or does not get shorter"""
+        with ThreadPoolExecutor(max_workers=max(1, len(prompts))) as executor:
+            futures = {
+                role: executor.submit(self.compress_prompt, prompt, self.role_name(role))
+                for role, prompt in prompts.items()
+            }
+
+        compressed = dict(prompts)
+        for role, future in futures.items():
+            try:
+                candidate = future.result()
+                if prompt_tokens({role: candidate})["total"] < prompt_tokens({role: prompts[role]})["total"]:
+                    compressed[role] = candidate
+            except Exception as e:
+                print(f"   ⚠ Failed to compress {self.role_name(role)} prompts: {e}")
+        return compressed
+
+    def verify_compression(self, scientist, prompts, score, research_topic, executor=None, aggregate="mean"):
+        """Compress a prompt set and re-evaluate it; return (prompts to keep, score of those prompts, report)"""
+        print(f"\n🗜 Compressing the new best prompts and re-evaluating...")
+        compressed = self.compress_prompts(prompts)
+        report = {
+            "tokens_before": prompt_tokens(prompts)["total"],
+            "tokens_after": prompt_tokens(compressed)["total"],
+            "score_before": score,
+            "score_after": None,
+            "accepted": False
+        }
+        if compressed == prompts:
+            print(f"   Compression did not shorten any prompt; keeping the originals")
+            return prompts, score, report
+
+        _, compressed_score, _, _, _ = self.evaluate_suite(
+            scientist, compressed, research_topic, executor, incumbent=score, aggregate=aggregate
+        )
+        report["score_after"] = compressed_score
+        report["accepted"] = compressed_score >= score - self.compress_tolerance
+        if report["accepted"]:
+            print(f"   ✓ Kept compressed prompts: {report['tokens_before']} → {report['tokens_after']} tokens, "
+                  f"score {compressed_score:.1f} (was {score:.1f})")
+            return compressed, compressed_score, report
+
+        print(f"   ✗ Compressed prompts scored {compressed_score:.1f} (was {score:.1f}); keeping the originals")
+        return prompts, score, report
+
+    def start_results_run(self, research_topic, mode, output_dir, run_id=None):
+        """Start (or, with run_id, continue) recording this run in the results store"""
+        self.run_topic = research_topic
+        if self.results_store is None:
+            self.run_id = None
+        else:
+            self.run_id = run_id or self.results_store.start_run(research_topic, self.language, mode, output_dir)
+
+    def _start_run(self, output_dir):
+        """Prepare output_dir for a run; returns marks of the counters its summary reports (see _run_extras)"""
+        os.makedirs(output_dir, exist_ok=True)
+        self.stream_dir = f"{output_dir}/streams" if self.stream else None
+
+        # Log every LLM call of this run next to its results
+        self.meter.log_path = f"{output_dir}/usage_log.jsonl"
+        return {
+            "usage": self.meter.mark(),
+            "screening": len(self.screen_records),
+            "stage_timings": self.stage_timings.mark(),
+            "streaming": self.stream_stats.mark(),
+            "structured_output": self.parse_stats.mark(),
+            "surrogate": self.surrogate.mark() if self.surrogate is not None else None,
+            "near_duplicates": self.duplicates.mark() if self.duplicates is not None else None
+        }
+
+    def _run_extras(self, marks):
+        """Summary fields shared by every optimization mode, counted since the _start_run `marks`"""
+        extras = {}
+        if self.cache is not None:
+            extras["cache"] = self.cache.stats()
+        extras["usage"] = self.meter.summary(since=marks["usage"])
+        extras["research_fan_out"] = self.research_fan_out
+        extras["stage_timings"] = self.stage_timings.summary(since=marks["stage_timings"])
+        if self.stream or self.abort_hopeless:
+            extras["streaming"] = self.stream_stats.summary(since=marks["streaming"])
+        if self.surrogate is not None:
+            extras["surrogate"] = self.surrogate.summary(since=marks["surrogate"])
+        if self.duplicates is not None:
+            extras["near_duplicates"] = self.duplicates.summary(since=marks["near_duplicates"])
+        if self.results_store is not None:
+            extras["run_id"] = self.run_id
+        if self.screen_model is not None:
+            extras["screening"] = self.screen_summary(since=marks["screening"])
+        if self.scheduler is not None:
+            extras["scheduler"] = self.scheduler.stats()
+        extras["structured_output"] = self.parse_stats.summary(since=marks["structured_output"])
+        if self.backend is None:
+            extras["connection_pool"] = default_pool.stats()
+            extras["agent_pool"] = default_agent_pool.stats()
+        return extras
+
+    def save_iteration_results(self, iteration, prompts, result, score, feedback, output_dir=None, candidate=None,
+                               score_stats=None, topic_scores=None):
+        """Save iteration results to files, labelled in the optimizer's locale, and to the results store"""
+        if self.results_store is not None and self.run_id is not None:
+            self.results_store.append(
+                self.run_id, self.run_topic, self.language, iteration, prompts, score, candidate=candidate,
+                feedback=feedback, result=result, topic_scores=topic_scores, score_stats=score_stats,
+                screened=is_screened(score_stats)
+            )
+
+        output_dir = output_dir or self.locale["output_dir"]
+        labels = self.locale["result_labels"]
         os.makedirs(output_dir, exist_ok=True)
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        name = f"iteration_{iteration}" if candidate is None else f"generation_{iteration}_candidate_{candidate}"
 
         # Save prompts
-        prompts_file = f"{output_dir}/iteration_{iteration}_prompts.json"
+        prompts_file = f"{output_dir}/{name}_prompts.json"
         with open(prompts_file, "w", encoding="utf-8") as f:
             json.dump(prompts, f, indent=2, ensure_ascii=False)
 
         # Save result
-        result_file = f"{output_dir}/iteration_{iteration}_result.txt"
+        result_file = f"{output_dir}/{name}_result.txt"
         with open(result_file, "w", encoding="utf-8") as f:
-            f.write(f"Iteration: {iteration}\n")
-            f.write(f"Timestamp: {timestamp}\n")
-            f.write(f"Score: {score:.1f}/100\n")
+            if candidate is None:
+                f.write(f"{labels['iteration']}: {iteration}\n")
+            else:
+                f.write(f"{labels['generation']}: {iteration}\n")
+                f.write(f"{labels['candidate']}: {candidate}\n")
+            f.write(f"{labels['timestamp']}: {timestamp}\n")
+            f.write(f"{labels['score']}: {score:.1f}/100\n")
             f.write(f"\n{feedback}\n")
             f.write(f"\n{'='*80}\n")
-            f.write(f"AI Scientist Output:\n")
+            f.write(f"{labels['output']}:\n")
             f.write(f"{'='*80}\n\n")
             f.write(str(result))
 
-        print(f"✓ Saved iteration {iteration} results to {output_dir}/")
+        if candidate is None:
+            print(f"✓ Saved iteration {iteration} results to {output_dir}/")
+        else:
+            print(f"✓ Saved generation {iteration} candidate {candidate} results to {output_dir}/")
+
+    def print_usage(self, since=0):
+        """Print token and cost totals per phase"""
+        usage = self.meter.summary(since=since)
+        total = usage["total"]
+        print(f"LLM Calls:         {total['calls']} ({total['cache_hits']} cached)")
+        print(f"Tokens:            {total['prompt_tokens']:,} in / {total['completion_tokens']:,} out")
+        print(f"Cost:              ${total['cost']:.4f}")
+        for phase, stats in usage["by_phase"].items():
+            print(f"  {phase:<16} ${stats['cost']:.4f}  {stats['latency']:.1f}s  ({stats['calls']} calls)")
+
+    def report_progress(self, usage_start, **event):
+        """Send a progress event with the run's cost so far; return True once max_cost is reached"""
+        cost = self.meter.summary(since=usage_start)["total"]["cost"]
+        if self.progress is not None:
+            self.progress(dict(event, cost=round(cost, 6)))
+        if self.max_cost is not None and cost >= self.max_cost:
+            print(f"\n💸 Cost ${cost:.4f} reached the budget of ${self.max_cost:.4f}; stopping early")
+            return True
+        return False
+
+    def save_checkpoint(self, output_dir, state):
+        """Atomically write the optimization state so an interrupted run can resume"""
+        checkpoint_file = f"{output_dir}/checkpoint.json"
+        tmp_file = checkpoint_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, checkpoint_file)
+
+    def load_checkpoint(self, output_dir, research_topic=None):
+        """Rebuild optimization state from checkpoint.json, or from the iteration files if there is none"""
+        checkpoint_file = f"{output_dir}/checkpoint.json"
+        if os.path.exists(checkpoint_file):
+            with open(checkpoint_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if research_topic is not None and state["research_topic"] != research_topic:
+                raise ValueError(
+                    f"Checkpoint in {output_dir}/ is for a different topic: {state['research_topic']!r}"
+                )
+            return state
+
+        # Fall back to the per-iteration files written by save_iteration_results
+        all_iterations = []
+        feedback = None
+        iteration = 1
+        while os.path.exists(f"{output_dir}/iteration_{iteration}_prompts.json") and \
+                os.path.exists(f"{output_dir}/iteration_{iteration}_result.txt"):
+            with open(f"{output_dir}/iteration_{iteration}_prompts.json", "r", encoding="utf-8") as f:
+                prompts = json.load(f)
+            with open(f"{output_dir}/iteration_{iteration}_result.txt", "r", encoding="utf-8") as f:
+                header = f.read().split(f"\n{'='*80}\n")[0]
+
+            match = SCORE_HEADER.search(header)
+            if match is None:
+                break
+            feedback = header[match.end():].strip()
+            all_iterations.append({
+                "iteration": iteration,
+                "score": float(match.group(1)),
+                "prompts": prompts
+            })
+            iteration += 1
+
+        if not all_iterations:
+            return None
+
+        best = max(all_iterations, key=lambda it: it["score"])
+        return {
+            "research_topic": research_topic,
+            "all_iterations": all_iterations,
+            "score_improvements": [
+                b["score"] - a["score"] for a, b in zip(all_iterations, all_iterations[1:])
+            ],
+            "best_score": best["score"],
+            "best_prompts": best["prompts"],
+            "feedback": feedback,
+            "next_prompts": None
+        }
+
+    @staticmethod
+    def dimension_means(iteration):
+        """{dimension: mean score} of a recorded iteration, or None if it has no score statistics"""
+        stats = iteration.get("score_stats")
+        if not stats:
+            return None
+        return {name: dimension["mean"] for name, dimension in stats.items()}
+
+    def next_iteration_prompts(self, current_prompts, feedback, iteration, role_schedule="all", scores=None,
+                               target_dimensions=2, score=None):
+        """Improve prompts for the iteration after `iteration` (0-based) according to the role schedule
+
+        With role_schedule="targeted", only the roles owning the `target_dimensions` lowest
+        scoring dimensions in `scores` are improved, with those dimensions named in the feedback.
+        With a trained surrogate, several improved sets are generated and the one it predicts
+        to score highest (given the current prompts' `score`) is returned.
+        """
+        print(f"\n🔧 Aggressively improving prompts for next iteration...")
+
+        # Improve agents' prompts concurrently based on feedback
+        roles = None
+        if role_schedule == "round_robin":
+            roles = [ROUND_ROBIN_ROLES[iteration % len(ROUND_ROBIN_ROLES)]]
+        elif role_schedule == "targeted" and scores:
+            targeted, weakest = weakest_roles(scores, target_dimensions)
+            if targeted:
+                roles = targeted
+                labels = self.locale["dimension_labels"]
+                focus = ", ".join(f"{labels.get(name, name)} {score:.1f}/100" for name, score in weakest)
+                feedback = f"{self.locale['weakest_label']}: {focus}\n\n{feedback}"
+                print(f"   Weakest dimensions: {focus}")
+
+        if roles is None:
+            print(f"   Analyzing weaknesses and optimizing all agent prompts...")
+        else:
+            print(f"   Optimizing {', '.join(self.role_name(role) for role in roles)} prompts only...")
+        if self.surrogate is None or self.surrogate_oversample <= 1 or not self.surrogate.ready():
+            improved = self.improve_prompts(current_prompts, feedback, roles=roles)
+        else:
+            # The first candidate keeps the unseeded request, so it is still served from the cache
+            seeds = [None] + list(range(1, self.surrogate_oversample))
+            with ThreadPoolExecutor(max_workers=len(seeds)) as executor:
+                futures = [
+                    executor.submit(self.improve_prompts, current_prompts, feedback, roles=roles, seed=seed)
+                    for seed in seeds
+                ]
+                candidates = [future.result() for future in futures]
+            best = self.surrogate.rank(candidates, [(current_prompts, score)] * len(candidates), keep=1)[0]
+            print(f"   🔮 Surrogate picked candidate {best + 1}/{len(candidates)}")
+            improved = candidates[best]
+
+        print("✓ Prompts improved for next iteration\n")
+        return improved
+
+    def train_surrogate(self, result_dirs):
+        """Add the scored prompt sets of earlier runs (serial or population result directories) to the surrogate
+
+        Returns the number of examples added.
+        """
+        added = 0
+        for result_dir in result_dirs:
+            summary_file = f"{result_dir}/optimization_summary.json"
+            if os.path.exists(summary_file):
+                with open(summary_file, "r", encoding="utf-8") as f:
+                    summary = json.load(f)
+                if summary.get("mode") == "population":
+                    for candidate in summary["candidates"]:
+                        if candidate["score"] is not None and not candidate.get("screened"):
+                            self.surrogate.record(candidate["prompts"], candidate["score"])
+                            added += 1
+                    continue
+
+            state = self.load_checkpoint(result_dir)
+            if state is None:
+                continue
+            parent = None
+            for iteration in state["all_iterations"]:
+                if iteration.get("screened"):
+                    continue
+                self.surrogate.record(
+                    iteration["prompts"], iteration["score"],
+                    parent and parent["prompts"], parent and parent["score"]
+                )
+                parent = iteration
+                added += 1
+        return added
+
+    def optimize(self, research_topic, iterations=5, output_dir=None, role_schedule="all",
+                 resume=False, target_dimensions=2, aggregate="mean", max_workers=4):
+        """Optimize prompts iteratively to maximize performance
+
+        role_schedule="all" rewrites every role each iteration; "round_robin" rewrites one
+        role per iteration so the unchanged upstream stages are served from the stage cache;
+        "targeted" rewrites only the roles that own the `target_dimensions` weakest scoring
+        dimensions (e.g. Clarity -> writer, Rigor -> researcher, see scoring.DIMENSIONS).
+
+        With resume=True, completed iterations are restored from output_dir (checkpoint.json,
+        or the iteration files of an older run) and the run continues after the last finished
+        crew run and evaluation.
+
+        research_topic may be a list of topics: each iteration then runs every topic
+        concurrently (at most max_workers at a time) and scores the prompts by the `aggregate`
+        ("mean" or "min") of the topic scores, with the per-topic feedback combined.
 
-    def optimize(self, research_topic, iterations=5, output_dir="optimization_results"):
-        """Optimize prompts iteratively to maximize performance"""
+        output_dir defaults to the locale's results directory.
+        """
+        topics = topic_list(research_topic)
+        output_dir = output_dir or self.locale["output_dir"]
 
         print(f"\n{'='*80}")
-        print(f"Starting Aggressive Prompt Optimization for: {research_topic}")
+        print(f"Starting Aggressive Prompt Optimization for: {research_topic if len(topics) == 1 else f'{len(topics)} topics'}")
         print(f"Goal: Maximize performance across {iterations} iterations")
         print(f"{'='*80}\n")
 
-        # Create output directory
-        os.makedirs(output_dir, exist_ok=True)
+        marks = self._start_run(output_dir)
+        usage_start = marks["usage"]
 
-        # Start with default prompts
-        current_prompts = {
-            "researcher": DEFAULT_PROMPTS["researcher"].copy(),
-            "analyst": DEFAULT_PROMPTS["analyst"].copy(),
-            "writer": DEFAULT_PROMPTS["writer"].copy()
-        }
+        # Start with the locale's default prompts
+        current_prompts = self.default_prompts()
 
         best_score = 0
         best_prompts = None
         all_iterations = []
         score_improvements = []
+        start = 0
+        stopped_early = False
 
-        scientist = AIScientist(model_name="gpt-4o-mini")
-
-        for iteration in range(iterations):
-            print(f"\n{'='*80}")
-            print(f"Iteration {iteration + 1}/{iterations}")
-            print(f"{'='*80}\n")
+        state = self.load_checkpoint(output_dir, research_topic) if resume else None
+        if state is not None:
+            all_iterations = state["all_iterations"]
+            score_improvements = state["score_improvements"]
+            best_score = state["best_score"]
+            best_prompts = state["best_prompts"]
+            start = len(all_iterations)
+            print(f"♻ Resuming after iteration {start} (best score so far: {best_score:.1f}/100)")
 
-            # Run AI scientist with current prompts
-            print("🔬 Running AI Scientist with current prompts...\n")
-            result = scientist.run(
-                current_prompts["researcher"],
-                current_prompts["analyst"],
-                current_prompts["writer"],
-                research_topic
-            )
+            if state["next_prompts"] is not None:
+                current_prompts = state["next_prompts"]
+            else:
+                current_prompts = all_iterations[-1]["prompts"]
+                if start < iterations:
+                    # The last run finished evaluation but not prompt improvement
+                    current_prompts = self.next_iteration_prompts(
+                        current_prompts, state["feedback"], start - 1, role_schedule,
+                        self.dimension_means(all_iterations[-1]), target_dimensions, all_iterations[-1]["score"]
+                    )
+                    state["next_prompts"] = current_prompts
+                    self.save_checkpoint(output_dir, state)
 
-            # Evaluate output
-            print("\n📊 Evaluating output quality...")
-            score, feedback = self.evaluate_output(result)
+        # A resumed run keeps recording under its run ID
+        self.start_results_run(research_topic, "serial", output_dir, state and state.get("run_id"))
 
-            print(f"\n✅ Current Score: {score:.1f}/100")
+        scientist = self.make_scientist()
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(topics))) if len(topics) > 1 else None
 
-            # Calculate improvement
-            if iteration > 0:
-                improvement = score - all_iterations[-1]["score"]
-                score_improvements.append(improvement)
-                print(f"📈 Improvement: {improvement:+.1f} from previous iteration")
+        try:
+            for iteration in range(start, iterations):
+                self.meter.iteration = iteration + 1
+                print(f"\n{'='*80}")
+                print(f"Iteration {iteration + 1}/{iterations}")
+                print(f"{'='*80}\n")
 
-            print(f"\n📝 Feedback:\n{feedback}\n")
+                # Run AI scientist with current prompts and evaluate the output (per topic, concurrently)
+                if len(topics) == 1:
+                    print("🔬 Running AI Scientist with current prompts and evaluating output quality...\n")
+                else:
+                    print(f"🔬 Running AI Scientist with current prompts on {len(topics)} topics and evaluating...\n")
+                result, score, feedback, score_stats, topic_scores = self.evaluate_suite(
+                    scientist,
+                    current_prompts,
+                    topics,
+                    executor,
+                    incumbent=best_score if all_iterations else None,
+                    aggregate=aggregate
+                )
 
-            # Save iteration results
-            self.save_iteration_results(
-                iteration + 1,
-                current_prompts,
-                result,
-                score,
-                feedback,
-                output_dir
-            )
+                # A screened-out score is on the screen judge's scale and can't become the best
+                screened = is_screened(score_stats)
+                print(f"\n✅ Current Score: {score:.1f}/100{' (screen judge only)' if screened else ''}")
 
-            # Track all iterations
-            all_iterations.append({
-                "iteration": iteration + 1,
-                "score": score,
-                "prompts": current_prompts.copy()
-            })
+                # Calculate improvement
+                if iteration > 0:
+                    improvement = score - all_iterations[-1]["score"]
+                    score_improvements.append(improvement)
+                    print(f"📈 Improvement: {improvement:+.1f} from previous iteration")
 
-            # Track best prompts
-            if score > best_score:
-                best_score = score
-                best_prompts = current_prompts.copy()
-                print(f"🎯 New best score: {best_score:.1f}/100 (Best so far!)")
-            else:
-                print(f"📊 Best score remains: {best_score:.1f}/100")
+                print(f"\n📝 Feedback:\n{feedback}\n")
 
-            # Always improve prompts for next iteration (except last)
-            if iteration < iterations - 1:
-                print(f"\n🔧 Aggressively improving prompts for next iteration...")
-                print(f"   Analyzing weaknesses and optimizing all agent prompts...")
+                if self.surrogate is not None and screened:
+                    self.surrogate.discard(current_prompts)
+                elif self.surrogate is not None:
+                    parent = all_iterations[-1] if all_iterations else None
+                    self.surrogate.record(
+                        current_prompts.copy(), score, parent and parent["prompts"], parent and parent["score"]
+                    )
 
-                # Improve each agent's prompt based on feedback
-                current_prompts["researcher"] = self.improve_prompt(
-                    current_prompts["researcher"],
+                # Save iteration results
+                self.save_iteration_results(
+                    iteration + 1,
+                    current_prompts,
+                    result,
+                    score,
                     feedback,
-                    "Research Scientist"
+                    output_dir,
+                    score_stats=score_stats,
+                    topic_scores=topic_scores
                 )
-                current_prompts["analyst"] = self.improve_prompt(
-                    current_prompts["analyst"],
-                    feedback,
-                    "Data Analyst"
-                )
-                current_prompts["writer"] = self.improve_prompt(
-                    current_prompts["writer"],
-                    feedback,
-                    "Scientific Writer"
+
+                # Track all iterations
+                all_iterations.append({
+                    "iteration": iteration + 1,
+                    "score": score,
+                    "score_stats": score_stats,
+                    "topic_scores": topic_scores,
+                    "screened": screened,
+                    "prompt_tokens": prompt_tokens(current_prompts),
+                    "prompts": current_prompts.copy()
+                })
+
+                # Track best prompts
+                if not screened and (best_prompts is None or score > best_score):
+                    best_score = score
+                    best_prompts = current_prompts.copy()
+                    print(f"🎯 New best score: {best_score:.1f}/100 (Best so far!)")
+
+                    if self.compress:
+                        current_prompts, best_score, compression = self.verify_compression(
+                            scientist, current_prompts, score, topics, executor, aggregate
+                        )
+                        best_prompts = current_prompts.copy()
+                        if compression["accepted"]:
+                            # Resume and the summary continue from the adopted compressed set
+                            compression["prompts_before"] = all_iterations[-1]["prompts"]
+                            all_iterations[-1]["prompts"] = current_prompts.copy()
+                            all_iterations[-1]["prompt_tokens"] = prompt_tokens(current_prompts)
+                        all_iterations[-1]["compression"] = compression
+                else:
+                    print(f"📊 Best score remains: {best_score:.1f}/100")
+
+                # Checkpoint the finished crew run and evaluation
+                state = {
+                    "research_topic": research_topic,
+                    "all_iterations": all_iterations,
+                    "score_improvements": score_improvements,
+                    "best_score": best_score,
+                    "best_prompts": best_prompts,
+                    "feedback": feedback,
+                    "next_prompts": None,
+                    "run_id": self.run_id
+                }
+                self.save_checkpoint(output_dir, state)
+
+                over_budget = self.report_progress(
+                    usage_start, iteration=iteration + 1, iterations=iterations, score=score, best_score=best_score
                 )
+                if over_budget and iteration < iterations - 1:
+                    stopped_early = True
+                    break
 
-                print("✓ All prompts improved for next iteration\n")
+                # Always improve prompts for next iteration (except last)
+                if iteration < iterations - 1:
+                    current_prompts = self.next_iteration_prompts(
+                        current_prompts, feedback, iteration, role_schedule,
+                        self.dimension_means(all_iterations[-1]), target_dimensions, all_iterations[-1]["score"]
+                    )
+                    state["next_prompts"] = current_prompts
+                    self.save_checkpoint(output_dir, state)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
 
         # Calculate statistics
         avg_improvement = sum(score_improvements) / len(score_improvements) if score_improvements else 0
@@ -274,16 +987,29 @@ Respond ONLY with valid JSON in this exact format (no markdown, no extra text):
         summary_file = f"{output_dir}/optimization_summary.json"
         summary = {
             "research_topic": research_topic,
+            "language": self.language,
+            "aggregate": aggregate,
             "total_iterations": len(all_iterations),
+            "stopped_early": stopped_early,
             "best_score": best_score,
             "initial_score": all_iterations[0]["score"],
             "final_score": all_iterations[-1]["score"],
             "total_improvement": total_improvement,
             "average_improvement_per_iteration": avg_improvement,
+            "role_schedule": role_schedule,
+            "improved_roles": [
+                [role for role in b["prompts"] if b["prompts"][role] != a["prompts"].get(role)]
+                for a, b in zip(all_iterations, all_iterations[1:])
+            ],
+            "prompt_tokens": [it.get("prompt_tokens", prompt_tokens(it["prompts"]))["total"] for it in all_iterations],
+            "best_prompt_tokens": prompt_tokens(best_prompts),
             "iterations": all_iterations
         }
+        summary.update(self._run_extras(marks))
         with open(summary_file, "w", encoding="utf-8") as f:
             json.dump(summary, f, indent=2, ensure_ascii=False)
+        if self.results_store is not None:
+            self.results_store.finish_run(self.run_id, summary)
 
         # Print final summary
         print(f"\n{'='*80}")
@@ -296,11 +1022,454 @@ Respond ONLY with valid JSON in this exact format (no markdown, no extra text):
         if score_improvements:
             print(f"Avg Improvement:   {avg_improvement:+.2f} per iteration")
         print(f"Total Iterations:  {len(all_iterations)}")
+        print(f"Prompt Tokens:     {summary['prompt_tokens'][0]} initial, {summary['best_prompt_tokens']['total']} best")
+        self.print_usage(since=usage_start)
         print(f"\nResults saved to {output_dir}/")
         print(f"{'='*80}\n")
 
         return best_prompts, best_score
 
+    def evaluate_candidate(self, scientist, prompts, research_topic, judge_model=None, incumbent=None):
+        """Run the AI scientist with a prompt set and score its output
+
+        A run stopped early as hopeless (abort_hopeless) scores 0 with feedback saying why. With
+        a near-duplicate index, a prompt set nearly identical to one already evaluated on the
+        same topic with the same models, backend and fidelity reuses its result, feedback and
+        (interpolated) score. Only judge scores are indexed, not aborted runs or screened-out
+        outputs.
+        """
+        namespace = None
+        if self.duplicates is not None:
+            # Everything that changes the output or its score: scores don't carry over between them
+            namespace = [
+                research_topic, self.language, scientist.max_tokens, scientist.brief, scientist.model_name,
+                scientist.fan_out, judge_model or self.model_name, cache_identity(self.backend)
+            ]
+            known = self.duplicates.lookup(namespace, prompts)
+            if known is not None:
+                print(f"   ♻ Near-duplicate of an evaluated prompt set (similarity {known['similarity']:.2f}, "
+                      f"{known['neighbours']} match(es)); reusing score {known['score']:.1f}/100")
+                # Interpolated matches combine their neighbours' scores; a single match keeps its own statistics
+                if known.get("samples"):
+                    score_stats = score_statistics(known["samples"], self.judge_sd)
+                else:
+                    score_stats = known.get("score_stats") or score_statistics(
+                        [(known["score"], known["feedback"])], self.judge_sd
+                    )
+                result = known.get("result") or self.locale["reused_result"]
+                return result, known["score"], known["feedback"], score_stats
+
+        try:
+            result = scientist.run(
+                prompts["researcher"],
+                prompts["analyst"],
+                prompts["writer"],
+                research_topic
+            )
+        except StreamAborted as e:
+            print(f"   ⛔ AI Scientist run stopped early: output was {e.reason}")
+            self.stream_stats.record_abort(e.reason)
+            reason = self.locale["abort_reasons"].get(e.reason, e.reason)
+            result, score = e.text, 0.0
+            feedback = self.locale["aborted_feedback"].format(reason=reason)
+            score_stats = score_statistics([(score, feedback)], self.judge_sd)
+            judged = False
+        else:
+            if judge_model in (None, self.model_name):
+                score, feedback, score_stats = self.evaluate_cascade(result, incumbent=incumbent)
+            else:
+                score, feedback, score_stats = self.evaluate_adaptive(result, incumbent=incumbent, model_name=judge_model)
+            judged = not is_screened(score_stats)
+
+        # An aborted run or a screened-out score is not a judge score, so it must not be reused as one
+        if namespace is not None and judged:
+            self.duplicates.add(
+                namespace, prompts,
+                {"result": result, "score": score, "feedback": feedback, "score_stats": score_stats}
+            )
+        return result, score, feedback, score_stats
+
+    def submit_topics(self, executor, scientist, prompts, topics, judge_model=None, incumbent=None):
+        """Submit one evaluate_candidate job per topic; returns {topic: future}
+
+        Adaptive re-judging against `incumbent` only applies to single-topic runs, since the
+        incumbent is an aggregate over topics.
+        """
+        incumbent = incumbent if len(topics) == 1 else None
+        return {
+            topic: executor.submit(self.evaluate_candidate, scientist, prompts, topic, judge_model, incumbent)
+            for topic in topics
+        }
+
+    @staticmethod
+    def combine_topics(outcomes, aggregate="mean"):
+        """Merge per-topic (result, score, feedback, score_stats) into one aggregate evaluation
+
+        Returns (result, score, feedback, score_stats, topic_scores). A single topic passes
+        through unchanged; for a suite, results and feedback are concatenated under topic headings
+        and score_stats summarize each dimension across topics.
+        """
+        topic_scores = {topic: outcome[1] for topic, outcome in outcomes.items()}
+        if len(outcomes) == 1:
+            result, score, feedback, score_stats = next(iter(outcomes.values()))
+            return result, score, feedback, score_stats, topic_scores
+
+        score = aggregate_scores(topic_scores.values(), aggregate)
+        result = "\n\n".join(f"## Topic: {topic}\n\n{outcome[0]}" for topic, outcome in outcomes.items())
+        feedback = "\n\n".join(
+            f"Topic: {topic} ({outcome[1]:.1f}/100)\n{outcome[2]}" for topic, outcome in outcomes.items()
+        )
+        score_stats = score_statistics([(outcome[1], outcome[2]) for outcome in outcomes.values()])
+        if any(is_screened(outcome[3]) for outcome in outcomes.values()):
+            score_stats["overall"]["screened"] = True
+        return result, score, feedback, score_stats, topic_scores
+
+    def evaluate_suite(self, scientist, prompts, research_topic, executor=None, judge_model=None, incumbent=None,
+                       aggregate="mean"):
+        """Run and score a prompt set on every topic concurrently and aggregate; see combine_topics"""
+        topics = topic_list(research_topic)
+        if executor is None and len(topics) == 1:
+            outcome = self.evaluate_candidate(scientist, prompts, topics[0], judge_model, incumbent)
+            return self.combine_topics({topics[0]: outcome}, aggregate)
+
+        own_executor = executor is None
+        executor = executor or ThreadPoolExecutor(max_workers=len(topics))
+        try:
+            futures = self.submit_topics(executor, scientist, prompts, topics, judge_model, incumbent)
+            outcomes = {topic: future.result() for topic, future in futures.items()}
+        finally:
+            if own_executor:
+                executor.shutdown(wait=True)
+        return self.combine_topics(outcomes, aggregate)
+
+    def make_scientist(self, fidelity=FULL_FIDELITY):
+        return AIScientist(
+            model_name=self.agent_model,
+            cache=self.cache,
+            max_tokens=fidelity["max_tokens"],
+            brief=fidelity["brief"],
+            meter=self.meter,
+            backend=self.backend,
+            scheduler=self.scheduler,
+            fan_out=self.research_fan_out,
+            timings=self.stage_timings,
+            stream_dir=self.stream_dir,
+            abort_hopeless=self.abort_hopeless
+        )
+
+    def successive_halving(self, candidates, research_topic, executor, fidelities=None, eta=2, incumbent=None,
+                           aggregate="mean"):
+        """Score candidates at increasing fidelity, promoting only the top 1/eta at each rung
+
+        Returns one record per candidate with its score at every rung it reached. Only
+        candidates that reached the final (full-fidelity) rung carry result, score and feedback.
+        Rungs that would not eliminate anyone (e.g. a single candidate) are skipped. Adaptive
+        re-judging against `incumbent` only happens on the final rung.
+
+        With a topic suite, every (candidate, topic) pair runs as its own job in `executor` and
+        candidates are ranked by the `aggregate` of their topic scores.
+        """
+        fidelities = fidelities or [FULL_FIDELITY]
+        topics = topic_list(research_topic)
+        records = [{"index": k, "prompts": prompts, "rung_scores": []} for k, prompts in enumerate(candidates)]
+        survivors = list(records)
+
+        for rung, fidelity in enumerate(fidelities, start=1):
+            final = rung == len(fidelities)
+            keep = len(survivors) if final else math.ceil(len(survivors) / eta)
+            if not survivors or (not final and keep == len(survivors)):
+                continue
+
+            judge_model = fidelity["judge_model"] or self.model_name
+            scientist = self.make_scientist(fidelity)
+            if len(fidelities) > 1:
+                print(f"🪜 Rung {rung}/{len(fidelities)}: evaluating {len(survivors)} candidate(s) "
+                      f"(max_tokens={fidelity['max_tokens']}, judge={judge_model})")
+
+            # Submit every (candidate, topic) pair before collecting any, so they all share the pool
+            futures = [
+                self.submit_topics(
+                    executor,
+                    scientist,
+                    record["prompts"],
+                    topics,
+                    judge_model,
+                    incumbent if final else None
+                )
+                for record in survivors
+            ]
+
+            scored = []
+            for record, topic_futures in zip(survivors, futures):
+                try:
+                    outcomes = {topic: future.result() for topic, future in topic_futures.items()}
+                except Exception as e:
+                    print(f"   ⚠ Candidate {record['index'] + 1} failed at rung {rung}: {e}")
+                    continue
+
+                result, score, feedback, score_stats, topic_scores = self.combine_topics(outcomes, aggregate)
+                record["rung_scores"].append({"rung": rung, "score": score})
+                if final:
+                    record.update(result=result, score=score, feedback=feedback, score_stats=score_stats,
+                                  topic_scores=topic_scores)
+                scored.append(record)
+
+            scored.sort(key=lambda record: record["rung_scores"][-1]["score"], reverse=True)
+            survivors = scored[:keep]
+
+        return records
+
+    def optimize_population(self, research_topic, generations=5, population_size=4, beam_width=2,
+                            max_workers=4, output_dir=None, fidelities=None, eta=2,
+                            aggregate="mean", topics_per_generation=None, topic_seed=0):
+        """Optimize prompts with a beam search over prompt sets
+
+        Each generation derives `population_size` candidates from the current beam via
+        improve_prompts, runs and evaluates them concurrently with at most `max_workers`
+        in flight, and keeps the top `beam_width` prompt sets seen so far.
+
+        Pass fidelities=MULTI_FIDELITY to screen candidates with cheap, short runs first and
+        promote only the top 1/eta per rung to full-length runs (successive halving).
+
+        research_topic may be a list of topics: candidates are then scored by the `aggregate`
+        ("mean" or "min") of their per-topic scores, with every (candidate, topic) pair run as its
+        own job. topics_per_generation samples that many topics per generation (seeded by
+        topic_seed); the beam is re-scored on each generation's sample so that parents and
+        children are compared on the same topics.
+        """
+        suite = topic_list(research_topic)
+        output_dir = output_dir or self.locale["output_dir"]
+        topic_rng = random.Random(topic_seed)
+
+        print(f"\n{'='*80}")
+        print(f"Starting Population-Based Prompt Optimization for: {research_topic if len(suite) == 1 else f'{len(suite)} topics'}")
+        print(f"Generations: {generations}, Population: {population_size}, Beam: {beam_width}, Workers: {max_workers}")
+        print(f"{'='*80}\n")
+
+        marks = self._start_run(output_dir)
+        usage_start = marks["usage"]
+
+        self.start_results_run(research_topic, "population", output_dir)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        beam = []
+        all_candidates = []
+        generation_stats = []
+        stopped_early = False
+
+        try:
+            for generation in range(1, generations + 1):
+                self.meter.iteration = generation
+                print(f"\n{'='*80}")
+                print(f"Generation {generation}/{generations}")
+                print(f"{'='*80}\n")
+
+                topics = suite
+                if topics_per_generation and topics_per_generation < len(suite):
+                    sample = set(topic_rng.sample(suite, topics_per_generation))
+                    topics = [topic for topic in suite if topic in sample]
+                if len(suite) > 1:
+                    print(f"📚 Topics this generation: {len(topics)}/{len(suite)}")
+
+                # Score beam parents on any sampled topic they have not been run on yet while the children are generated
+                parent_futures = []
+                if len(topics) < len(suite):
+                    full_scientist = self.make_scientist((fidelities or [FULL_FIDELITY])[-1])
+                    for member in beam:
+                        missing = [topic for topic in topics if topic not in member["topic_scores"]]
+                        parent_futures.append(
+                            (member, self.submit_topics(executor, full_scientist, member["prompts"], missing))
+                        )
+
+                if generation == 1:
+                    # Start from the locale's default prompts
+                    candidates = [self.default_prompts()]
+                    parents = [(None, None)]
+                else:
+                    # With a trained surrogate, generate extra children and keep the most promising
+                    children = population_size
+                    if self.surrogate is not None and self.surrogate.ready():
+                        children *= max(1, self.surrogate_oversample)
+
+                    # Spread the children across the beam parents; the seed keeps siblings of
+                    # one parent distinct (and separately cached)
+                    print(f"🔧 Generating {children} candidate prompt sets from {len(beam)} parent(s)...")
+                    futures = [
+                        executor.submit(
+                            self.improve_prompts,
+                            beam[k % len(beam)]["prompts"],
+                            beam[k % len(beam)]["feedback"],
+                            seed=generation * population_size + k
+                        )
+                        for k in range(children)
+                    ]
+                    candidates = [future.result() for future in futures]
+                    parents = [(beam[k % len(beam)]["prompts"], beam[k % len(beam)]["score"]) for k in range(children)]
+                    if children > population_size:
+                        keep = self.surrogate.rank(candidates, parents, keep=population_size)
+                        print(f"🔮 Surrogate kept candidates {', '.join(str(k + 1) for k in keep)} of {children}")
+                        candidates = [candidates[k] for k in keep]
+                        parents = [parents[k] for k in keep]
+
+                # Finish re-scoring the parents on this generation's topics first, so successive
+                # halving compares the children against a beam score from the same topic sample
+                for member, topic_futures in parent_futures:
+                    try:
+                        member["topic_scores"].update(
+                            (topic, future.result()[1]) for topic, future in topic_futures.items()
+                        )
+                        member["score"] = aggregate_scores((member["topic_scores"][t] for t in topics), aggregate)
+                    except Exception as e:
+                        print(f"   ⚠ Re-scoring beam parent (generation {member['generation']}, "
+                              f"candidate {member['candidate']}) failed: {e}")
+                        beam.remove(member)
+                beam.sort(key=lambda c: c["score"], reverse=True)
+
+                # Run crews and evaluations concurrently
+                print(f"🔬 Running and evaluating {len(candidates)} candidate(s)...\n")
+                records = self.successive_halving(
+                    candidates,
+                    topics,
+                    executor,
+                    fidelities,
+                    eta,
+                    incumbent=beam[0]["score"] if beam else None,
+                    aggregate=aggregate
+                )
+
+                evaluated = []
+                for record in records:
+                    k = record["index"] + 1
+                    if "score" not in record:
+                        if self.surrogate is not None:
+                            self.surrogate.discard(record["prompts"])
+                        if record["rung_scores"]:
+                            all_candidates.append({
+                                "generation": generation,
+                                "candidate": k,
+                                "score": None,
+                                "rung_scores": record["rung_scores"],
+                                "prompts": record["prompts"]
+                            })
+                        continue
+
+                    screened = is_screened(record["score_stats"])
+                    print(f"   Candidate {k}: {record['score']:.1f}/100{' (screen judge only)' if screened else ''}")
+                    if self.surrogate is not None and screened:
+                        self.surrogate.discard(record["prompts"])
+                    elif self.surrogate is not None:
+                        self.surrogate.record(record["prompts"], record["score"], *parents[record["index"]])
+                    self.save_iteration_results(
+                        generation,
+                        record["prompts"],
+                        record["result"],
+                        record["score"],
+                        record["feedback"],
+                        output_dir,
+                        candidate=k,
+                        score_stats=record["score_stats"],
+                        topic_scores=record["topic_scores"]
+                    )
+                    entry = {
+                        "generation": generation,
+                        "candidate": k,
+                        "score": record["score"],
+                        "rung_scores": record["rung_scores"],
+                        "score_stats": record["score_stats"],
+                        "feedback": record["feedback"],
+                        "topic_scores": record["topic_scores"],
+                        "screened": screened,
+                        "prompt_tokens": prompt_tokens(record["prompts"]),
+                        "prompts": record["prompts"]
+                    }
+                    evaluated.append(entry)
+                    all_candidates.append(entry)
+
+                if not evaluated and not beam:
+                    raise RuntimeError(f"All candidates failed in generation {generation}")
+
+                # Keep the top-B prompt sets seen so far (copies, since re-scoring on later topic
+                # samples must not change the recorded candidate scores); screened-out candidates
+                # only have a screen score, so they never enter the beam
+                beam = sorted(
+                    beam + [dict(c, topic_scores=dict(c["topic_scores"])) for c in evaluated if not c["screened"]],
+                    key=lambda c: c["score"],
+                    reverse=True
+                )[:beam_width]
+
+                scores = [c["score"] for c in evaluated]
+                judged = [c["score"] for c in evaluated if not c["screened"]]
+                generation_stats.append({
+                    "generation": generation,
+                    "topics": topics,
+                    "candidates": len(candidates),
+                    "promoted_to_full": len(evaluated),
+                    "scores": scores,
+                    "screened_out": len(scores) - len(judged),
+                    "best_score": max(judged) if judged else None,
+                    "beam_scores": [c["score"] for c in beam]
+                })
+                print(f"\n🎯 Beam after generation {generation}: " + ", ".join(f"{c['score']:.1f}" for c in beam))
+
+                over_budget = self.report_progress(
+                    usage_start, generation=generation, generations=generations,
+                    score=max(judged) if judged else None, best_score=beam[0]["score"]
+                )
+                if over_budget and generation < generations:
+                    stopped_early = True
+                    break
+        finally:
+            executor.shutdown(wait=True)
+
+        best = beam[0]
+
+        # Save summary
+        summary_file = f"{output_dir}/optimization_summary.json"
+        summary = {
+            "research_topic": research_topic,
+            "language": self.language,
+            "mode": "population",
+            "topics": suite,
+            "aggregate": aggregate,
+            "topics_per_generation": topics_per_generation,
+            "generations": generations,
+            "population_size": population_size,
+            "beam_width": beam_width,
+            "max_workers": max_workers,
+            "fidelities": fidelities or [FULL_FIDELITY],
+            "eta": eta,
+            "stopped_early": stopped_early,
+            "candidates_evaluated": len(all_candidates),
+            "full_evaluations": sum(1 for c in all_candidates if c["score"] is not None),
+            "best_score": best["score"],
+            "best_generation": best["generation"],
+            "best_candidate": best["candidate"],
+            "initial_score": all_candidates[0]["score"],
+            "generation_stats": generation_stats,
+            "candidates": [
+                {key: c.get(key) for key in ("generation", "candidate", "score", "screened", "topic_scores",
+                                             "score_stats", "rung_scores", "prompt_tokens", "prompts")}
+                for c in all_candidates
+            ]
+        }
+        summary.update(self._run_extras(marks))
+        with open(summary_file, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        if self.results_store is not None:
+            self.results_store.finish_run(self.run_id, summary)
+
+        print(f"\n{'='*80}")
+        print(f"🎉 Population Optimization Complete!")
+        print(f"{'='*80}")
+        print(f"Initial Score:       {all_candidates[0]['score']:.1f}/100")
+        print(f"Best Score:          {best['score']:.1f}/100 (generation {best['generation']}, candidate {best['candidate']})")
+        print(f"Candidates Evaluated: {len(all_candidates)}")
+        self.print_usage(since=usage_start)
+        print(f"\nResults saved to {output_dir}/")
+        print(f"{'='*80}\n")
+
+        return best["prompts"], best["score"]
+
 
 def save_optimized_prompts(prompts, filename="optimized_prompts.py"):
     """Save optimized prompts to a file"""
@@ -309,4 +1478,61 @@ def save_optimized_prompts(prompts, filename="optimized_prompts.py"):
         f.write("OPTIMIZED_PROMPTS = ")
         f.write(repr(prompts))
         f.write("\n")
-    print(f"✓ Optimized prompts saved to {filename}")
\ No newline at end of file
+    print(f"✓ Optimized prompts saved to {filename}")
+
+def optimize_languages(research_topic, languages=("en", "ko"), output_root="optimization_results_languages",
+                       mode="serial", optimizer_kwargs=None, **run_kwargs):
+    """Optimize prompts for several languages concurrently in one process
+
+    research_topic is used for every language, or pass {language: topic}. Each language gets its
+    own SimplePromptOptimizer (and UsageMeter) built with `optimizer_kwargs`; they share the cache
+    given there, the request scheduler and the connection and agent pools. Each language writes
+    to output_root/<language>/, and output_root/language_comparison.json compares their runs.
+    mode is "serial" (optimize) or "population" (optimize_population); run_kwargs go to that method.
+
+    Returns {language: (best prompts, best score)}.
+    """
+    optimizer_kwargs = optimizer_kwargs or {}
+
+    def run(language):
+        topic = research_topic[language] if isinstance(research_topic, dict) else research_topic
+        optimizer = SimplePromptOptimizer(language=language, **optimizer_kwargs)
+        output_dir = os.path.join(output_root, language)
+        if mode == "population":
+            return optimizer.optimize_population(topic, output_dir=output_dir, **run_kwargs)
+        return optimizer.optimize(topic, output_dir=output_dir, **run_kwargs)
+
+    with ThreadPoolExecutor(max_workers=len(languages)) as executor:
+        futures = {language: executor.submit(run, language) for language in languages}
+        results = {language: future.result() for language, future in futures.items()}
+
+    comparison = {}
+    for language in languages:
+        with open(os.path.join(output_root, language, "optimization_summary.json"), "r", encoding="utf-8") as f:
+            summary = json.load(f)
+        if mode == "population":
+            scores = [generation["best_score"] for generation in summary["generation_stats"]]
+        else:
+            scores = [iteration["score"] for iteration in summary["iterations"]]
+        comparison[language] = {
+            "research_topic": summary["research_topic"],
+            "best_score": summary["best_score"],
+            "initial_score": summary["initial_score"],
+            "scores": scores,
+            "cost": summary["usage"]["total"]["cost"],
+            "best_prompt_tokens": prompt_tokens(results[language][0])["total"]
+        }
+
+    with open(os.path.join(output_root, "language_comparison.json"), "w", encoding="utf-8") as f:
+        json.dump({"mode": mode, "languages": comparison}, f, indent=2, ensure_ascii=False)
+
+    print(f"\n{'='*80}")
+    print(f"🌐 Language Comparison")
+    print(f"{'='*80}")
+    for language, entry in comparison.items():
+        print(f"{LOCALES[language]['name'] if language in LOCALES else language:<10} "
+              f"best {entry['best_score']:.1f}/100 (initial {entry['initial_score']:.1f}), ${entry['cost']:.4f}")
+    print(f"\nResults saved to {output_root}/")
+    print(f"{'='*80}\n")
+
+    return results
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Append-only store of optimization results, indexed for comparing runs
+
+    python results_store.py best                      # best prompt set per topic and language
+    python results_store.py runs --topic "..."        # runs recorded for a topic
+    python results_store.py trajectory RUN_ID         # best score per iteration of a run
+    python results_store.py prompts RUN_ID 3 [2]      # prompts of iteration 3 (candidate 2)
+"""
+import os
+import json
+import time
+import uuid
+import queue
+import sqlite3
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS runs ("
+    " run_id TEXT PRIMARY KEY,"
+    " topic TEXT NOT NULL,"
+    " language TEXT NOT NULL,"
+    " mode TEXT NOT NULL,"
+    " output_dir TEXT,"
+    " started_at REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS results ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " run_id TEXT NOT NULL,"
+    " topic TEXT NOT NULL,"
+    " language TEXT NOT NULL,"
+    " iteration INTEGER NOT NULL,"
+    " candidate INTEGER,"
+    " score REAL NOT NULL,"
+    " screened INTEGER NOT NULL DEFAULT 0,"
+    " prompts_hash TEXT NOT NULL,"
+    " prompts TEXT NOT NULL,"
+    " feedback TEXT,"
+    " result TEXT,"
+    " topic_scores TEXT,"
+    " score_stats TEXT,"
+    " created_at REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS summaries ("
+    " run_id TEXT NOT NULL,"
+    " summary TEXT NOT NULL,"
+    " created_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_runs_topic ON runs (topic, language)",
+    "CREATE INDEX IF NOT EXISTS idx_results_topic ON results (topic, language, score DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id, iteration, candidate)",
+    "CREATE INDEX IF NOT EXISTS idx_results_prompts ON results (prompts_hash)",
+    "CREATE INDEX IF NOT EXISTS idx_summaries_run ON summaries (run_id)"
+]
+
+# Columns added after the first release, with their definitions, for upgrading older stores
+ADDED_COLUMNS = {"results": {"screened": "INTEGER NOT NULL DEFAULT 0"}}
+
+# Columns of results holding JSON
+JSON_COLUMNS = ("prompts", "topic_scores", "score_stats")
+
+
+def topic_label(research_topic):
+    """A topic, or a topic suite as its JSON list"""
+    return research_topic if isinstance(research_topic, str) else json.dumps(list(research_topic), ensure_ascii=False)
+
+
+def prompts_hash(prompts):
+    payload = json.dumps(prompts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultsStore:
+    """Append-only SQLite store of every scored prompt set, keyed by run, topic, language, iteration and candidate
+
+    Rows are only ever inserted: each optimization run gets a new run ID, so runs never
+    overwrite each other. Writes are queued and committed by a background thread, so
+    recording a result never blocks the optimize loop; queries flush the queue first.
+
+    Rows marked screened hold a screen judge's score (see SimplePromptOptimizer.evaluate_cascade)
+    and are left out of the best and trajectory queries.
+    """
+
+    def __init__(self, path=".results/results.sqlite"):
+        self.path = path
+        self.errors = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+            for table, columns in ADDED_COLUMNS.items():
+                existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                for column, definition in columns.items():
+                    if column not in existing:
+                        self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            self._conn.commit()
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="results-store-writer", daemon=True)
+        self._writer.start()
+
+    def _write_loop(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # Commit everything queued so far in one transaction
+            while item is not None:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            writes = [entry for entry in batch if entry is not None]
+            try:
+                with conn:
+                    for sql, params in writes:
+                        conn.execute(sql, params)
+            except sqlite3.Error as e:
+                self.errors += len(writes)
+                print(f"⚠ Results store write failed: {e}")
+            for _ in batch:
+                self._queue.task_done()
+            if None in batch:
+                conn.close()
+                return
+
+    def _write(self, sql, params):
+        self._queue.put((sql, params))
+
+    def flush(self):
+        """Wait until every queued write is committed"""
+        self._queue.join()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        with self._lock:
+            self._conn.close()
+
+    def start_run(self, research_topic, language, mode, output_dir=None):
+        """Record a new run and return its ID"""
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        self._write(
+            "INSERT INTO runs (run_id, topic, language, mode, output_dir, started_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (run_id, topic_label(research_topic), language, mode, output_dir, time.time())
+        )
+        return run_id
+
+    def append(self, run_id, research_topic, language, iteration, prompts, score, candidate=None, feedback=None,
+               result=None, topic_scores=None, score_stats=None, screened=False):
+        """Queue one scored prompt set"""
+        self._write(
+            "INSERT INTO results (run_id, topic, language, iteration, candidate, score, screened, prompts_hash,"
+            " prompts, feedback, result, topic_scores, score_stats, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                run_id, topic_label(research_topic), language, iteration, candidate, score, int(screened),
+                prompts_hash(prompts),
+                json.dumps(prompts, ensure_ascii=False), feedback, None if result is None else str(result),
+                None if topic_scores is None else json.dumps(topic_scores, ensure_ascii=False),
+                None if score_stats is None else json.dumps(score_stats, ensure_ascii=False),
+                time.time()
+            )
+        )
+
+    def finish_run(self, run_id, summary):
+        """Queue a run's final summary"""
+        self._write(
+            "INSERT INTO summaries (run_id, summary, created_at) VALUES (?, ?, ?)",
+            (run_id, json.dumps(summary, ensure_ascii=False, default=str), time.time())
+        )
+
+    def _query(self, sql, params=()):
+        self.flush()
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        for row in rows:
+            for column in JSON_COLUMNS:
+                if row.get(column) is not None:
+                    row[column] = json.loads(row[column])
+        return rows
+
+    def best_per_topic(self, language=None):
+        """Highest-scoring prompt set of every (topic, language), with the run and iteration it came from"""
+        where, params = (" AND language = ?", (language,)) if language else ("", ())
+        rows = self._query(
+            "SELECT r.topic, r.language, r.score, r.run_id, r.iteration, r.candidate, r.prompts FROM results r"
+            " JOIN (SELECT topic, language, MAX(score) AS best FROM results WHERE screened = 0" + where +
+            " GROUP BY topic, language) b"
+            " ON r.topic = b.topic AND r.language = b.language AND r.score = b.best AND r.screened = 0"
+            " ORDER BY r.topic, r.language, r.id",
+            params
+        )
+        best = {}
+        for row in rows:
+            best.setdefault((row["topic"], row["language"]), row)
+        return list(best.values())
+
+    def trajectory(self, run_id):
+        """[{iteration, best judged score, candidates, screened}] of one run, in iteration order
+
+        An iteration whose only scores are screened has a score of None.
+        """
+        return self._query(
+            "SELECT iteration, MAX(CASE WHEN screened = 0 THEN score END) AS score, COUNT(*) AS candidates,"
+            " SUM(screened) AS screened FROM results"
+            " WHERE run_id = ? GROUP BY iteration ORDER BY iteration",
+            (run_id,)
+        )
+
+    def trajectories(self, research_topic, language=None):
+        """{run_id: trajectory} of every run on a topic (or topic suite)"""
+        return {run["run_id"]: self.trajectory(run["run_id"]) for run in self.runs(research_topic, language)}
+
+    def runs(self, research_topic=None, language=None):
+        """Recorded runs, oldest first, optionally only those on a topic and/or in a language"""
+        clauses, params = [], []
+        if research_topic is not None:
+            clauses.append("topic = ?")
+            params.append(topic_label(research_topic))
+        if language is not None:
+            clauses.append("language = ?")
+            params.append(language)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(f"SELECT * FROM runs {where} ORDER BY started_at", params)
+
+    def prompts(self, run_id, iteration, candidate=None):
+        """Prompt set recorded for an iteration (or generation and candidate) of a run, or None"""
+        rows = self._query(
+            "SELECT prompts FROM results WHERE run_id = ? AND iteration = ? AND candidate IS ? ORDER BY id LIMIT 1",
+            (run_id, iteration, candidate)
+        )
+        return rows[0]["prompts"] if rows else None
+
+    def find_prompts(self, prompts):
+        """Every recorded score of exactly this prompt set, across runs"""
+        return self._query(
+            "SELECT run_id, topic, language, iteration, candidate, score, screened FROM results WHERE prompts_hash = ?"
+            " ORDER BY id",
+            (prompts_hash(prompts),)
+        )
+
+    def summary(self, run_id):
+        """Latest recorded summary of a run, or None"""
+        rows = self._query(
+            "SELECT summary FROM summaries WHERE run_id = ? ORDER BY created_at DESC LIMIT 1", (run_id,)
+        )
+        return json.loads(rows[0]["summary"]) if rows else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the optimization results store")
+    parser.add_argument("--db", default=".results/results.sqlite", help="results store path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    best = commands.add_parser("best", help="best prompt set per topic and language")
+    best.add_argument("--language")
+    runs = commands.add_parser("runs", help="recorded runs")
+    runs.add_argument("--topic")
+    runs.add_argument("--language")
+    trajectory = commands.add_parser("trajectory", help="best score per iteration of a run")
+    trajectory.add_argument("run_id")
+    prompts = commands.add_parser("prompts", help="prompts of an iteration (and candidate) of a run")
+    prompts.add_argument("run_id")
+    prompts.add_argument("iteration", type=int)
+    prompts.add_argument("candidate", type=int, nargs="?")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        parser.error(f"no results store at {args.db}")
+    store = ResultsStore(args.db)
+    try:
+        if args.command == "best":
+            output = store.best_per_topic(args.language)
+        elif args.command == "runs":
+            output = store.runs(args.topic, args.language)
+        elif args.command == "trajectory":
+            output = store.trajectory(args.run_id)
+        else:
+            output = store.prompts(args.run_id, args.iteration, args.candidate)
+        print(json.dumps(output, indent=2, ensure_ascii=False))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
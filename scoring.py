@@ -0,0 +1,151 @@
+import re
+import math
+
+# Pseudo-samples of prior judge variance blended into the sample variance, so two or
+# three judge samples still give a usable interval
+PRIOR_WEIGHT = 2
+
+SCORE_LINE = re.compile(r"^[\s*`#-]*([^\d:*`#-][^:*`]*?)[\s*`]*:[\s*`]*([\d.]+)\s*/\s*100", re.MULTILINE)
+
+
+def parse_scores(evaluation):
+    """Parse every "Name: score/100" line of a judge response into {name: score} (names lowercased)"""
+    scores = {}
+    for name, value in SCORE_LINE.findall(evaluation or ""):
+        try:
+            scores.setdefault(name.strip().lower(), float(value))
+        except ValueError:
+            continue
+    return scores
+
+
+# Rubric dimensions, the names judges use for them, and the agent role whose prompt most
+# directly controls each one (used to decide which roles to improve)
+DIMENSIONS = {
+    "relevance": {"aliases": ("relevance", "관련성"), "role": "researcher"},
+    "depth": {"aliases": ("depth", "depth of analysis", "깊이", "분석 깊이"), "role": "analyst"},
+    "clarity": {"aliases": ("clarity", "명료성", "명확성"), "role": "writer"},
+    "rigor": {"aliases": ("rigor", "scientific rigor", "엄밀성", "과학적 엄밀성"), "role": "researcher"},
+    "comprehensiveness": {"aliases": ("comprehensiveness", "포괄성"), "role": "writer"},
+    "overall": {"aliases": ("overall", "전체"), "role": None}
+}
+
+_CANONICAL = {alias: name for name, spec in DIMENSIONS.items() for alias in spec["aliases"]}
+
+
+def dimension_scores(evaluation, fill_overall=True):
+    """Parse a judge response into {dimension: score} keyed by the canonical DIMENSIONS names
+
+    Lines that are not rubric dimensions keep their lowercased name. If the judge left out the
+    Overall line, it is filled in as the mean of the rubric dimensions (unless fill_overall=False).
+    """
+    scores = {}
+    for name, value in parse_scores(evaluation).items():
+        scores.setdefault(_CANONICAL.get(name, name), value)
+
+    rubric = [scores[name] for name in DIMENSIONS if name != "overall" and name in scores]
+    if fill_overall and "overall" not in scores and rubric:
+        scores["overall"] = round(sum(rubric) / len(rubric), 1)
+    return scores
+
+
+def weakest_roles(scores, dimensions=1):
+    """Roles owning the `dimensions` lowest-scoring rubric dimensions, weakest first
+
+    Returns (roles, [(dimension, score), ...]); both are empty when no rubric dimension was scored.
+    """
+    ranked = sorted(
+        ((name, scores[name]) for name in DIMENSIONS if DIMENSIONS[name]["role"] and name in scores),
+        key=lambda item: item[1]
+    )[:dimensions]
+
+    roles = []
+    for name, _ in ranked:
+        if DIMENSIONS[name]["role"] not in roles:
+            roles.append(DIMENSIONS[name]["role"])
+    return roles, ranked
+
+
+def score_statistics(samples, prior_sd=1.5, overall_key="overall"):
+    """Mean, variance and 95% confidence interval per dimension across judge samples
+
+    `samples` is a list of (overall score, evaluation text). `prior_sd` is the judge's typical
+    run-to-run standard deviation; the sample variance is shrunk toward it with PRIOR_WEIGHT
+    pseudo-samples, so a single sample gets an interval of +/- 1.96 * prior_sd.
+    """
+    values = {}
+    for score, evaluation in samples:
+        dimensions = dimension_scores(evaluation)
+        dimensions[overall_key] = score
+        for name, value in dimensions.items():
+            values.setdefault(name, []).append(value)
+
+    stats = {}
+    for name, xs in values.items():
+        n = len(xs)
+        mean = sum(xs) / n
+        squares = sum((x - mean) ** 2 for x in xs)
+        variance = (squares + PRIOR_WEIGHT * prior_sd ** 2) / (n - 1 + PRIOR_WEIGHT)
+        half_width = 1.96 * math.sqrt(variance / n)
+        stats[name] = {
+            "mean": round(mean, 2),
+            "variance": round(squares / (n - 1), 3) if n > 1 else None,
+            "ci_low": round(mean - half_width, 2),
+            "ci_high": round(mean + half_width, 2),
+            "samples": n
+        }
+    return stats
+
+
+AGGREGATES = ("mean", "min")
+
+
+def aggregate_scores(scores, aggregate="mean"):
+    """Combine per-topic scores into one: "mean" rewards average quality, "min" the worst topic"""
+    if aggregate not in AGGREGATES:
+        raise ValueError(f"Unknown aggregate: {aggregate} (expected one of {', '.join(AGGREGATES)})")
+    scores = list(scores)
+    if aggregate == "min":
+        return min(scores)
+    return round(sum(scores) / len(scores), 2)
+
+
+# Sections a full scientific report is expected to cover, with words that signal each one
+REPORT_SECTIONS = {
+    "introduction": ("introduction", "background", "서론", "배경"),
+    "methodology": ("methodology", "methods", "approach", "방법론", "방법"),
+    "findings": ("findings", "results", "analysis", "결과", "분석"),
+    "conclusion": ("conclusion", "summary", "결론", "요약"),
+    "limitations": ("limitation", "challenge", "한계", "과제"),
+    "ethics": ("ethic", "bias", "privacy", "윤리", "편향")
+}
+
+CITATION = re.compile(r"\(\s*[A-Z][^()]{0,60}?,?\s+(19|20)\d{2}\s*\)|\[\d+\]|et al\.")
+NUMBER = re.compile(r"\d+(\.\d+)?\s*%|\b\d{2,}\b")
+
+
+def heuristic_score(text):
+    """Cheap local 0-100 score from length, section coverage, citations and quantitative detail
+
+    Returns (score, feedback). Only meant to screen out clearly weak outputs before the LLM judge.
+    """
+    text = text or ""
+    lowered = text.lower()
+    words = len(text.split())
+
+    length = min(1.0, words / 1500)
+    covered = [name for name, cues in REPORT_SECTIONS.items() if any(cue in lowered for cue in cues)]
+    coverage = len(covered) / len(REPORT_SECTIONS)
+    citations = min(1.0, len(CITATION.findall(text)) / 8)
+    numbers = min(1.0, len(NUMBER.findall(text)) / 10)
+    headings = min(1.0, sum(1 for line in text.splitlines() if line.lstrip().startswith(("#", "**"))) / 6)
+
+    score = round(40 + 15 * length + 15 * coverage + 10 * citations + 10 * numbers + 10 * headings, 1)
+
+    missing = [name for name in REPORT_SECTIONS if name not in covered]
+    feedback = (
+        f"Heuristic screen: {words} words, sections covered: {', '.join(covered) or 'none'}"
+        f"{'; missing: ' + ', '.join(missing) if missing else ''}. "
+        f"Add citations and quantitative evidence to strengthen rigor and depth."
+    )
+    return score, feedback
@@ -0,0 +1,137 @@
+import re
+import time
+import threading
+
+# Scores in a streamed structured evaluation, complete once followed by "," or "}"
+SCORE_FIELD = re.compile(r'"(relevance|depth|clarity|rigor|comprehensiveness|overall)"\s*:\s*(-?\d+(?:\.\d+)?)\s*[,}]')
+
+# Words too common to tell whether an output is about the topic
+STOPWORDS = {
+    "the", "and", "for", "with", "from", "into", "onto", "about", "their", "this", "that", "these", "those",
+    "its", "are", "was", "were", "how", "what", "why", "which", "who", "when", "does", "impact", "effects",
+    "effect", "role", "use", "using", "based", "between", "implications", "on", "of", "in", "to", "a", "an"
+}
+
+
+class StreamAborted(Exception):
+    """A streamed response was stopped early; `reason` says why and `text` is what had arrived"""
+
+    def __init__(self, reason, text=""):
+        super().__init__(reason)
+        self.reason = reason
+        self.text = text
+
+
+def streamed_scores(text):
+    """{dimension: score} for every score already complete in a partial structured evaluation"""
+    return {name: float(value) for name, value in SCORE_FIELD.findall(text)}
+
+
+def topic_keywords(research_topic):
+    """Stems of the topic's content words: a prefix of each word, so inflections and particles still match"""
+    stems = set()
+    for word in re.findall(r"\w+", research_topic.lower()):
+        if word in STOPWORDS or len(word) < 3 and word.isascii():
+            continue
+        stems.add(word[:max(3, len(word) - 2)] if word.isascii() else word[:2])
+    return stems
+
+
+class OutputMonitor:
+    """Stops a streamed crew stage that is clearly hopeless, before it spends its whole token budget
+
+    Call it with (delta, text) for every streamed chunk (an on_delta callback); it raises
+    StreamAborted when, after `min_chars` characters, the output is mostly non-word characters
+    ("empty"), or when `off_topic_chars` characters in none of the topic's keywords appear
+    ("off_topic"). finish(text) applies the empty check to a completed output.
+    """
+
+    def __init__(self, research_topic, min_chars=200, off_topic_chars=2000):
+        self.keywords = topic_keywords(research_topic)
+        self.min_chars = min_chars
+        self.off_topic_chars = off_topic_chars
+        self.checked_empty = False
+        self.checked_topic = False
+
+    @staticmethod
+    def is_empty(text):
+        return len(re.findall(r"\w", text)) < 0.2 * max(1, len(text)) or len(text.split()) < 5
+
+    def __call__(self, delta, text):
+        if not self.checked_empty and len(text) >= self.min_chars:
+            self.checked_empty = True
+            if self.is_empty(text):
+                raise StreamAborted("empty", text)
+        if not self.checked_topic and self.keywords and len(text) >= self.off_topic_chars:
+            self.checked_topic = True
+            lowered = text.lower()
+            if not any(keyword in lowered for keyword in self.keywords):
+                raise StreamAborted("off_topic", text)
+        return False
+
+    def finish(self, text):
+        if not text.strip() or (len(text) < self.min_chars and self.is_empty(text)):
+            raise StreamAborted("empty", text)
+
+
+class ScoreWatcher:
+    """on_delta callback that notes when a streamed evaluation's overall score arrives
+
+    With stop_at_score=True it also stops the stream there, for judge samples whose feedback
+    is not needed.
+    """
+
+    def __init__(self, stop_at_score=False):
+        self.stop_at_score = stop_at_score
+        self.started = time.perf_counter()
+        self.time_to_score = None
+
+    def __call__(self, delta, text):
+        if self.time_to_score is None and '"overall"' in text and "overall" in streamed_scores(text):
+            self.time_to_score = time.perf_counter() - self.started
+            return self.stop_at_score
+        return False
+
+
+class StreamStats:
+    """Thread-safe log of streamed evaluations and aborted crew runs"""
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def record_evaluation(self, watcher, seconds, stopped=False):
+        with self._lock:
+            self.records.append({"kind": "evaluation", "time_to_score": watcher.time_to_score,
+                                 "seconds": seconds, "stopped": stopped})
+
+    def record_abort(self, reason):
+        with self._lock:
+            self.records.append({"kind": "abort", "reason": reason})
+
+    def mark(self):
+        """Return a position in the record list to summarize from"""
+        with self._lock:
+            return len(self.records)
+
+    def summary(self, since=0):
+        """Time-to-score, early stops and aborted runs recorded from position `since`"""
+        with self._lock:
+            records = self.records[since:]
+        evaluations = [r for r in records if r["kind"] == "evaluation"]
+        times_to_score = [r["time_to_score"] for r in evaluations if r["time_to_score"] is not None]
+        aborted = {}
+        for record in records:
+            if record["kind"] == "abort":
+                aborted[record["reason"]] = aborted.get(record["reason"], 0) + 1
+
+        def mean(xs):
+            return round(sum(xs) / len(xs), 3) if xs else None
+
+        return {
+            "evaluations": len(evaluations),
+            "mean_time_to_score": mean(times_to_score),
+            "mean_time_to_full_response": mean([r["seconds"] for r in evaluations]),
+            "stopped_at_score": sum(1 for r in evaluations if r["stopped"]),
+            "aborted_runs": aborted
+        }
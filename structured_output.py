@@ -0,0 +1,135 @@
+import re
+import json
+import threading
+
+SCORE = {"type": "number", "minimum": 0, "maximum": 100}
+
+# Judge response: one score per rubric dimension, the overall average and written feedback
+EVALUATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "relevance": SCORE,
+        "depth": SCORE,
+        "clarity": SCORE,
+        "rigor": SCORE,
+        "comprehensiveness": SCORE,
+        "overall": SCORE,
+        "feedback": {"type": "string"}
+    },
+    "required": ["relevance", "depth", "clarity", "rigor", "comprehensiveness", "overall", "feedback"],
+    "additionalProperties": False
+}
+
+# Improver response: a new goal and backstory for one agent
+PROMPT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "goal": {"type": "string"},
+        "backstory": {"type": "string"}
+    },
+    "required": ["goal", "backstory"],
+    "additionalProperties": False
+}
+
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+def response_format(name, schema):
+    """OpenAI structured-output response_format for a JSON schema"""
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": schema}}
+
+
+def subschema(schema, fields):
+    """The part of an object schema covering only `fields`, for re-asking just the missing ones"""
+    return {
+        "type": "object",
+        "properties": {field: schema["properties"][field] for field in fields},
+        "required": list(fields),
+        "additionalProperties": False
+    }
+
+
+def extract_json(text):
+    """Parse the JSON object in a response, repairing code fences, surrounding prose and trailing commas
+
+    Returns a dict, or None if no object can be recovered.
+    """
+    text = (text or "").strip()
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+
+    candidate = text[start:end + 1]
+    for attempt in (candidate, TRAILING_COMMA.sub(r"\1", candidate)):
+        try:
+            data = json.loads(attempt)
+        except ValueError:
+            continue
+        return data if isinstance(data, dict) else None
+    return None
+
+
+def invalid_fields(data, schema):
+    """Required fields of an object schema that are missing, have the wrong type or are out of range
+
+    Ranges (minimum/maximum) are checked here because strict structured outputs don't enforce them.
+    """
+    invalid = []
+    for field in schema["required"]:
+        value = data.get(field)
+        spec = schema["properties"][field]
+        if spec["type"] == "number":
+            valid = (
+                isinstance(value, (int, float)) and not isinstance(value, bool)
+                and spec.get("minimum", value) <= value <= spec.get("maximum", value)
+            )
+        else:
+            valid = isinstance(value, str) and value.strip() != ""
+        if not valid:
+            invalid.append(field)
+    return invalid
+
+
+class ParseStats:
+    """Thread-safe counters for how structured responses were recovered, per response kind
+
+    Every response ends in exactly one outcome:
+    - "parsed":   valid on the first attempt
+    - "repaired": fixed locally without another call (fences, prose, trailing commas, computable fields)
+    - "reasked":  the malformed fields were re-requested from the model
+    - "failed":   nothing usable; the caller fell back to its default
+    """
+
+    OUTCOMES = ("parsed", "repaired", "reasked", "failed")
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def record(self, kind, outcome):
+        with self._lock:
+            self.records.append((kind, outcome))
+
+    def mark(self):
+        """Return a position in the record list to summarize from"""
+        with self._lock:
+            return len(self.records)
+
+    def summary(self, since=0):
+        """Outcome counts and rates per response kind of the responses recorded from position `since`"""
+        with self._lock:
+            records = self.records[since:]
+        counts_by_kind = {}
+        for kind, outcome in records:
+            counts_by_kind.setdefault(kind, dict.fromkeys(self.OUTCOMES, 0))[outcome] += 1
+
+        summary = {}
+        for kind, counts in counts_by_kind.items():
+            total = sum(counts.values())
+            summary[kind] = dict(
+                counts,
+                total=total,
+                parse_failure_rate=(total - counts["parsed"]) / total if total else 0.0,
+                unrecovered_rate=counts["failed"] / total if total else 0.0
+            )
+        return summary
@@ -0,0 +1,242 @@
+import json
+import math
+import re
+import threading
+import zlib
+from collections import Counter
+from scoring import REPORT_SECTIONS
+
+WORD = re.compile(r"\w+")
+
+ROLES = ("researcher", "analyst", "writer")
+
+# Directives the improver adds to prompts, beyond the report sections, that the judge rewards
+PROMPT_CUES = {
+    "examples": ("example", "case stud", "사례", "예시"),
+    "citations": ("citation", "cite", "evidence", "peer-review", "인용", "근거"),
+    "quantitative": ("quantitative", "statistic", "metric", "data", "정량", "통계", "데이터")
+}
+
+
+def prompt_text(prompts):
+    """All goals and backstories of a prompt set as one lowercased text"""
+    return " ".join(f"{prompt['goal']} {prompt['backstory']}" for prompt in prompts.values()).lower()
+
+
+def prompt_key(prompts):
+    return json.dumps(prompts, sort_keys=True, ensure_ascii=False)
+
+
+def spearman(xs, ys):
+    """Spearman rank correlation (average ranks for ties), or None for fewer than 3 pairs or constant input"""
+    if len(xs) < 3:
+        return None
+
+    def ranks(values):
+        order = sorted(range(len(values)), key=lambda i: values[i])
+        result = [0.0] * len(values)
+        i = 0
+        while i < len(order):
+            j = i
+            while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+                j += 1
+            for k in range(i, j + 1):
+                result[order[k]] = (i + j) / 2
+            i = j + 1
+        return result
+
+    rx, ry = ranks(xs), ranks(ys)
+    mx, my = sum(rx) / len(rx), sum(ry) / len(ry)
+    cov = sum((a - mx) * (b - my) for a, b in zip(rx, ry))
+    sx = math.sqrt(sum((a - mx) ** 2 for a in rx))
+    sy = math.sqrt(sum((b - my) ** 2 for b in ry))
+    if not sx or not sy:
+        return None
+    return round(cov / (sx * sy), 3)
+
+
+def solve(matrix, vector):
+    """Solve matrix @ x = vector by Gaussian elimination with partial pivoting"""
+    n = len(vector)
+    rows = [list(row) + [value] for row, value in zip(matrix, vector)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        if abs(rows[col][col]) < 1e-12:
+            continue
+        for r in range(col + 1, n):
+            factor = rows[r][col] / rows[col][col]
+            if factor:
+                for c in range(col, n + 1):
+                    rows[r][c] -= factor * rows[col][c]
+    x = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        if abs(rows[r][r]) < 1e-12:
+            continue
+        x[r] = (rows[r][n] - sum(rows[r][c] * x[c] for c in range(r + 1, n))) / rows[r][r]
+    return x
+
+
+class SurrogateModel:
+    """Local ridge regression that predicts a prompt set's judge score before any crew run
+
+    Features are cheap to compute from the prompts alone: per-role length, coverage of report
+    sections and prompt directives, a hashed TF-IDF vector of the whole set, and its difference
+    from the parent prompt set it was improved from (word overlap, length change, parent score).
+
+    record() adds an evaluated prompt set and the model refits on the next prediction, so it
+    learns incrementally as scores arrive; load it with the history of earlier runs to start
+    warm. Until `min_examples` scores are known, predict() returns None. Every prediction that
+    later gets a real score is kept, and summary() reports their rank correlation; predictions
+    of candidates that will never get a judge score are dropped (by rank() or discard()).
+    """
+
+    def __init__(self, l2=1.0, min_examples=6, buckets=32):
+        self.l2 = l2
+        self.min_examples = min_examples
+        self.buckets = buckets
+        self.examples = []
+        self.doc_freq = Counter()
+        self.pending = {}
+        self.scored_predictions = []
+        self.screened_out = 0
+        self._model = None
+        self._lock = threading.Lock()
+
+    def ready(self):
+        return len(self.examples) >= self.min_examples
+
+    def features(self, prompts, parent=None, parent_score=None, mean_score=0.0):
+        text = prompt_text(prompts)
+        words = WORD.findall(text)
+        values = [math.log1p(len(WORD.findall(f"{prompts[role]['goal']} {prompts[role]['backstory']}")))
+                  for role in ROLES if role in prompts]
+        values += [float(any(cue in text for cue in cues)) for cues in REPORT_SECTIONS.values()]
+        values += [float(any(cue in text for cue in cues)) for cues in PROMPT_CUES.values()]
+
+        # Hashed TF-IDF over the prompt sets scored so far
+        vector = [0.0] * self.buckets
+        documents = len(self.examples)
+        for word, count in Counter(words).items():
+            idf = math.log((1 + documents) / (1 + self.doc_freq[word])) + 1
+            vector[zlib.crc32(word.encode("utf-8")) % self.buckets] += (1 + math.log(count)) * idf
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        values += [v / norm for v in vector]
+
+        if parent is None:
+            values += [0.0, 0.0, 0.0, 0.0]
+        else:
+            own, theirs = set(words), set(WORD.findall(prompt_text(parent)))
+            overlap = len(own & theirs) / len(own | theirs) if own | theirs else 1.0
+            values += [
+                1.0,
+                1.0 - overlap,
+                math.log((1 + len(words)) / (1 + len(WORD.findall(prompt_text(parent))))),
+                (parent_score if parent_score is not None else mean_score) - mean_score
+            ]
+        return values
+
+    def fit(self):
+        """Refit the ridge regression on every recorded example (standardized features)"""
+        scores = [example["score"] for example in self.examples]
+        mean_score = sum(scores) / len(scores)
+        rows = [
+            self.features(example["prompts"], example["parent"], example["parent_score"], mean_score)
+            for example in self.examples
+        ]
+        width = len(rows[0])
+        means = [sum(row[j] for row in rows) / len(rows) for j in range(width)]
+        scales = [
+            math.sqrt(sum((row[j] - means[j]) ** 2 for row in rows) / len(rows)) or 1.0
+            for j in range(width)
+        ]
+        x = [[(row[j] - means[j]) / scales[j] for j in range(width)] for row in rows]
+        y = [score - mean_score for score in scores]
+
+        gram = [[sum(row[i] * row[j] for row in x) + (self.l2 if i == j else 0.0) for j in range(width)]
+                for i in range(width)]
+        moment = [sum(row[i] * target for row, target in zip(x, y)) for i in range(width)]
+        self._model = {
+            "weights": solve(gram, moment),
+            "means": means,
+            "scales": scales,
+            "mean_score": mean_score
+        }
+
+    def predict(self, prompts, parent=None, parent_score=None):
+        """Predicted 0-100 score of a prompt set, or None while there are too few examples"""
+        with self._lock:
+            if not self.ready():
+                return None
+            if self._model is None:
+                self.fit()
+            model = self._model
+            row = self.features(prompts, parent, parent_score, model["mean_score"])
+            predicted = model["mean_score"] + sum(
+                w * (value - mean) / scale
+                for w, value, mean, scale in zip(model["weights"], row, model["means"], model["scales"])
+            )
+            predicted = round(min(100.0, max(0.0, predicted)), 2)
+            self.pending[prompt_key(prompts)] = predicted
+            return predicted
+
+    def rank(self, candidates, parents=None, keep=None):
+        """Indices of the `keep` candidates with the highest predicted score, best first
+
+        parents[k] is the (prompts, score) candidate k was improved from. While the model is
+        not ready, the first `keep` candidates are kept in their original order.
+        """
+        keep = len(candidates) if keep is None else keep
+        parents = parents or [(None, None)] * len(candidates)
+        predictions = [self.predict(prompts, *parent) for prompts, parent in zip(candidates, parents)]
+        if any(p is None for p in predictions):
+            return list(range(len(candidates)))[:keep]
+
+        order = sorted(range(len(candidates)), key=lambda k: predictions[k], reverse=True)
+        with self._lock:
+            self.screened_out += max(0, len(candidates) - keep)
+            for k in order[keep:]:
+                self.pending.pop(prompt_key(candidates[k]), None)
+        return order[:keep]
+
+    def discard(self, prompts):
+        """Drop the pending prediction of a prompt set that will not get a judge score"""
+        with self._lock:
+            self.pending.pop(prompt_key(prompts), None)
+
+    def record(self, prompts, score, parent=None, parent_score=None):
+        """Add an evaluated prompt set; the model refits before its next prediction"""
+        with self._lock:
+            predicted = self.pending.pop(prompt_key(prompts), None)
+            if predicted is not None:
+                self.scored_predictions.append((predicted, score))
+            self.examples.append({"prompts": prompts, "score": score, "parent": parent, "parent_score": parent_score})
+            self.doc_freq.update(set(WORD.findall(prompt_text(prompts))))
+            self._model = None
+
+    def mark(self):
+        """Return the current counters, to summarize only what happens after this point"""
+        with self._lock:
+            return {
+                "examples": len(self.examples),
+                "predictions": len(self.scored_predictions),
+                "screened_out": self.screened_out
+            }
+
+    def summary(self, since=None):
+        """Model size, plus candidates screened out and prediction accuracy since the `since` mark"""
+        since = since or {"examples": 0, "predictions": 0, "screened_out": 0}
+        with self._lock:
+            scored = self.scored_predictions[since["predictions"]:]
+            predicted = [p for p, _ in scored]
+            actual = [a for _, a in scored]
+            return {
+                "examples": len(self.examples),
+                "examples_added": len(self.examples) - since["examples"],
+                "ready": self.ready(),
+                "screened_out": self.screened_out - since["screened_out"],
+                "predictions_scored": len(scored),
+                "rank_correlation": spearman(predicted, actual),
+                "mean_abs_error": round(sum(abs(p - a) for p, a in scored) / len(predicted), 2)
+                if predicted else None
+            }
@@ -0,0 +1,121 @@
+import sys
+import types
+
+import pytest
+
+from ai_scientist import AIScientist, AgentPool, DEFAULT_PROMPTS
+from usage_meter import UsageMeter
+
+
+class TokenProcess:
+    """Lifetime token counters, like the ones CrewAI keeps on every Agent"""
+
+    def __init__(self):
+        self.counts = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "successful_requests": 0}
+
+    def get_summary(self):
+        return dict(self.counts)
+
+
+class Agent:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+        self._token_process = TokenProcess()
+
+
+class Task:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class Crew:
+    def __init__(self, agents, tasks, **kwargs):
+        self.agents = agents
+        self.tasks = tasks
+        self.usage_metrics = None
+
+    def kickoff(self):
+        # Two LLM calls per kickoff; usage_metrics sums the agents' lifetime counters, as CrewAI does
+        for agent in self.agents:
+            counts = agent._token_process.counts
+            counts["prompt_tokens"] += 300
+            counts["completion_tokens"] += 100
+            counts["total_tokens"] += 400
+            counts["successful_requests"] += 2
+        self.usage_metrics = {
+            name: sum(agent._token_process.counts[name] for agent in self.agents)
+            for name in ("prompt_tokens", "completion_tokens", "total_tokens", "successful_requests")
+        }
+        return "output"
+
+
+class Pool:
+    def chat_model(self, *args, **kwargs):
+        return object()
+
+
+@pytest.fixture
+def crewai(monkeypatch):
+    module = types.ModuleType("crewai")
+    module.Agent, module.Task, module.Crew = Agent, Task, Crew
+    module.Process = types.SimpleNamespace(sequential="sequential")
+    monkeypatch.setitem(sys.modules, "crewai", module)
+    return module
+
+
+def test_reused_agent_records_only_its_own_kickoff(crewai):
+    meter = UsageMeter()
+    agent_pool = AgentPool()
+    scientist = AIScientist(meter=meter, pool=Pool(), agent_pool=agent_pool)
+    prompt = DEFAULT_PROMPTS["researcher"]
+
+    for _ in range(3):
+        scientist.run_stage("Research Scientist", prompt, "Research X", "A report", [])
+
+    assert agent_pool.stats()["hits"] == 2
+    assert [(r["prompt_tokens"], r["completion_tokens"]) for r in meter.records] == [(300, 100)] * 3
+
+
+def test_crew_stage_charges_the_scheduler_for_every_call(crewai):
+    from llm_scheduler import RequestScheduler
+
+    scheduler = RequestScheduler(limits={"gpt-4o-mini": {"rpm": 6, "tpm": 100000}})
+    scientist = AIScientist(pool=Pool(), agent_pool=AgentPool(), scheduler=scheduler)
+    scientist.run_stage("Research Scientist", DEFAULT_PROMPTS["researcher"], "Research X", "A report", [])
+
+    requests, tokens = scheduler._model_buckets("gpt-4o-mini")
+    assert requests.level < 6 - 2 + 0.1
+    assert tokens.level < 100000 - 400 + 0.1 * 100000 / 60
+
+
+def test_agent_whose_chat_model_is_converted_by_crewai_is_rejected(crewai, monkeypatch):
+    class ConvertingAgent(Agent):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.llm = "gpt-4o-mini"
+
+    class ChatModel:
+        pass
+
+    class ChatPool:
+        def chat_model(self, *args, **kwargs):
+            return ChatModel()
+
+    monkeypatch.setattr(crewai, "Agent", ConvertingAgent)
+
+    with pytest.raises(RuntimeError, match="converted"):
+        AIScientist(pool=ChatPool()).create_agent("Research Scientist", DEFAULT_PROMPTS["researcher"])
+
+
+def test_crew_chat_models_keep_sdk_retries(monkeypatch):
+    from llm_pool import ClientPool
+
+    module = types.ModuleType("langchain_openai")
+    module.ChatOpenAI = lambda **kwargs: kwargs
+    monkeypatch.setitem(sys.modules, "langchain_openai", module)
+    pool = ClientPool()
+    monkeypatch.setattr(pool, "http_client", lambda: None)
+
+    assert pool.chat_model("gpt-4o-mini", 0.7)["max_retries"] == 2
+    pool.configure(crew_max_retries=5)
+    assert pool.chat_model("gpt-4o-mini", 0.7)["max_retries"] == 5
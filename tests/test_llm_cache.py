@@ -0,0 +1,85 @@
+import pytest
+
+import llm_cache
+from llm_cache import CacheMiss, LLMCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache.time, "time", clock)
+    return clock
+
+
+def keys(cache):
+    return sorted(key for key, in cache._conn.execute("SELECT key FROM responses"))
+
+
+def test_least_recently_used_entries_are_evicted_past_max_entries(tmp_path, clock):
+    cache = LLMCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, "response")
+    cache.get("a")
+
+    cache.evict()
+
+    assert keys(cache) == ["a", "c"]
+    cache.close()
+
+
+def test_entries_past_the_age_or_size_limit_are_evicted(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite")
+    cache = LLMCache(path)
+    cache.put("old", "x" * 600_000)
+    clock.now += 2 * 86400
+    cache.put("large", "x" * 600_000)
+    cache.put("new", "x" * 600_000)
+    cache.close()
+
+    cache = LLMCache(path, max_age_days=1, max_size_mb=1)
+
+    assert keys(cache) == ["new"]
+    cache.close()
+
+
+def test_readonly_serves_hits_but_stores_nothing(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    writer = LLMCache(path)
+    writer.put("cached", "response")
+    writer.close()
+
+    cache = LLMCache(path, mode="readonly")
+    cache.put("new", "response")
+
+    assert cache.get("cached") == "response"
+    assert cache.get("new") is None
+    assert (cache.stats()["hits"], cache.stats()["misses"], cache.stats()["entries"]) == (1, 1, 1)
+    cache.close()
+
+
+def test_replay_raises_on_a_miss(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    writer = LLMCache(path)
+    writer.put("cached", "response")
+    writer.close()
+
+    cache = LLMCache(path, mode="replay")
+
+    assert cache.get("cached") == "response"
+    with pytest.raises(CacheMiss):
+        cache.get("missing")
+    cache.close()
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unknown cache mode"):
+        LLMCache(str(tmp_path / "cache.sqlite"), mode="write")
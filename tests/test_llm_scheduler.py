@@ -0,0 +1,96 @@
+import threading
+import time
+import types
+
+import pytest
+
+import llm_scheduler
+from llm_scheduler import RequestScheduler, TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_refills_at_its_rate_up_to_capacity(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_scheduler.time, "monotonic", clock)
+    bucket = TokenBucket(60)
+    bucket.level = 0.0
+
+    clock.now += 10
+    assert bucket.wait_time(20) == pytest.approx(10.0)
+    assert bucket.level == pytest.approx(10.0)
+
+    clock.now += 600
+    assert bucket.wait_time(1000) == 0.0
+    assert bucket.level == 60
+
+
+def test_waiting_requests_are_served_by_phase_priority():
+    scheduler = RequestScheduler(limits={"gpt-4o": {"rpm": 60}})
+    requests, _ = scheduler._model_buckets("gpt-4o")
+    requests.level = -1000.0
+    served = []
+
+    def request(phase):
+        scheduler.acquire("gpt-4o", 10, phase)
+        served.append(phase)
+
+    threads = [threading.Thread(target=request, args=(phase,)) for phase in ("improve", "crew", "evaluate")]
+    for thread in threads:
+        thread.start()
+    while len(scheduler._queues.get("gpt-4o", [])) < 3:
+        time.sleep(0.01)
+
+    # Let one request through at a time
+    for count in range(1, 4):
+        with scheduler._cond:
+            requests.level = 1.0
+            scheduler._cond.notify_all()
+        while len(served) < count:
+            time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+
+    assert served == ["evaluate", "crew", "improve"]
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, headers):
+        super().__init__("rate limited")
+        self.response = types.SimpleNamespace(headers=headers)
+
+
+@pytest.mark.parametrize("headers, delay", [({"retry-after": "7"}, 7.0), ({"retry-after-ms": "250"}, 0.25)])
+def test_rate_limited_calls_wait_as_long_as_retry_after_asks(monkeypatch, headers, delay):
+    sleeps = []
+    monkeypatch.setattr(llm_scheduler.time, "sleep", sleeps.append)
+    scheduler = RequestScheduler()
+    errors = [RateLimited(headers)]
+
+    def call():
+        if errors:
+            raise errors.pop()
+        return "ok"
+
+    assert scheduler.call("gpt-4o", 10, "evaluate", call) == "ok"
+    assert sleeps == [delay] and scheduler.stats()["retries"] == 1
+
+
+def test_other_errors_are_not_retried(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(llm_scheduler.time, "sleep", sleeps.append)
+
+    def call():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        RequestScheduler().call("gpt-4o", 10, "evaluate", call)
+    assert sleeps == []
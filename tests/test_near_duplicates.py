@@ -0,0 +1,32 @@
+import json
+
+from near_duplicates import NearDuplicateIndex
+
+PROMPTS = {
+    "researcher": {"goal": "Find the strongest recent evidence on the topic", "backstory": "A careful reviewer."},
+    "writer": {"goal": "Write a clear structured report", "backstory": "A science writer."}
+}
+
+
+def test_unreadable_lines_are_skipped_and_counted(tmp_path):
+    path = tmp_path / "near_duplicates.jsonl"
+    NearDuplicateIndex(path=str(path)).add(["topic"], PROMPTS, {"score": 80.0, "feedback": "Good."})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"namespace": "[\\"topic\\"]", "prompts": {"writer"')
+
+    index = NearDuplicateIndex(path=str(path))
+
+    assert index.summary()["skipped_lines"] == 1
+    assert index.lookup(["topic"], PROMPTS)["score"] == 80.0
+
+
+def test_file_stores_a_hash_of_the_result_instead_of_the_report(tmp_path):
+    path = tmp_path / "near_duplicates.jsonl"
+    index = NearDuplicateIndex(path=str(path))
+    index.add(["topic"], PROMPTS, {"result": "A long report.", "score": 80.0, "feedback": "Good."})
+
+    (line,) = path.read_text(encoding="utf-8").splitlines()
+    outcome = json.loads(line)["outcome"]
+    assert "result" not in outcome and len(outcome["result_sha256"]) == 64
+    assert index.lookup(["topic"], PROMPTS)["result"] == "A long report."
+    assert "result" not in NearDuplicateIndex(path=str(path)).lookup(["topic"], PROMPTS)
@@ -0,0 +1,36 @@
+import random
+
+from prompt_budget import count_tokens, dedupe_directives, fit_budget
+
+
+def budget_size(prompt):
+    return count_tokens(prompt["goal"]) + count_tokens(prompt["backstory"])
+
+
+def test_single_long_sentence_is_cut_to_budget():
+    prompt = {"goal": "Analyze " + "carefully and thoroughly " * 500, "backstory": "You are an analyst " * 400}
+    fitted = fit_budget(prompt, 300)
+    assert budget_size(fitted) <= 300
+    assert fitted["goal"].startswith("Analyze")
+
+
+def test_output_never_exceeds_budget():
+    rng = random.Random(0)
+    words = ["evidence", "methods", "cite", "sources", "data", "ethics", "limitations", "분석", "연구"]
+    for _ in range(200):
+        def text():
+            sentences = [
+                " ".join(rng.choice(words) for _ in range(rng.randint(1, 60))) + rng.choice([".", "!", ""])
+                for _ in range(rng.randint(0, 8))
+            ]
+            return rng.choice([" ", "\n", "\n- "]).join(sentences)
+
+        prompt = {"goal": text(), "backstory": text()}
+        max_tokens = rng.randint(0, 200)
+        assert budget_size(fit_budget(prompt, max_tokens)) <= max_tokens
+
+
+def test_separators_are_preserved():
+    prompt = {"goal": "Line one.\n- bullet a.\n- bullet b", "backstory": "Story one.\n\nStory two."}
+    assert fit_budget(prompt, None) == prompt
+    assert dedupe_directives("Cite sources.\n- Cite sources.\n- Use data.") == "Cite sources.\n- Use data."
@@ -0,0 +1,237 @@
+import json
+
+import pytest
+
+from llm_backends import FakeBackend, make_response, request_kind
+from near_duplicates import NearDuplicateIndex
+from prompt_optimizer_simple import EVALUATION_DIMENSIONS, SimplePromptOptimizer
+from structured_output import PROMPT_SCHEMA
+
+
+class ScriptedBackend:
+    """Answers evaluations without a valid overall score, and re-asks with a fixed one"""
+
+    def __init__(self):
+        self.calls = []
+
+    def complete(self, model, messages, temperature, response_format=None, **kwargs):
+        self.calls.append((model, messages))
+        if request_kind(messages, response_format) == "repair":
+            content = json.dumps({"overall": 71.0})
+        else:
+            evaluation = {name: 70.0 for name in EVALUATION_DIMENSIONS}
+            evaluation.update(overall="n/a", feedback="Solid.")
+            content = json.dumps(evaluation)
+        return make_response(content, 10, 10, model)
+
+
+def test_reask_sees_the_judged_output_and_goes_to_the_judge():
+    backend = ScriptedBackend()
+    optimizer = SimplePromptOptimizer(backend=backend)
+
+    score, _ = optimizer.evaluate_output("THE REPORT BEING JUDGED", model_name="gpt-4o-mini")
+
+    assert score == 71.0
+    (judge_model, judged), (repair_model, repair) = backend.calls
+    assert repair_model == judge_model == "gpt-4o-mini"
+    assert repair[:len(judged)] == judged
+    assert optimizer.parse_stats.summary()["evaluate"]["reasked"] == 1
+
+
+def test_malformed_response_without_its_request_is_not_reasked():
+    backend = ScriptedBackend()
+    optimizer = SimplePromptOptimizer(backend=backend)
+
+    assert optimizer.parse_structured('{"goal": "Only a goal"}', PROMPT_SCHEMA, "improve") is None
+    assert backend.calls == []
+    assert optimizer.parse_stats.summary()["improve"]["failed"] == 1
+
+
+class Scientist:
+    def __init__(self, model_name="gpt-4o-mini", fan_out=1):
+        self.model_name, self.fan_out = model_name, fan_out
+        self.max_tokens, self.brief = None, False
+        self.runs = 0
+
+    def run(self, *prompts):
+        self.runs += 1
+        return "A research report."
+
+
+def test_near_duplicates_are_not_shared_across_agent_models_or_backends():
+    index = NearDuplicateIndex()
+    prompts = SimplePromptOptimizer().default_prompts()
+    fake = SimplePromptOptimizer(backend=FakeBackend(), duplicates=index)
+    scientist = Scientist()
+
+    fake.evaluate_candidate(scientist, prompts, "Topic")
+    fake.evaluate_candidate(scientist, prompts, "Topic")
+    assert scientist.runs == 1
+
+    fake.evaluate_candidate(Scientist(model_name="gpt-4o"), prompts, "Topic")
+    fake.evaluate_candidate(Scientist(fan_out=3), prompts, "Topic")
+    SimplePromptOptimizer(backend=FakeBackend(seed=1), duplicates=index).evaluate_candidate(scientist, prompts, "Topic")
+    assert index.summary()["hits"] == 1
+
+
+def test_optimize_shuts_down_the_topic_executor_when_an_iteration_fails(monkeypatch, tmp_path):
+    import prompt_optimizer_simple
+
+    executors = []
+
+    class Executor(prompt_optimizer_simple.ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            executors.append(self)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("crew failed")
+
+    monkeypatch.setattr(prompt_optimizer_simple, "ThreadPoolExecutor", Executor)
+    optimizer = SimplePromptOptimizer(backend=FakeBackend())
+    monkeypatch.setattr(optimizer, "evaluate_suite", fail)
+
+    with pytest.raises(RuntimeError):
+        optimizer.optimize(["Topic A", "Topic B"], iterations=2, output_dir=str(tmp_path))
+    assert len(executors) == 1 and executors[0]._shutdown
+
+
+def test_screened_out_score_is_marked_and_never_becomes_the_best(monkeypatch, tmp_path):
+    optimizer = SimplePromptOptimizer(backend=FakeBackend(), screen_model="heuristic")
+    outcomes = iter([
+        ("Report", 30.0, "Judged.", optimizer.evaluate_adaptive("Report")[2]),
+        # The heuristic screen's scale starts at 40, above this judge score
+        None
+    ])
+
+    def evaluate_suite(scientist, prompts, topics, executor=None, incumbent=None, aggregate="mean"):
+        outcome = next(outcomes)
+        if outcome is None:
+            score, feedback, stats = optimizer.evaluate_cascade("Report", incumbent=1000.0)
+            outcome = ("Report", score, feedback, stats)
+        return optimizer.combine_topics({topics[0]: outcome})
+
+    monkeypatch.setattr(optimizer, "evaluate_suite", evaluate_suite)
+    monkeypatch.setattr(optimizer, "next_iteration_prompts", lambda prompts, *args, **kwargs: prompts)
+    _, best_score = optimizer.optimize("Topic", iterations=2, output_dir=str(tmp_path))
+
+    with open(tmp_path / "optimization_summary.json", encoding="utf-8") as f:
+        iterations = json.load(f)["iterations"]
+    assert [it["screened"] for it in iterations] == [False, True]
+    assert iterations[1]["score_stats"]["overall"]["screen_model"] == "heuristic"
+    assert iterations[1]["score"] > best_score == 30.0
+
+
+def test_near_duplicate_reuses_judge_statistics_but_not_aborted_runs(monkeypatch):
+    from streaming import StreamAborted
+
+    class Aborting(Scientist):
+        def run(self, *prompts):
+            self.runs += 1
+            raise StreamAborted("empty")
+
+    index = NearDuplicateIndex()
+    prompts = SimplePromptOptimizer().default_prompts()
+    optimizer = SimplePromptOptimizer(backend=FakeBackend(), duplicates=index)
+    stats = {"overall": {"mean": 80.0, "variance": 1.0, "ci_low": 78.9, "ci_high": 81.1, "samples": 3}}
+    monkeypatch.setattr(optimizer, "evaluate_cascade", lambda result, incumbent=None: (80.0, "Good.", stats))
+    aborting = Aborting()
+
+    optimizer.evaluate_candidate(aborting, prompts, "Topic")
+    optimizer.evaluate_candidate(aborting, prompts, "Topic")
+    assert aborting.runs == 2 and index.summary()["indexed"] == 0
+
+    optimizer.evaluate_candidate(Scientist(), prompts, "Topic")
+    reused = optimizer.evaluate_candidate(Scientist(), prompts, "Topic")
+    assert index.summary()["hits"] == 1
+    assert reused[3] == stats
+
+
+def test_run_summaries_count_only_their_own_run(tmp_path):
+    optimizer = SimplePromptOptimizer(backend=FakeBackend(), duplicates=NearDuplicateIndex(), stream=True)
+    summaries = []
+    for run in ("first", "second"):
+        optimizer.optimize("Topic", iterations=2, output_dir=str(tmp_path / run))
+        with open(tmp_path / run / "optimization_summary.json", encoding="utf-8") as f:
+            summaries.append(json.load(f))
+
+    # The second run repeats the first, so every evaluation is reused from the shared index
+    first, second = summaries
+    assert first["structured_output"]["evaluate"]["total"] == first["streaming"]["evaluations"] == 2
+    assert "evaluate" not in second["structured_output"] and second["streaming"]["evaluations"] == 0
+    assert (first["near_duplicates"]["hits"], second["near_duplicates"]["hits"]) == (0, 2)
+    assert second["near_duplicates"]["lookups"] == 2
+
+
+def test_adopted_compressed_prompts_are_checkpointed(monkeypatch, tmp_path):
+    optimizer = SimplePromptOptimizer(backend=FakeBackend(), compress=True, compress_tolerance=100.0)
+    compressed = {role: {"goal": "Be brief.", "backstory": "Expert."} for role in optimizer.default_prompts()}
+    monkeypatch.setattr(optimizer, "compress_prompts", lambda prompts: compressed)
+
+    best_prompts, _ = optimizer.optimize("Topic", iterations=1, output_dir=str(tmp_path))
+
+    with open(tmp_path / "checkpoint.json", encoding="utf-8") as f:
+        (iteration,) = json.load(f)["all_iterations"]
+    assert best_prompts == iteration["prompts"] == compressed
+    assert iteration["compression"]["prompts_before"] == optimizer.default_prompts()
+
+
+def test_improved_prompts_drop_repeated_directives_without_a_budget(monkeypatch):
+    optimizer = SimplePromptOptimizer(backend=FakeBackend())
+    repeated = {"goal": "Cite sources. Cite sources.", "backstory": "Cite sources. A careful analyst."}
+    monkeypatch.setattr(optimizer, "improve_prompt", lambda *args: repeated)
+
+    improved = optimizer.improve_prompts({"researcher": repeated}, "Feedback")
+
+    assert improved["researcher"] == {"goal": "Cite sources.", "backstory": "A careful analyst."}
+
+
+def test_resume_rebuilds_state_from_loose_iteration_files(tmp_path):
+    optimizer = SimplePromptOptimizer(backend=FakeBackend())
+    prompts = [optimizer.default_prompts() for _ in range(3)]
+    prompts[1]["writer"] = {"goal": "Write a sharper report.", "backstory": "An editor."}
+    for iteration, score in ((1, 60.0), (2, 75.0), (4, 90.0)):
+        optimizer.save_iteration_results(
+            iteration, prompts[min(iteration, 3) - 1], "Report", score, f"Feedback {iteration}.", str(tmp_path)
+        )
+
+    state = optimizer.load_checkpoint(str(tmp_path), "Topic")
+
+    # Iteration 4 follows a missing iteration 3, so it is not part of the run
+    assert [(it["iteration"], it["score"]) for it in state["all_iterations"]] == [(1, 60.0), (2, 75.0)]
+    assert state["score_improvements"] == [15.0]
+    assert (state["best_score"], state["best_prompts"]) == (75.0, prompts[1])
+    assert state["feedback"] == "Feedback 2." and state["next_prompts"] is None
+
+
+def test_resumed_round_robin_improves_the_role_after_the_last_finished_iteration(monkeypatch, tmp_path):
+    from prompt_optimizer_simple import ROUND_ROBIN_ROLES
+
+    optimizer = SimplePromptOptimizer(backend=FakeBackend())
+    for iteration in (1, 2):
+        optimizer.save_iteration_results(iteration, optimizer.default_prompts(), "Report", 60.0, "Ok.", str(tmp_path))
+    improved = []
+
+    def improve_prompts(prompts, feedback, roles=None, **kwargs):
+        improved.append(roles)
+        return prompts
+
+    monkeypatch.setattr(optimizer, "improve_prompts", improve_prompts)
+    optimizer.optimize("Topic", iterations=4, output_dir=str(tmp_path), role_schedule="round_robin", resume=True)
+
+    assert improved == [[ROUND_ROBIN_ROLES[1]], [ROUND_ROBIN_ROLES[2]]]
+
+
+def test_resumed_run_keeps_recording_under_its_run_id(tmp_path):
+    from results_store import ResultsStore
+
+    store = ResultsStore(str(tmp_path / "results.sqlite"))
+    output_dir = str(tmp_path / "run")
+    for iterations in (1, 2):
+        SimplePromptOptimizer(backend=FakeBackend(), results_store=store).optimize(
+            "Topic", iterations=iterations, output_dir=output_dir, resume=True
+        )
+
+    (run,) = store.runs("Topic")
+    assert [row["iteration"] for row in store.trajectory(run["run_id"])] == [1, 2]
+    store.close()
@@ -0,0 +1,68 @@
+import sqlite3
+
+from results_store import ResultsStore
+
+PROMPTS = {"writer": {"goal": "Write a report", "backstory": "A writer."}}
+
+
+def test_screened_scores_are_left_out_of_best_and_trajectory(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.sqlite"))
+    run_id = store.start_run("Topic", "en", "serial")
+    store.append(run_id, "Topic", "en", 1, PROMPTS, 70.0)
+    store.append(run_id, "Topic", "en", 2, PROMPTS, 90.0, screened=True)
+
+    assert [row["score"] for row in store.best_per_topic()] == [70.0]
+    assert [(row["score"], row["screened"]) for row in store.trajectory(run_id)] == [(70.0, 0), (None, 1)]
+    store.close()
+
+
+def test_stores_from_before_the_screened_column_are_upgraded(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE results (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, topic TEXT NOT NULL,"
+        " language TEXT NOT NULL, iteration INTEGER NOT NULL, candidate INTEGER, score REAL NOT NULL,"
+        " prompts_hash TEXT NOT NULL, prompts TEXT NOT NULL, feedback TEXT, result TEXT, topic_scores TEXT,"
+        " score_stats TEXT, created_at REAL NOT NULL)"
+    )
+    conn.close()
+
+    store = ResultsStore(path)
+    store.append("run", "Topic", "en", 1, PROMPTS, 70.0)
+    assert store.find_prompts(PROMPTS)[0]["screened"] == 0
+    store.close()
+
+
+def test_flush_commits_queued_writes_and_close_drains_the_queue(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    store = ResultsStore(path)
+    run_id = store.start_run("Topic", "en", "serial")
+    store.append(run_id, "Topic", "en", 1, PROMPTS, 70.0)
+
+    store.flush()
+    reader = sqlite3.connect(path)
+    assert reader.execute("SELECT COUNT(*) FROM results").fetchone() == (1,)
+
+    store.append(run_id, "Topic", "en", 2, PROMPTS, 75.0)
+    store.finish_run(run_id, {"best_score": 75.0})
+    store.close()
+    assert not store._writer.is_alive()
+    assert reader.execute("SELECT COUNT(*) FROM results").fetchone() == (2,)
+    reader.close()
+    store = ResultsStore(path)
+    assert store.summary(run_id) == {"best_score": 75.0}
+    store.close()
+
+
+def test_best_per_topic_keeps_the_first_of_tied_scores(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.sqlite"))
+    first, second = store.start_run("Topic", "en", "serial"), store.start_run("Topic", "en", "serial")
+    store.append(first, "Topic", "en", 1, PROMPTS, 80.0)
+    store.append(second, "Topic", "en", 1, PROMPTS, 80.0)
+    store.append(second, "Topic", "ko", 1, PROMPTS, 80.0)
+
+    best = store.best_per_topic()
+
+    assert [(row["language"], row["run_id"]) for row in best] == [("en", first), ("ko", second)]
+    assert [row["run_id"] for row in store.best_per_topic(language="ko")] == [second]
+    store.close()
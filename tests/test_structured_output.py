@@ -0,0 +1,15 @@
+from structured_output import EVALUATION_SCHEMA, invalid_fields
+
+EVALUATION = {
+    "relevance": 80, "depth": 75.5, "clarity": 90, "rigor": 70, "comprehensiveness": 85, "overall": 80.1,
+    "feedback": "Solid report."
+}
+
+
+def test_valid_evaluation_has_no_invalid_fields():
+    assert invalid_fields(EVALUATION, EVALUATION_SCHEMA) == []
+
+
+def test_out_of_range_and_mistyped_scores_are_invalid():
+    data = dict(EVALUATION, depth=850, rigor=-1, clarity=True, overall="80")
+    assert invalid_fields(data, EVALUATION_SCHEMA) == ["depth", "clarity", "rigor", "overall"]
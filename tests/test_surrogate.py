@@ -0,0 +1,35 @@
+from surrogate import SurrogateModel, prompt_key
+
+
+def prompt_set(goal):
+    return {role: {"goal": goal, "backstory": f"An expert {role}."} for role in ("researcher", "analyst", "writer")}
+
+
+def trained():
+    surrogate = SurrogateModel()
+    for k in range(6):
+        surrogate.record(prompt_set("Cite evidence. " * k + "Write a report."), 50.0 + 5 * k)
+    return surrogate
+
+
+def test_rank_drops_the_predictions_of_candidates_it_screens_out():
+    surrogate = trained()
+    candidates = [prompt_set("Cite evidence. " * k + "Summarize.") for k in range(3)]
+
+    (kept,) = surrogate.rank(candidates, keep=1)
+
+    assert list(surrogate.pending) == [prompt_key(candidates[kept])]
+    assert surrogate.summary()["screened_out"] == 2
+
+
+def test_discarded_prediction_is_never_scored():
+    surrogate = trained()
+    screened, judged = prompt_set("Summarize."), prompt_set("Cite evidence. Summarize.")
+    surrogate.rank([screened, judged])
+
+    surrogate.discard(screened)
+    surrogate.record(judged, 70.0)
+    surrogate.record(screened, 40.0)
+
+    assert surrogate.pending == {}
+    assert surrogate.summary()["predictions_scored"] == 1
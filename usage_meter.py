@@ -0,0 +1,119 @@
+import json
+import threading
+from datetime import datetime
+
+# USD per 1M tokens: (input, cached input, output)
+MODEL_PRICES = {
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60)
+}
+
+
+def model_price(model):
+    """Look up prices for a model, matching dated snapshots like gpt-4o-2024-08-06 by prefix"""
+    matches = [name for name in MODEL_PRICES if model == name or model.startswith(name + "-")]
+    if not matches:
+        return None
+    return MODEL_PRICES[max(matches, key=len)]
+
+
+def call_cost(model, prompt_tokens, completion_tokens, cached_tokens=0):
+    """Dollar cost of one call, or None for a model without known prices"""
+    price = model_price(model)
+    if price is None:
+        return None
+    input_price, cached_price, output_price = price
+    return (
+        (prompt_tokens - cached_tokens) * input_price
+        + cached_tokens * cached_price
+        + completion_tokens * output_price
+    ) / 1_000_000
+
+
+class UsageMeter:
+    """Records tokens, latency and cost of every LLM call and aggregates them by phase, role and iteration"""
+
+    def __init__(self, log_path=None):
+        self.log_path = log_path
+        self.iteration = None
+        self.records = []
+        self._lock = threading.Lock()
+
+    def record(self, model, phase, latency, prompt_tokens=0, completion_tokens=0, cached_tokens=0,
+               role=None, cache_hit=False):
+        """Record one call and append it to the JSONL log"""
+        cost = 0.0 if cache_hit else call_cost(model, prompt_tokens, completion_tokens, cached_tokens)
+        record = {
+            "timestamp": datetime.now().isoformat(timespec="milliseconds"),
+            "phase": phase,
+            "role": role,
+            "iteration": self.iteration,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_tokens": cached_tokens,
+            "latency": round(latency, 4),
+            "cost": cost,
+            "cache_hit": cache_hit
+        }
+
+        with self._lock:
+            self.records.append(record)
+            if self.log_path:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        return record
+
+    def record_response(self, model, phase, latency, response, role=None):
+        """Record an OpenAI chat completion response using its usage block"""
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        return self.record(
+            model,
+            phase,
+            latency,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            cached_tokens=getattr(details, "cached_tokens", 0) or 0,
+            role=role
+        )
+
+    @staticmethod
+    def _aggregate(records):
+        totals = {
+            "calls": len(records),
+            "cache_hits": sum(1 for r in records if r["cache_hit"]),
+            "prompt_tokens": sum(r["prompt_tokens"] for r in records),
+            "completion_tokens": sum(r["completion_tokens"] for r in records),
+            "cached_tokens": sum(r["cached_tokens"] for r in records),
+            "latency": round(sum(r["latency"] for r in records), 3),
+            "cost": round(sum(r["cost"] or 0.0 for r in records), 6)
+        }
+        unpriced = sorted({r["model"] for r in records if r["cost"] is None})
+        if unpriced:
+            totals["unpriced_models"] = unpriced
+        return totals
+
+    def _group(self, records, field):
+        groups = {}
+        for record in records:
+            groups.setdefault(str(record[field]), []).append(record)
+        return {name: self._aggregate(group) for name, group in groups.items()}
+
+    def mark(self):
+        """Return a position in the record list to summarize from"""
+        with self._lock:
+            return len(self.records)
+
+    def summary(self, since=0):
+        """Aggregate recorded calls (from position `since`) overall and by phase, role, model and iteration"""
+        with self._lock:
+            records = self.records[since:]
+        return {
+            "total": self._aggregate(records),
+            "by_phase": self._group(records, "phase"),
+            "by_role": self._group([r for r in records if r["role"] is not None], "role"),
+            "by_model": self._group(records, "model"),
+            "by_iteration": self._group([r for r in records if r["iteration"] is not None], "iteration")
+        }